@@ -18,6 +18,7 @@ class FeatureConfig:
     username: Optional[str] = None
     readme_path: str = "README.md"
     options: Dict[str, Any] = field(default_factory=dict)
+    extra_tokens: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -29,6 +30,7 @@ class FeatureResult:
     start_marker: Optional[str] = None
     end_marker: Optional[str] = None
     summary: Optional[str] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
 
 
 FeatureHandler = Callable[[FeatureConfig], FeatureResult]
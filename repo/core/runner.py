@@ -16,6 +16,13 @@ def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run a re-po feature.")
     parser.add_argument("--card", required=True, help="Feature identifier (e.g. languages)")
     parser.add_argument("--token", required=True, help="GitHub token")
+    parser.add_argument(
+        "--extra-token",
+        action="append",
+        default=[],
+        metavar="TOKEN",
+        help="Additional GitHub token pooled with --token (repeatable)",
+    )
     parser.add_argument("--actor", default="", help="Repository owner or actor")
     parser.add_argument("--username", default="", help="Target username for the card")
     parser.add_argument("--readme-path", default="README.md")
@@ -61,6 +68,7 @@ def run(argv: List[str] | None = None) -> FeatureResult:
         username=args.username or None,
         readme_path=args.readme_path,
         options=_parse_options(args.option),
+        extra_tokens=[token for token in args.extra_token if token],
     )
     return handler(config)
 
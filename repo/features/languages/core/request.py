@@ -11,9 +11,24 @@ from typing import Iterable, Optional, Tuple
 DEFAULT_OUTPUT_MODE = "text"
 DEFAULT_START_MARKER = "<!--START_SECTION:languages-->"
 DEFAULT_END_MARKER = "<!--END_SECTION:languages-->"
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_BACKEND = "rest"
+BACKENDS = ("rest", "graphql", "approximate", "local", "churn", "tarball", "dump")
+LOCAL_BACKENDS = ("local", "churn")
+DEFAULT_CHURN_DAYS = 365
+DEFAULT_CARDS_DIR = "cards"
+DEFAULT_PREFILTER = ("empty",)
+PREFILTER_RULES = ("empty", "archived", "template", "mirror")
+DEFAULT_TRANSPORT = "requests"
+TRANSPORTS = ("requests", "stdlib")
+DEFAULT_REFRESH = "listing"
+REFRESH_MODES = ("listing", "events")
 
 
-def _normalize_languages(values: Iterable[str]) -> Tuple[str, ...]:
+def _normalize_names(values: Iterable[str]) -> Tuple[str, ...]:
     normalized = []
     seen = set()
     for raw in values:
@@ -39,6 +54,27 @@ class LanguagesRequest:
     readme_path: str = "README.md"
     start_marker: str = DEFAULT_START_MARKER
     end_marker: str = DEFAULT_END_MARKER
+    max_workers: int = DEFAULT_MAX_WORKERS
+    cache_dir: Optional[str] = None
+    backend: str = DEFAULT_BACKEND
+    rate_limit_wait: float = 0.0
+    extra_tokens: Tuple[str, ...] = field(default_factory=tuple)
+    retry_attempts: int = DEFAULT_RETRY_ATTEMPTS
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    read_timeout: float = DEFAULT_READ_TIMEOUT
+    hedge: bool = False
+    prefilter: Tuple[str, ...] = DEFAULT_PREFILTER
+    stale_after_days: Optional[int] = None
+    max_requests: Optional[int] = None
+    transport: str = DEFAULT_TRANSPORT
+    orgs: Tuple[str, ...] = field(default_factory=tuple)
+    accounts: Tuple[str, ...] = field(default_factory=tuple)
+    refresh: str = DEFAULT_REFRESH
+    webhook_event: Optional[str] = None
+    webhook_payload: Optional[str] = None
+    local_paths: Tuple[str, ...] = field(default_factory=tuple)
+    churn_days: int = DEFAULT_CHURN_DAYS
+    cards_dir: str = DEFAULT_CARDS_DIR
 
     def __post_init__(self) -> None:
         token = self.token.strip()
@@ -61,14 +97,86 @@ class LanguagesRequest:
             raise ValueError("min_percentage must be between 0 and 100")
         if self.max_languages is not None and self.max_languages <= 0:
             raise ValueError("max_languages must be greater than zero")
+        if self.max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if self.retry_attempts < 1:
+            raise ValueError("retry_attempts must be at least 1")
+        if self.rate_limit_wait < 0:
+            raise ValueError("rate_limit_wait must not be negative")
+        if self.connect_timeout <= 0 or self.read_timeout <= 0:
+            raise ValueError("connect_timeout and read_timeout must be greater than zero")
+        if self.max_requests is not None and self.max_requests < 0:
+            raise ValueError("max_requests must not be negative")
+        if self.churn_days < 1:
+            raise ValueError("churn_days must be at least 1")
+        if self.stale_after_days is not None and self.stale_after_days < 1:
+            raise ValueError("stale_after_days must be at least 1")
+        prefilter = tuple(dict.fromkeys(str(rule).strip().lower() for rule in self.prefilter))
+        prefilter = () if "none" in prefilter else tuple(rule for rule in prefilter if rule)
+        unknown = [rule for rule in prefilter if rule not in PREFILTER_RULES]
+        if unknown:
+            raise ValueError(
+                f"Unknown prefilter rule(s) {', '.join(unknown)}; "
+                f"expected {', '.join(PREFILTER_RULES)} or none"
+            )
+        backend = (self.backend or DEFAULT_BACKEND).strip().lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of: {', '.join(BACKENDS)}")
+        transport = (self.transport or DEFAULT_TRANSPORT).strip().lower()
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of: {', '.join(TRANSPORTS)}")
+        refresh = (self.refresh or DEFAULT_REFRESH).strip().lower()
+        if refresh not in REFRESH_MODES:
+            raise ValueError(f"refresh must be one of: {', '.join(REFRESH_MODES)}")
+        if refresh == "events" and (not (self.cache_dir or "").strip() or self.max_requests is not None):
+            raise ValueError("refresh=events requires cache_dir and cannot be combined with max_requests")
+        webhook_payload = (self.webhook_payload or "").strip() or None
+        if webhook_payload and not (self.cache_dir or "").strip():
+            raise ValueError("webhook_payload requires cache_dir")
+        cards_dir = (self.cards_dir or DEFAULT_CARDS_DIR).strip()
+        if backend == "dump" and not any(str(path).strip() for path in self.local_paths):
+            raise ValueError("backend=dump requires local_paths naming the dump files")
 
         object.__setattr__(self, "token", token)
         object.__setattr__(self, "username", username)
         object.__setattr__(self, "output_mode", output_mode)
-        object.__setattr__(self, "excluded_languages", _normalize_languages(self.excluded_languages))
+        object.__setattr__(self, "excluded_languages", _normalize_names(self.excluded_languages))
         object.__setattr__(self, "readme_path", readme_path)
         object.__setattr__(self, "start_marker", start_marker)
         object.__setattr__(self, "end_marker", end_marker)
+        object.__setattr__(self, "cache_dir", (self.cache_dir or "").strip() or None)
+        object.__setattr__(self, "backend", backend)
+        object.__setattr__(self, "transport", transport)
+        object.__setattr__(self, "refresh", refresh)
+        object.__setattr__(self, "webhook_event", (self.webhook_event or "").strip().lower() or None)
+        object.__setattr__(self, "webhook_payload", webhook_payload)
+        object.__setattr__(
+            self,
+            "local_paths",
+            tuple(path for path in dict.fromkeys(str(raw).strip() for raw in self.local_paths) if path)
+            or ((".",) if backend in LOCAL_BACKENDS else ()),
+        )
+        object.__setattr__(self, "cards_dir", cards_dir)
+        object.__setattr__(self, "prefilter", prefilter)
+        object.__setattr__(self, "orgs", _normalize_names(self.orgs))
+        object.__setattr__(
+            self,
+            "accounts",
+            tuple(
+                account
+                for account in _normalize_names(self.accounts)
+                if account.lower() != username.lower()
+            ),
+        )
+        object.__setattr__(
+            self,
+            "extra_tokens",
+            tuple(
+                extra
+                for extra in dict.fromkeys(str(raw).strip() for raw in self.extra_tokens)
+                if extra and extra != token
+            ),
+        )
 
     @property
     def effective_output_mode(self) -> str:
@@ -4,19 +4,23 @@ Application use case for executing the languages card.
 
 from __future__ import annotations
 
-from typing import Callable, Iterable, List, Optional
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
 
 from repo.core.feature_registry import FeatureResult
 
-from ..domain import StatsCollection
+from ..domain import StatsCollection, StatsQuery
 from .request import LanguagesRequest
 
-FetchStats = Callable[[str], StatsCollection]
+FetchStats = Callable[[str], Union[StatsCollection, Awaitable[StatsCollection]]]
 RenderTextLines = Callable[[StatsCollection], List[str]]
 RenderSvg = Callable[[StatsCollection, str], str]
 WriteTextFile = Callable[[str, str], None]
 UpdateReadmeSection = Callable[[str, str, str, str], None]
 Logger = Callable[[str], None]
+CollectMetrics = Callable[[], Dict[str, Any]]
+DescribeMetrics = Callable[[Dict[str, Any]], List[str]]
 
 SVG_LIGHT_FILE = "langs-mono-light.svg"
 SVG_DARK_FILE = "langs-mono-dark.svg"
@@ -28,14 +32,14 @@ def _apply_filters(
     min_percentage: Optional[float],
     max_languages: Optional[int],
 ) -> StatsCollection:
-    filtered = stats
+    query = StatsQuery(stats)
     if excluded:
-        filtered = filtered.exclude_languages(excluded)
+        query = query.exclude_languages(excluded)
     if min_percentage is not None:
-        filtered = filtered.filter_by_threshold(min_percentage)
+        query = query.filter_by_threshold(min_percentage)
     if max_languages is not None:
-        filtered = filtered.limit(max_languages)
-    return filtered
+        query = query.limit(max_languages)
+    return query.execute()
 
 
 def _lines_to_html(lines: List[str]) -> str:
@@ -53,15 +57,109 @@ def execute_languages(
     write_text_file: WriteTextFile,
     update_readme_section: UpdateReadmeSection,
     logger: Logger = print,
+    collect_metrics: Optional[CollectMetrics] = None,
+    describe_metrics: Optional[DescribeMetrics] = None,
 ) -> FeatureResult:
     """
     Execute the languages feature from a typed request.
 
     The concrete adapter functions are injected so this use case stays focused
-    on orchestration and domain flow.
+    on orchestration and domain flow. ``collect_metrics`` is called after the
+    fetch and its counters (e.g. the remaining API budget) are attached to the
+    returned ``FeatureResult``; ``describe_metrics`` turns them into log lines
+    supplied by the stats source. An awaitable ``fetch_stats`` adapter is
+    driven to completion on a fresh event loop; callers already running inside
+    an event loop should use :func:`execute_languages_async` instead.
     """
     logger(f"Fetching language stats for {request.username}...")
     stats = fetch_stats(request.username)
+    if inspect.isawaitable(stats):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            stats = asyncio.run(_await(stats))
+        else:
+            if inspect.iscoroutine(stats):
+                stats.close()
+            raise RuntimeError(
+                "execute_languages cannot await fetch_stats inside a running event loop; "
+                "use execute_languages_async instead"
+            )
+    return _publish(
+        request,
+        stats,
+        render_text_lines=render_text_lines,
+        render_svg=render_svg,
+        write_text_file=write_text_file,
+        update_readme_section=update_readme_section,
+        logger=logger,
+        metrics=_collect(collect_metrics, describe_metrics, logger),
+    )
+
+
+async def execute_languages_async(
+    request: LanguagesRequest,
+    *,
+    fetch_stats: FetchStats,
+    render_text_lines: RenderTextLines,
+    render_svg: RenderSvg,
+    write_text_file: WriteTextFile,
+    update_readme_section: UpdateReadmeSection,
+    logger: Logger = print,
+    collect_metrics: Optional[CollectMetrics] = None,
+    describe_metrics: Optional[DescribeMetrics] = None,
+) -> FeatureResult:
+    """
+    Execute the languages feature on the caller's event loop.
+
+    Accepts either a coroutine or a plain ``fetch_stats`` adapter; rendering and
+    publishing run exactly as in :func:`execute_languages`.
+    """
+    logger(f"Fetching language stats for {request.username}...")
+    stats = fetch_stats(request.username)
+    if inspect.isawaitable(stats):
+        stats = await stats
+    return _publish(
+        request,
+        stats,
+        render_text_lines=render_text_lines,
+        render_svg=render_svg,
+        write_text_file=write_text_file,
+        update_readme_section=update_readme_section,
+        logger=logger,
+        metrics=_collect(collect_metrics, describe_metrics, logger),
+    )
+
+
+def _collect(
+    collect_metrics: Optional[CollectMetrics],
+    describe_metrics: Optional[DescribeMetrics],
+    logger: Logger,
+) -> Dict[str, Any]:
+    if collect_metrics is None:
+        return {}
+    metrics = dict(collect_metrics())
+    if describe_metrics is not None:
+        for line in describe_metrics(metrics):
+            logger(line)
+    return metrics
+
+
+async def _await(awaitable: Awaitable[StatsCollection]) -> StatsCollection:
+    return await awaitable
+
+
+def _publish(
+    request: LanguagesRequest,
+    stats: StatsCollection,
+    *,
+    render_text_lines: RenderTextLines,
+    render_svg: RenderSvg,
+    write_text_file: WriteTextFile,
+    update_readme_section: UpdateReadmeSection,
+    logger: Logger,
+    metrics: Dict[str, Any],
+) -> FeatureResult:
     filtered_stats = _apply_filters(
         stats,
         request.excluded_languages,
@@ -93,6 +191,7 @@ def execute_languages(
         return FeatureResult(
             assets=[SVG_LIGHT_FILE, SVG_DARK_FILE],
             summary="Generated langs-mono SVG assets.",
+            metrics=metrics,
         )
 
     if request.output_mode not in ("text", ""):
@@ -113,4 +212,5 @@ def execute_languages(
         start_marker=request.start_marker,
         end_marker=request.end_marker,
         summary="Updated README section.",
+        metrics=metrics,
     )
@@ -1,4 +1,5 @@
 from .language_stat import LanguageStat
 from .stats_collection import StatsCollection
+from .stats_query import StatsQuery
 
-__all__ = ['LanguageStat', 'StatsCollection']
+__all__ = ['LanguageStat', 'StatsCollection', 'StatsQuery']
@@ -0,0 +1,132 @@
+"""
+Lazy, fused filter pipeline over a collection of language statistics
+"""
+
+from typing import FrozenSet, Iterable, List, Tuple, Union
+
+from .language_stat import LanguageStat
+from .stats_collection import StatsCollection
+
+_Operation = Tuple[str, Union[FrozenSet[str], float, int]]
+
+
+class StatsQuery:
+    """
+    Record filters on a StatsCollection and run them in a single pass.
+
+    Chaining ``exclude_languages``, ``filter_by_threshold`` and ``limit`` on
+    a StatsCollection builds, renormalizes, sorts and validates a whole new
+    collection at every step. A query applies the same steps to plain
+    percentage lists instead, sorts at most once and builds one collection at
+    the end. The result, errors included, is the same as the chained calls.
+    """
+
+    def __init__(self, collection: StatsCollection, operations: Tuple[_Operation, ...] = ()):
+        """
+        Initialize a query.
+
+        Args:
+            collection: Statistics the filters apply to
+            operations: Filters recorded so far, in order
+        """
+        self._collection = collection
+        self._operations = operations
+
+    def exclude_languages(self, languages: Iterable[str]) -> 'StatsQuery':
+        """
+        Record the removal of the specified languages (case-insensitive).
+
+        Returns:
+            New query with the step appended
+        """
+        exclusions = frozenset(lang.strip().lower() for lang in languages if lang and lang.strip())
+        return StatsQuery(self._collection, self._operations + (('exclude', exclusions),))
+
+    def filter_by_threshold(self, min_percentage: float) -> 'StatsQuery':
+        """
+        Record the removal of languages below ``min_percentage``.
+
+        Returns:
+            New query with the step appended
+        """
+        return StatsQuery(self._collection, self._operations + (('threshold', min_percentage),))
+
+    def limit(self, max_languages: int) -> 'StatsQuery':
+        """
+        Record keeping only the top ``max_languages`` languages.
+
+        Returns:
+            New query with the step appended
+        """
+        return StatsQuery(self._collection, self._operations + (('limit', max_languages),))
+
+    def execute(self) -> StatsCollection:
+        """
+        Run the recorded filters.
+
+        Returns:
+            The filtered StatsCollection; the original collection when no
+            step removed anything
+
+        Raises:
+            ValueError: If a step leaves no language, ``max_languages`` is not
+                positive, or the remaining percentages cannot be normalized
+        """
+        stats = self._collection.stats
+        percentages = [stat.percentage for stat in stats]
+        changed = False
+        # Once percentages are derived from bytes, later renormalizations are
+        # monotonic and keep the descending order without sorting again.
+        byte_weighted = False
+
+        for operation, argument in self._operations:
+            if operation == 'exclude':
+                if not argument:
+                    continue
+                keep = [index for index, stat in enumerate(stats) if stat.name.lower() not in argument]
+                if not keep:
+                    raise ValueError("All languages were excluded; a minimum of one language is required")
+            elif operation == 'threshold':
+                keep = [index for index, percentage in enumerate(percentages) if percentage >= argument]
+                if not keep:
+                    raise ValueError(f"No languages above {argument}% threshold")
+            else:
+                if argument <= 0:
+                    raise ValueError("max_languages must be greater than zero")
+                if len(stats) <= argument:
+                    continue
+                keep = list(range(argument))
+
+            stats = [stats[index] for index in keep]
+            percentages, by_bytes = _normalized_percentages(stats, [percentages[index] for index in keep])
+            if by_bytes and not byte_weighted:
+                order = sorted(range(len(stats)), key=lambda index: percentages[index], reverse=True)
+                stats = [stats[index] for index in order]
+                percentages = [percentages[index] for index in order]
+                byte_weighted = True
+            changed = True
+
+        if not changed:
+            return self._collection
+        return StatsCollection([
+            LanguageStat(name=stat.name, percentage=percentage, bytes=stat.bytes)
+            for stat, percentage in zip(stats, percentages)
+        ])
+
+
+def _normalized_percentages(stats: List[LanguageStat],
+                            percentages: List[float]) -> Tuple[List[float], bool]:
+    """
+    Renormalize like ``StatsCollection._normalize``, on percentages only.
+
+    Returns:
+        Tuple of the new percentages and whether they were derived from bytes
+    """
+    total_bytes = sum(stat.bytes for stat in stats if stat.bytes > 0)
+    if total_bytes > 0:
+        return [(stat.bytes / total_bytes) * 100 for stat in stats], True
+
+    total_percentage = sum(percentages)
+    if total_percentage <= 0:
+        raise ValueError("Cannot normalize statistics with zero total percentage")
+    return [(percentage / total_percentage) * 100 for percentage in percentages], False
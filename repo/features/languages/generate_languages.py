@@ -1,19 +1,44 @@
 from __future__ import annotations
 
+import dataclasses
 import os
 import sys
-from typing import List
+from typing import Any, Callable, Dict, List
 
 from repo.core.file_utils import write_file
 from repo.core.feature_registry import FeatureConfig, FeatureResult, register_feature
 from repo.core.readme_updater import update_section
 
 from .core import LanguagesRequest, RenderConfig
-from .core.parsing import parse_float, parse_int, parse_list
-from .core.request import DEFAULT_END_MARKER, DEFAULT_OUTPUT_MODE, DEFAULT_START_MARKER
-from .core.use_case import execute_languages
+from .core.parsing import parse_bool, parse_float, parse_int, parse_list
+from .core.request import (
+    DEFAULT_BACKEND,
+    DEFAULT_CARDS_DIR,
+    DEFAULT_CHURN_DAYS,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_END_MARKER,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_OUTPUT_MODE,
+    DEFAULT_PREFILTER,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_REFRESH,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_START_MARKER,
+    DEFAULT_TRANSPORT,
+)
+from .core.use_case import execute_languages, execute_languages_async
 from .domain import StatsCollection
-from .infrastructure import GitHubClient
+from .infrastructure import (
+    AsyncGitHubClient,
+    DumpIngest,
+    GitChurnSource,
+    GitHubClient,
+    LocalRepoScanner,
+    RepoPrefilter,
+    RetryPolicy,
+    TarballLineSource,
+)
+from .infrastructure.webhooks import read_payload
 from .rendering.svg import SVGRenderer
 from .rendering.text import TextRenderer
 
@@ -43,6 +68,29 @@ def _build_request_from_feature_config(config: FeatureConfig) -> LanguagesReques
         readme_path=config.options.get('readme_path') or config.readme_path,
         start_marker=config.options.get('start_marker') or DEFAULT_START_MARKER,
         end_marker=config.options.get('end_marker') or DEFAULT_END_MARKER,
+        max_workers=parse_int(config.options.get('max_workers')) or DEFAULT_MAX_WORKERS,
+        cache_dir=config.options.get('cache_dir'),
+        backend=config.options.get('backend') or DEFAULT_BACKEND,
+        rate_limit_wait=parse_float(config.options.get('rate_limit_wait')) or 0.0,
+        extra_tokens=tuple(config.extra_tokens),
+        retry_attempts=parse_int(config.options.get('retry_attempts')) or DEFAULT_RETRY_ATTEMPTS,
+        connect_timeout=(
+            parse_float(config.options.get('connect_timeout')) or DEFAULT_CONNECT_TIMEOUT
+        ),
+        read_timeout=parse_float(config.options.get('read_timeout')) or DEFAULT_READ_TIMEOUT,
+        hedge=parse_bool(config.options.get('hedge')),
+        prefilter=tuple(parse_list(config.options.get('prefilter'))) or DEFAULT_PREFILTER,
+        stale_after_days=parse_int(config.options.get('stale_after_days')),
+        max_requests=parse_int(config.options.get('max_requests')),
+        transport=config.options.get('transport') or DEFAULT_TRANSPORT,
+        orgs=tuple(parse_list(config.options.get('orgs'))),
+        accounts=tuple(parse_list(config.options.get('accounts'))),
+        refresh=config.options.get('refresh') or DEFAULT_REFRESH,
+        webhook_event=config.options.get('webhook_event'),
+        webhook_payload=config.options.get('webhook_payload'),
+        local_paths=tuple(parse_list(config.options.get('local_paths'))),
+        churn_days=parse_int(config.options.get('churn_days')) or DEFAULT_CHURN_DAYS,
+        cards_dir=config.options.get('cards_dir') or DEFAULT_CARDS_DIR,
     )
 
 
@@ -70,42 +118,256 @@ def _build_request_from_env() -> LanguagesRequest:
         readme_path=os.environ.get('LANG_STATS_README_PATH', 'README.md'),
         start_marker=os.environ.get('LANG_STATS_START_MARKER', DEFAULT_START_MARKER),
         end_marker=os.environ.get('LANG_STATS_END_MARKER', DEFAULT_END_MARKER),
+        max_workers=parse_int(os.environ.get('LANG_STATS_MAX_WORKERS')) or DEFAULT_MAX_WORKERS,
+        cache_dir=os.environ.get('LANG_STATS_CACHE_DIR'),
+        backend=os.environ.get('LANG_STATS_BACKEND') or DEFAULT_BACKEND,
+        rate_limit_wait=parse_float(os.environ.get('LANG_STATS_RATE_LIMIT_WAIT')) or 0.0,
+        extra_tokens=tuple(parse_list(os.environ.get('LANG_STATS_EXTRA_TOKENS'))),
+        retry_attempts=(
+            parse_int(os.environ.get('LANG_STATS_RETRY_ATTEMPTS')) or DEFAULT_RETRY_ATTEMPTS
+        ),
+        connect_timeout=(
+            parse_float(os.environ.get('LANG_STATS_CONNECT_TIMEOUT')) or DEFAULT_CONNECT_TIMEOUT
+        ),
+        read_timeout=(
+            parse_float(os.environ.get('LANG_STATS_READ_TIMEOUT')) or DEFAULT_READ_TIMEOUT
+        ),
+        hedge=parse_bool(os.environ.get('LANG_STATS_HEDGE')),
+        prefilter=tuple(parse_list(os.environ.get('LANG_STATS_PREFILTER'))) or DEFAULT_PREFILTER,
+        stale_after_days=parse_int(os.environ.get('LANG_STATS_STALE_AFTER_DAYS')),
+        max_requests=parse_int(os.environ.get('LANG_STATS_MAX_REQUESTS')),
+        transport=os.environ.get('LANG_STATS_TRANSPORT') or DEFAULT_TRANSPORT,
+        orgs=tuple(parse_list(os.environ.get('LANG_STATS_ORGS'))),
+        accounts=tuple(parse_list(os.environ.get('LANG_STATS_ACCOUNTS'))),
+        refresh=os.environ.get('LANG_STATS_REFRESH') or DEFAULT_REFRESH,
+        webhook_event=os.environ.get('LANG_STATS_WEBHOOK_EVENT'),
+        webhook_payload=os.environ.get('LANG_STATS_WEBHOOK_PAYLOAD'),
+        local_paths=tuple(parse_list(os.environ.get('LANG_STATS_LOCAL_PATHS'))),
+        churn_days=parse_int(os.environ.get('LANG_STATS_CHURN_DAYS')) or DEFAULT_CHURN_DAYS,
+        cards_dir=os.environ.get('LANG_STATS_CARDS_DIR') or DEFAULT_CARDS_DIR,
+    )
+
+
+def _publishing_adapters() -> Dict[str, Callable]:
+    text_renderer = TextRenderer()
+
+    def _render_text_lines(stats: StatsCollection) -> List[str]:
+        return text_renderer.render(stats)
+
+    def _render_svg(stats: StatsCollection, theme: str) -> str:
+        config = RenderConfig.default_light() if theme == 'light' else RenderConfig.default_dark()
+        renderer = SVGRenderer(config)
+        return renderer.render(stats)
+
+    def _write_text_file(path: str, content: str) -> None:
+        write_file(path, content)
+
+    def _update_readme_section(content: str, readme_path: str, start_marker: str, end_marker: str) -> None:
+        update_section(
+            content,
+            readme_path=readme_path,
+            start_marker=start_marker,
+            end_marker=end_marker,
+        )
+
+    return {
+        'render_text_lines': _render_text_lines,
+        'render_svg': _render_svg,
+        'write_text_file': _write_text_file,
+        'update_readme_section': _update_readme_section,
+    }
+
+
+def _github_client(request: LanguagesRequest) -> GitHubClient:
+    return GitHubClient(
+        token=request.token,
+        username=request.username,
+        max_workers=request.max_workers,
+        cache_dir=request.cache_dir,
+        backend=request.backend if request.backend in GitHubClient.BACKENDS else 'rest',
+        rate_limit_wait=request.rate_limit_wait,
+        tokens=request.extra_tokens,
+        retry_policy=RetryPolicy(max_attempts=request.retry_attempts),
+        timeout=(request.connect_timeout, request.read_timeout),
+        hedge=request.hedge,
+        prefilter=RepoPrefilter(request.prefilter, request.stale_after_days),
+        max_requests=request.max_requests,
+        transport=request.transport,
+        refresh=request.refresh if request.backend == 'rest' else 'listing',
     )
 
 
 def _run_job(request: LanguagesRequest) -> FeatureResult:
-    with GitHubClient(token=request.token, username=request.username) as github_client:
-        text_renderer = TextRenderer()
+    if request.backend in ('local', 'churn'):
+        return _run_local_job(request)
+    if request.backend == 'tarball':
+        return _run_tarball_job(request)
+    if request.backend == 'dump':
+        return _run_dump_job(request)
+    with _github_client(request) as github_client:
 
         def _fetch_stats(username: str) -> StatsCollection:
-            return github_client.fetch_language_stats(username)
+            if request.webhook_payload and request.backend == 'rest':
+                stats = github_client.apply_webhook(
+                    request.webhook_event or '',
+                    read_payload(request.webhook_payload),
+                    username,
+                    orgs=request.orgs,
+                    accounts=request.accounts,
+                )
+                if stats is not None:
+                    return stats
+            return github_client.fetch_language_stats(
+                username, orgs=request.orgs, accounts=request.accounts
+            )
 
-        def _render_text_lines(stats: StatsCollection) -> List[str]:
-            return text_renderer.render(stats)
+        return execute_languages(
+            request,
+            fetch_stats=_fetch_stats,
+            collect_metrics=github_client.run_metrics,
+            describe_metrics=github_client.describe_metrics,
+            **_publishing_adapters(),
+        )
+
+
+def _run_local_job(request: LanguagesRequest) -> FeatureResult:
+    if request.backend == 'churn':
+        source = GitChurnSource(
+            request.local_paths, request.churn_days, request.max_workers, request.cache_dir
+        )
+    else:
+        index_path = os.path.join(request.cache_dir, 'local_index.json') if request.cache_dir else None
+        source = LocalRepoScanner(request.local_paths, request.max_workers, index_path)
+    with source:
+        return execute_languages(
+            request,
+            fetch_stats=source.fetch_language_stats,
+            collect_metrics=source.run_metrics,
+            describe_metrics=source.describe_metrics,
+            **_publishing_adapters(),
+        )
 
-        def _render_svg(stats: StatsCollection, theme: str) -> str:
-            config = RenderConfig.default_light() if theme == 'light' else RenderConfig.default_dark()
-            renderer = SVGRenderer(config)
-            return renderer.render(stats)
 
-        def _write_text_file(path: str, content: str) -> None:
-            write_file(path, content)
+def _run_tarball_job(request: LanguagesRequest) -> FeatureResult:
+    with _github_client(request) as github_client:
+        source = TarballLineSource(
+            github_client,
+            archives=request.local_paths,
+            max_workers=request.max_workers,
+            cache_dir=request.cache_dir,
+            orgs=request.orgs,
+            accounts=request.accounts,
+        )
 
-        def _update_readme_section(content: str, readme_path: str, start_marker: str, end_marker: str) -> None:
-            update_section(
-                content,
-                readme_path=readme_path,
-                start_marker=start_marker,
-                end_marker=end_marker,
-            )
+        def _collect_metrics() -> Dict[str, Any]:
+            return {**github_client.run_metrics(), **source.run_metrics()}
+
+        def _describe_metrics(metrics: Dict[str, Any]) -> List[str]:
+            return [*github_client.describe_metrics(metrics), *source.describe_metrics(metrics)]
 
         return execute_languages(
+            request,
+            fetch_stats=source.fetch_language_stats,
+            collect_metrics=_collect_metrics,
+            describe_metrics=_describe_metrics,
+            **_publishing_adapters(),
+        )
+
+
+def _run_dump_job(request: LanguagesRequest) -> FeatureResult:
+    ingest = DumpIngest(
+        request.local_paths,
+        max_workers=request.max_workers,
+        prefilter=RepoPrefilter(request.prefilter, request.stale_after_days),
+    )
+    owner_stats = ingest.owner_stats()
+    metrics = ingest.run_metrics()
+    for line in ingest.describe_metrics(metrics):
+        print(line)
+    adapters = _publishing_adapters()
+    assets: List[str] = []
+    skipped_owners = 0
+    for owner, stats in owner_stats.items():
+        owner_dir = os.path.join(request.cards_dir, owner)
+
+        def _write_owner_file(path: str, content: str, owner_dir: str = owner_dir) -> None:
+            target = os.path.join(owner_dir, path)
+            write_file(target, content)
+            assets.append(target)
+
+        def _write_owner_snippet(content: str, readme_path: str, start_marker: str,
+                                 end_marker: str, owner_dir: str = owner_dir) -> None:
+            _write_owner_file(
+                os.path.basename(readme_path), f"{start_marker}\n{content}\n{end_marker}\n", owner_dir
+            )
+
+        try:
+            execute_languages(
+                dataclasses.replace(request, username=owner),
+                fetch_stats=lambda _username, stats=stats: stats,
+                render_text_lines=adapters['render_text_lines'],
+                render_svg=adapters['render_svg'],
+                write_text_file=_write_owner_file,
+                update_readme_section=_write_owner_snippet,
+                logger=lambda _message: None,
+            )
+        except ValueError as error:
+            # Filters run before anything is written, so a skipped owner
+            # leaves no partial card behind.
+            print(f"Skipped {owner}: {error}")
+            skipped_owners += 1
+    metrics['dump_skipped_owners'] = skipped_owners
+    generated = len(owner_stats) - skipped_owners
+    return FeatureResult(
+        assets=assets,
+        summary=(
+            f"Generated language cards for {generated} owners in {request.cards_dir}"
+            f" ({skipped_owners} skipped)."
+        ),
+        metrics=metrics,
+    )
+
+
+# Request fields the async path honours; every other option needs the sync client.
+_ASYNC_FIELDS = frozenset({
+    'token', 'username', 'output_mode', 'excluded_languages', 'min_percentage',
+    'max_languages', 'readme_path', 'start_marker', 'end_marker', 'max_workers',
+})
+
+
+def _check_async_support(request: LanguagesRequest) -> None:
+    unsupported = []
+    for field in dataclasses.fields(request):
+        if field.name in _ASYNC_FIELDS:
+            continue
+        default = (
+            field.default_factory() if field.default_factory is not dataclasses.MISSING
+            else field.default
+        )
+        if getattr(request, field.name) != default:
+            unsupported.append(field.name)
+    if unsupported:
+        raise ValueError(
+            f"The async languages runner does not support: {', '.join(unsupported)}; "
+            "use run_feature instead"
+        )
+
+
+async def _run_job_async(request: LanguagesRequest) -> FeatureResult:
+    _check_async_support(request)
+    async with AsyncGitHubClient(
+        token=request.token,
+        username=request.username,
+        max_workers=request.max_workers,
+    ) as github_client:
+
+        async def _fetch_stats(username: str) -> StatsCollection:
+            return await github_client.fetch_language_stats(username)
+
+        return await execute_languages_async(
             request,
             fetch_stats=_fetch_stats,
-            render_text_lines=_render_text_lines,
-            render_svg=_render_svg,
-            write_text_file=_write_text_file,
-            update_readme_section=_update_readme_section,
+            **_publishing_adapters(),
         )
 
 
@@ -114,6 +376,16 @@ def run_feature(config: FeatureConfig) -> FeatureResult:
     return _run_job(_build_request_from_feature_config(config))
 
 
+async def run_feature_async(config: FeatureConfig) -> FeatureResult:
+    """
+    Run the languages card on the caller's event loop (requires aiohttp).
+
+    Only the REST backend for a single user is available here; any other
+    backend or client option raises ValueError instead of being ignored.
+    """
+    return await _run_job_async(_build_request_from_feature_config(config))
+
+
 def main() -> None:
     """Entry point invoked by the console script."""
     _run_job(_build_request_from_env())
@@ -1,3 +1,24 @@
+from .async_github_client import AsyncGitHubClient
+from .churn import GitChurnSource
+from .dumps import DumpIngest
+from .errors import CircuitOpenError, GitHubAPIError, RateLimitExceededError
 from .github_client import GitHubClient
+from .local_scanner import LocalRepoScanner
+from .prefilter import RepoPrefilter
+from .retry import CircuitBreaker, RetryPolicy
+from .tarball import TarballLineSource
 
-__all__ = ['GitHubClient']
+__all__ = [
+    'AsyncGitHubClient',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'DumpIngest',
+    'GitChurnSource',
+    'GitHubAPIError',
+    'GitHubClient',
+    'LocalRepoScanner',
+    'RateLimitExceededError',
+    'RepoPrefilter',
+    'RetryPolicy',
+    'TarballLineSource',
+]
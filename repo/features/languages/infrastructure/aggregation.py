@@ -0,0 +1,97 @@
+"""
+Helpers shared by the GitHub clients for turning language byte maps into stats
+"""
+
+from typing import Dict, Iterable, List, Optional
+from ..domain import LanguageStat
+
+
+def merge_language_bytes(results: Iterable[Optional[Dict[str, int]]]) -> Dict[str, int]:
+    """
+    Sum per-repository language byte maps into a single total.
+    
+    Args:
+        results: Per-repo language byte maps; ``None`` entries (failed repos) are skipped
+        
+    Returns:
+        Dictionary mapping language names to total bytes
+    """
+    language_totals: Dict[str, int] = {}
+    for languages in results:
+        if languages is None:
+            continue  # Skip repos with errors
+        for lang, bytes_count in languages.items():
+            language_totals[lang] = language_totals.get(lang, 0) + bytes_count
+    return language_totals
+
+
+def calculate_percentages(language_bytes: Dict[str, int]) -> List[LanguageStat]:
+    """
+    Calculate percentages from byte counts.
+    
+    Args:
+        language_bytes: Dictionary of language bytes
+        
+    Returns:
+        List of LanguageStat objects
+        
+    Raises:
+        ValueError: If no languages found
+    """
+    if not language_bytes:
+        raise ValueError("No language data found")
+    
+    total_bytes = sum(language_bytes.values())
+    stats = []
+    
+    for lang, bytes_count in language_bytes.items():
+        percentage = (bytes_count / total_bytes) * 100
+        stats.append(LanguageStat(name=lang, percentage=percentage, bytes=bytes_count))
+    
+    return stats
+
+
+def approximate_language_bytes(repos: Iterable[Dict], bytes_per_kb: float = 1024) -> Dict[str, int]:
+    """
+    Estimate language bytes from repo listing fields alone.
+    
+    Each repository's whole ``size`` (reported in KB) is attributed to its
+    primary ``language``; repos without one are ignored.
+    
+    Args:
+        repos: Repository data from the listing
+        bytes_per_kb: Language bytes assumed per KB of repository size
+        
+    Returns:
+        Dictionary mapping language names to estimated bytes
+    """
+    language_totals: Dict[str, int] = {}
+    for repo in repos:
+        language = repo.get('language')
+        size = repo.get('size') or 0
+        if not language or size <= 0:
+            continue
+        language_totals[language] = language_totals.get(language, 0) + round(size * bytes_per_kb)
+    return language_totals
+
+
+def distribution_error(estimate: Dict[str, int], exact: Dict[str, int]) -> Optional[float]:
+    """
+    Distance between two language distributions in percentage points.
+    
+    This is the total variation distance: the share of bytes that would have
+    to move between languages to turn ``estimate`` into ``exact``.
+    
+    Returns:
+        Error between 0 and 100, or None if either distribution is empty
+    """
+    estimate_total = sum(estimate.values())
+    exact_total = sum(exact.values())
+    if estimate_total <= 0 or exact_total <= 0:
+        return None
+    languages = set(estimate) | set(exact)
+    difference = sum(
+        abs(estimate.get(lang, 0) / estimate_total - exact.get(lang, 0) / exact_total)
+        for lang in languages
+    )
+    return difference / 2 * 100
@@ -0,0 +1,205 @@
+"""
+Asyncio GitHub API client for fetching language statistics
+"""
+
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from ..domain import StatsCollection
+from .aggregation import calculate_percentages, merge_language_bytes
+from .errors import GitHubAPIError
+from .github_client import GitHubClient
+
+_TRANSPORT_ERRORS = (asyncio.TimeoutError, OSError, ValueError) + (
+    (aiohttp.ClientError,) if aiohttp is not None else ()
+)
+
+
+class AsyncGitHubClient:
+    """
+    Asyncio-native counterpart of :class:`GitHubClient`.
+
+    All requests share one ``aiohttp`` session on the running event loop, so a
+    single service can generate cards for many users without a thread each.
+    Requires the optional ``aiohttp`` dependency (``pip install re-po[async]``)
+    unless a compatible ``session`` is injected.
+    """
+
+    API_BASE_URL = GitHubClient.API_BASE_URL
+    DEFAULT_MAX_WORKERS = GitHubClient.DEFAULT_MAX_WORKERS
+
+    def __init__(self, token: Optional[str] = None, username: Optional[str] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, session: Optional[Any] = None):
+        """
+        Initialize async GitHub client.
+
+        Args:
+            token: GitHub personal access token (optional but recommended)
+            username: GitHub username for fetching user repos
+            max_workers: Maximum number of in-flight requests
+            session: Pre-built ``aiohttp.ClientSession`` (created lazily if omitted)
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.token = token
+        self.username = username
+        self.max_workers = max_workers
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _headers(self) -> Dict[str, str]:
+        """Default request headers"""
+        headers = {
+            'Accept': 'application/vnd.github.v3+json',
+            'User-Agent': 'Lang-Stats-Generator'
+        }
+        if self.token:
+            headers['Authorization'] = f'token {self.token}'
+        return headers
+
+    def _get_session(self) -> Any:
+        """Return the session, creating it on the running loop if needed"""
+        if self._session is None:
+            if aiohttp is None:
+                raise ImportError(
+                    "AsyncGitHubClient requires aiohttp. Install it with `pip install re-po[async]`."
+                )
+            connector = aiohttp.TCPConnector(limit=self.max_workers)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def fetch_language_stats(self, username: Optional[str] = None) -> StatsCollection:
+        """
+        Fetch language statistics for a GitHub user.
+
+        Args:
+            username: GitHub username (uses self.username if not provided)
+
+        Returns:
+            StatsCollection with language statistics
+
+        Raises:
+            GitHubAPIError: If API request fails
+            ValueError: If no username provided
+        """
+        username = username or self.username
+        if not username:
+            raise ValueError("Username must be provided")
+
+        language_bytes = await self._aggregate_language_bytes(self._iter_user_repos(username))
+        stats = calculate_percentages(language_bytes)
+
+        return StatsCollection(stats)
+
+    async def _get_json(self, url: str,
+                        params: Optional[Dict[str, Any]] = None) -> Tuple[Any, Optional[str]]:
+        """
+        GET ``url`` and decode the JSON body, bounded by ``max_workers``.
+
+        Returns:
+            Tuple of the decoded body and the ``rel="next"`` URL, if any
+
+        Raises:
+            GitHubAPIError: If the response status is an error
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(url, params=params, headers=self._headers()) as response:
+                if response.status >= 400:
+                    raise GitHubAPIError(f"HTTP {response.status} for {url}")
+                next_url = response.links.get('next', {}).get('url')
+                return await response.json(), str(next_url) if next_url else None
+
+    async def _fetch_user_repos(self, username: str) -> List[Dict]:
+        """
+        Fetch all repositories for a user.
+
+        Args:
+            username: GitHub username
+
+        Returns:
+            List of repository data dictionaries
+
+        Raises:
+            GitHubAPIError: If request fails
+        """
+        return [repo async for repo in self._iter_user_repos(username)]
+
+    async def _iter_user_repos(self, username: str) -> AsyncIterator[Dict]:
+        """
+        Yield a user's repositories page by page, following ``rel="next"`` links.
+
+        Raises:
+            GitHubAPIError: If a page request fails
+        """
+        url: Optional[str] = f"{self.API_BASE_URL}/users/{username}/repos"
+        params: Optional[Dict[str, Any]] = {'per_page': 100, 'type': 'owner'}
+
+        while url:
+            try:
+                page, url = await self._get_json(url, params)
+            except (GitHubAPIError,) + _TRANSPORT_ERRORS as e:
+                raise GitHubAPIError(f"Failed to fetch repos for {username}: {e}")
+            params = None
+            for repo in page:
+                yield repo
+
+    async def _aggregate_language_bytes(self, repos: AsyncIterable[Dict]) -> Dict[str, int]:
+        """
+        Aggregate language bytes across all repositories concurrently.
+
+        Language requests are scheduled as each listing page arrives.
+
+        Args:
+            repos: Async iterable of repository data
+
+        Returns:
+            Dictionary mapping language names to total bytes
+        """
+        tasks: List[asyncio.Future] = []
+        try:
+            async for repo in repos:
+                if repo.get('fork') or not repo.get('languages_url'):
+                    continue  # Skip forked repos
+                tasks.append(asyncio.ensure_future(self._fetch_repo_languages(repo['languages_url'])))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        results = await asyncio.gather(*tasks)
+        return merge_language_bytes(results)
+
+    async def _fetch_repo_languages(self, languages_url: str) -> Optional[Dict[str, int]]:
+        """
+        Fetch the language byte map for a single repository.
+
+        Returns:
+            Dictionary of language bytes, or None if the request failed
+        """
+        try:
+            languages, _ = await self._get_json(languages_url)
+            return languages
+        except (GitHubAPIError,) + _TRANSPORT_ERRORS:
+            return None
+
+    async def aclose(self):
+        """Close the session if this client created it"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.aclose()
@@ -0,0 +1,261 @@
+"""
+Language share from the lines changed in local clones' history
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..domain import StatsCollection
+from .aggregation import calculate_percentages
+from .local_scanner import language_for_path
+
+DEFAULT_WINDOW_DAYS = 365
+
+# Each commit starts with a record separator and its commit time, followed by
+# one ``added<TAB>deleted<TAB>path`` line per changed file.
+_LOG_FORMAT = '%x1e%ct'
+
+DayBuckets = Dict[str, Dict[str, int]]
+
+
+def parse_numstat(lines: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+    """
+    Stream ``git log --numstat`` output as per-file line churn.
+
+    Args:
+        lines: Output lines of ``git log --numstat --format=%x1e%ct``
+
+    Yields:
+        ``(day, path, lines)`` per changed text file, ``day`` being the UTC
+        commit date and ``lines`` the sum of added and deleted lines; binary
+        files, reported as ``-``, are skipped
+    """
+    day = None
+    for line in lines:
+        line = line.rstrip('\n')
+        if line.startswith('\x1e'):
+            day = datetime.fromtimestamp(int(line[1:]), timezone.utc).strftime('%Y-%m-%d')
+            continue
+        added, tab, rest = line.partition('\t')
+        deleted, tab2, path = rest.partition('\t')
+        if not tab or not tab2 or day is None or not added.isdigit() or not deleted.isdigit():
+            continue
+        yield day, path, int(added) + int(deleted)
+
+
+def _git(path: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ['git', '-C', path, *args], capture_output=True, text=True, check=False
+    )
+
+
+def update_churn(path: str, state: Dict[str, Any],
+                 since: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Bring one clone's per-day churn up to date.
+
+    Only commits after the last parsed ``head`` are read. When that commit is
+    no longer an ancestor of ``HEAD`` (history was rewritten), or the stored
+    buckets do not reach back to ``since``, the history is parsed again. Only
+    commits from ``since`` on are read and kept. Runs in a worker process.
+
+    Args:
+        path: Clone directory
+        state: Previous ``{'head': sha, 'since': day, 'days': {day: {language:
+            lines}}}``, or an empty dict
+        since: First UTC day (``YYYY-MM-DD``) worth counting; None reads the
+            whole history
+
+    Returns:
+        Tuple of the new state and the number of commits parsed
+
+    Raises:
+        ValueError: If ``path`` is not a git repository or ``git log`` fails
+    """
+    head_result = _git(path, 'rev-parse', 'HEAD')
+    if head_result.returncode != 0:
+        raise ValueError(f"Not a git repository with commits: {path}")
+    head = head_result.stdout.strip()
+    stored_since = state.get('since')
+    # Buckets parsed for a shorter window cannot serve a longer one.
+    covered = 'days' in state and (stored_since is None or (since is not None and since >= stored_since))
+    last = state.get('head') if covered else None
+    days: DayBuckets = {
+        day: dict(bucket) for day, bucket in state.get('days', {}).items()
+        if since is None or day >= since
+    }
+    if last == head:
+        return {'head': head, 'since': since, 'days': days}, 0
+
+    revisions = head
+    if last and _git(path, 'merge-base', '--is-ancestor', last, head).returncode == 0:
+        revisions = f"{last}..{head}"
+    else:
+        days = {}
+
+    command = [
+        'git', '-C', path, '-c', 'core.quotePath=false', 'log', '--numstat', '--no-merges',
+        '--no-renames', f'--format={_LOG_FORMAT}',
+    ]
+    if since is not None:
+        command.append(f'--since={since}T00:00:00Z')
+    command.append(revisions)
+    commits = 0
+
+    def _lines(stream: Iterable[str]) -> Iterator[str]:
+        nonlocal commits
+        for line in stream:
+            commits += line.startswith('\x1e')
+            yield line
+
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                          encoding='utf-8', errors='replace') as process:
+        for day, file_path, lines in parse_numstat(_lines(process.stdout)):
+            language = language_for_path(file_path)
+            if language is not None:
+                bucket = days.setdefault(day, {})
+                bucket[language] = bucket.get(language, 0) + lines
+    if process.returncode != 0:
+        raise ValueError(f"git log failed in {path}")
+    return {'head': head, 'since': since, 'days': days}, commits
+
+
+class GitChurnSource:
+    """
+    Stats source weighting languages by lines added and removed.
+
+    Byte counts favour whatever code is largest, old vendored code included;
+    churn over a recent window reflects what is actually being written. Each
+    clone's ``git log --numstat`` is stream-parsed in its own process into
+    per-day buckets. With ``state_dir`` the buckets and the last parsed commit
+    are kept between runs, so a rerun only reads the new commits and the
+    window can move without reparsing. ``LanguageStat.bytes`` carries the
+    changed line count.
+    """
+
+    def __init__(self, paths: Sequence[str], window_days: int = DEFAULT_WINDOW_DAYS,
+                 max_workers: int = 4, state_dir: Optional[str] = None):
+        """
+        Initialize the source.
+
+        Args:
+            paths: Local clones whose history is counted together
+            window_days: Only commits from this many most recent days count
+            max_workers: Number of clones parsed in parallel processes
+            state_dir: Directory keeping per-clone buckets between runs
+
+        Raises:
+            ValueError: If no path is given, ``window_days`` or ``max_workers``
+                is below 1
+        """
+        if not paths:
+            raise ValueError("At least one path must be provided")
+        if window_days < 1:
+            raise ValueError("window_days must be at least 1")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.paths = [os.path.abspath(path) for path in dict.fromkeys(paths)]
+        self.window_days = window_days
+        self.max_workers = max_workers
+        self.state_dir = Path(state_dir) if state_dir else None
+        self._commits_parsed = 0
+        self._repos_resumed = 0
+
+    def fetch_language_stats(self, username: Optional[str] = None) -> StatsCollection:
+        """
+        Parse new history and compute the churn share of each language.
+
+        Args:
+            username: Accepted for interface parity with ``GitHubClient``
+
+        Returns:
+            StatsCollection weighted by changed lines within the window
+
+        Raises:
+            ValueError: If a path is not a git repository
+        """
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.window_days)).strftime('%Y-%m-%d')
+        states = [self._load_state(path) for path in self.paths]
+        self._repos_resumed = sum(1 for state in states if state.get('head'))
+        if len(self.paths) == 1 or self.max_workers == 1:
+            results = [update_churn(path, state, cutoff) for path, state in zip(self.paths, states)]
+        else:
+            with ProcessPoolExecutor(max_workers=min(len(self.paths), self.max_workers)) as executor:
+                results = list(executor.map(update_churn, self.paths, states, [cutoff] * len(self.paths)))
+
+        language_lines: Dict[str, int] = {}
+        for path, (state, commits) in zip(self.paths, results):
+            self._commits_parsed += commits
+            # update_churn already dropped the buckets older than the window.
+            self._save_state(path, state)
+            for bucket in state['days'].values():
+                for language, lines in bucket.items():
+                    language_lines[language] = language_lines.get(language, 0) + lines
+        return StatsCollection(calculate_percentages(language_lines))
+
+    def _state_path(self, path: str) -> Optional[Path]:
+        if self.state_dir is None:
+            return None
+        digest = hashlib.sha1(path.encode('utf-8')).hexdigest()[:16]
+        return self.state_dir / 'churn' / f'{digest}.json'
+
+    def _load_state(self, path: str) -> Dict[str, Any]:
+        state_path = self._state_path(path)
+        if state_path is None:
+            return {}
+        try:
+            state = json.loads(state_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) and isinstance(state.get('days'), dict) else {}
+
+    def _save_state(self, path: str, state: Dict[str, Any]) -> None:
+        """Atomically persist one clone's buckets, if a state directory is set"""
+        state_path = self._state_path(path)
+        if state_path is None:
+            return
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(state_path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(state, handle)
+            os.replace(tmp_path, state_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def run_metrics(self) -> Dict[str, Any]:
+        """
+        Report counters gathered while parsing.
+
+        Returns:
+            Dictionary with the commits parsed this run and the clones that
+            resumed from a stored commit
+        """
+        return {'commits_parsed': self._commits_parsed, 'repos_resumed': self._repos_resumed}
+
+    def describe_metrics(self, metrics: Dict[str, Any]) -> List[str]:
+        """Summarize ``run_metrics`` output for the run log"""
+        return [
+            f"Parsed {metrics['commits_parsed']} new commits; "
+            f"{metrics.get('repos_resumed', 0)} clones resumed from their last parsed commit."
+        ]
+
+    def close(self) -> None:
+        """Nothing to release; present for parity with ``GitHubClient``"""
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
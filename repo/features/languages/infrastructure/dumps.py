@@ -0,0 +1,212 @@
+"""
+Offline ingest of repository metadata dumps in (gzipped) JSON Lines
+"""
+
+import gzip
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..domain import StatsCollection
+from .aggregation import calculate_percentages
+from .prefilter import RepoPrefilter
+
+OwnerBytes = Dict[str, Dict[str, int]]
+
+
+class DumpRecord(NamedTuple):
+    """
+    The fields of a dumped repository that language stats depend on.
+
+    ``get`` mirrors ``dict.get`` so the prefilter accepts records as it does
+    listing entries.
+    """
+    owner: str
+    fork: bool = False
+    languages: Optional[Dict[str, int]] = None
+    language: Optional[str] = None
+    size: Optional[int] = None
+    pushed_at: Optional[str] = None
+    archived: bool = False
+    is_template: bool = False
+    mirror_url: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> Optional['DumpRecord']:
+        """
+        Project one decoded line, or return None if it names no usable owner.
+
+        The owner is read from ``owner.login`` (or a plain ``owner`` string)
+        and falls back to the first half of ``full_name``.
+        """
+        owner = data.get('owner')
+        if isinstance(owner, dict):
+            owner = owner.get('login')
+        if not owner and isinstance(data.get('full_name'), str) and '/' in data['full_name']:
+            owner = data['full_name'].split('/', 1)[0]
+        if not owner or str(owner) in ('.', '..') or '/' in str(owner) or '\\' in str(owner):
+            return None
+        languages = data.get('languages')
+        return cls(
+            owner=str(owner),
+            fork=bool(data.get('fork')),
+            languages=languages if isinstance(languages, dict) else None,
+            **{name: data[name] for name in cls._fields[3:] if data.get(name) is not None},
+        )
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Field value by name, like ``dict.get``"""
+        return getattr(self, name) if name in self._fields else default
+
+
+def _open_dump(path: str) -> IO[str]:
+    """Open a dump as text, decompressing ``.gz`` files on the fly"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def iter_dump_records(path: str) -> Iterator[Optional[DumpRecord]]:
+    """
+    Stream the repositories of one dump, one line at a time.
+
+    Yields:
+        A record per line, or None for a line that is not a repository
+        object; blank lines are skipped
+    """
+    with _open_dump(path) as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield None
+                continue
+            yield DumpRecord.from_json(data) if isinstance(data, dict) else None
+
+
+def aggregate_dump(path: str, prefilter: Optional[RepoPrefilter] = None) -> Tuple[OwnerBytes, int, int]:
+    """
+    Sum language bytes per owner over one dump in a single pass.
+
+    Memory grows with the number of owners and languages, not with the size
+    of the dump. Forks and repos rejected by ``prefilter`` are left out. A
+    repo's ``languages`` map is used when the dump has one; otherwise its
+    ``size`` (in KB) is attributed to its primary ``language``, as the
+    approximate backend does.
+
+    Args:
+        path: Dump file, gzipped when it ends in ``.gz``
+        prefilter: Listing-metadata rules applied to every record
+
+    Returns:
+        Tuple of the per-owner language bytes, the records read and the
+        malformed lines skipped
+    """
+    totals: OwnerBytes = {}
+    records = malformed = 0
+    for record in iter_dump_records(path):
+        if record is None:
+            malformed += 1
+            continue
+        records += 1
+        if record.fork or (prefilter is not None and prefilter.reason(record) is not None):
+            continue
+        languages = record.languages
+        if languages is None and record.language and record.size:
+            languages = {record.language: record.size * 1024}
+        if not languages:
+            continue
+        owner_totals = totals.setdefault(record.owner, {})
+        for language, size in languages.items():
+            if isinstance(size, int) and size > 0:
+                owner_totals[language] = owner_totals.get(language, 0) + size
+    return totals, records, malformed
+
+
+class DumpIngest:
+    """
+    Per-owner language stats from repository dumps, without API calls.
+
+    Each file is aggregated in one streaming pass; several files are spread
+    over a process pool and their per-owner totals merged. A repository
+    should appear in only one of the files given together.
+    """
+
+    def __init__(self, paths: Sequence[str], max_workers: int = 4,
+                 prefilter: Optional[RepoPrefilter] = None):
+        """
+        Initialize the ingest.
+
+        Args:
+            paths: Dump files (``.jsonl`` or ``.jsonl.gz``)
+            max_workers: Number of files aggregated in parallel processes
+            prefilter: Listing-metadata rules applied to every record
+
+        Raises:
+            ValueError: If no path is given or ``max_workers`` is below 1
+        """
+        if not paths:
+            raise ValueError("At least one dump file must be provided")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.paths = list(dict.fromkeys(paths))
+        self.max_workers = max_workers
+        self.prefilter = prefilter
+        self._records = 0
+        self._malformed = 0
+        self._owners = 0
+
+    def owner_stats(self) -> Dict[str, StatsCollection]:
+        """
+        Aggregate every dump and compute each owner's stats.
+
+        Returns:
+            Mapping of owner login to their StatsCollection; owners without
+            any counted bytes are left out
+
+        Raises:
+            OSError: If a dump cannot be read
+        """
+        if len(self.paths) == 1 or self.max_workers == 1:
+            results = [aggregate_dump(path, self.prefilter) for path in self.paths]
+        else:
+            with ProcessPoolExecutor(max_workers=min(len(self.paths), self.max_workers)) as executor:
+                results = list(executor.map(aggregate_dump, self.paths, [self.prefilter] * len(self.paths)))
+
+        merged: OwnerBytes = {}
+        for totals, records, malformed in results:
+            self._records += records
+            self._malformed += malformed
+            for owner, languages in totals.items():
+                owner_totals = merged.setdefault(owner, {})
+                for language, size in languages.items():
+                    owner_totals[language] = owner_totals.get(language, 0) + size
+        self._owners = len(merged)
+        return {
+            owner: StatsCollection(calculate_percentages(languages))
+            for owner, languages in sorted(merged.items())
+            if languages
+        }
+
+    def run_metrics(self) -> Dict[str, Any]:
+        """
+        Report counters gathered while ingesting.
+
+        Returns:
+            Dictionary with the records read, malformed lines skipped and
+            owners found
+        """
+        return {
+            'dump_records': self._records,
+            'dump_malformed': self._malformed,
+            'dump_owners': self._owners,
+        }
+
+    def describe_metrics(self, metrics: Dict[str, Any]) -> List[str]:
+        """Summarize ``run_metrics`` output for the run log"""
+        return [
+            f"Ingested {metrics['dump_records']} repositories for {metrics['dump_owners']} owners; "
+            f"skipped {metrics['dump_malformed']} malformed lines."
+        ]
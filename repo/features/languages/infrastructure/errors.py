@@ -0,0 +1,18 @@
+"""
+Errors raised by the GitHub infrastructure layer
+"""
+
+
+class GitHubAPIError(Exception):
+    """Raised when GitHub API request fails"""
+    pass
+
+
+class RateLimitExceededError(GitHubAPIError):
+    """Raised when the API quota is exhausted and its reset is too far away to wait for"""
+    pass
+
+
+class CircuitOpenError(GitHubAPIError):
+    """Raised without sending a request while the circuit breaker is open"""
+    pass
@@ -0,0 +1,104 @@
+"""
+Change detection from GitHub's public events feeds
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+
+class EventCursorStore:
+    """
+    Per-owner polling state of the ``/users/{u}/events`` and
+    ``/orgs/{o}/events`` feeds.
+
+    For every owner it keeps the feed's last ``ETag``, sent back as
+    ``If-None-Match`` so an unchanged feed costs a ``304``, and the id of the
+    newest event already applied.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file holding the cursors (created on save)
+        """
+        self.path = Path(path)
+        self._cursors: Dict[str, Dict[str, Optional[str]]] = {}
+        self._load()
+
+    def get(self, owner: str) -> Dict[str, Optional[str]]:
+        """Return ``etag`` and ``cursor`` stored for ``owner`` (both may be None)"""
+        entry = self._cursors.get(owner, {})
+        return {'etag': entry.get('etag'), 'cursor': entry.get('cursor')}
+
+    def update(self, owner: str, etag: Optional[str], cursor: Optional[str]) -> None:
+        """Remember the feed's validator and newest applied event for ``owner``"""
+        self._cursors[owner] = {'etag': etag, 'cursor': cursor}
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self._cursors = {key: value for key, value in data.items() if isinstance(value, dict)}
+
+    def save(self) -> None:
+        """Atomically persist the cursors"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(self._cursors, handle)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+
+def _event_id(event: Dict[str, Any]) -> int:
+    try:
+        return int(event.get('id'))
+    except (TypeError, ValueError):
+        return 0
+
+
+def scan_push_events(events: Iterable[Dict[str, Any]], cursor: Optional[str],
+                     owners: Set[str]) -> Tuple[Dict[str, Tuple[str, str]], Optional[str], bool]:
+    """
+    Collect the repositories pushed to since ``cursor`` from one feed page.
+
+    Args:
+        events: Events as returned by the feed, newest first
+        cursor: Id of the newest event applied by the previous run
+        owners: Lower-cased logins whose repositories count; pushes to
+            other people's repos show up in a user's feed and are ignored
+
+    Returns:
+        Tuple of the pushed repos (repo id to ``(full_name, created_at)`` of
+        the newest push), the newest event id on the page and whether the
+        page reached ``cursor``, i.e. no events were missed in between
+    """
+    last_seen = int(cursor) if cursor and cursor.isdigit() else None
+    pushed: Dict[str, Tuple[str, str]] = {}
+    newest: Optional[str] = None
+    reached = False
+    for event in events:
+        event_id = _event_id(event)
+        if newest is None:
+            newest = str(event_id)
+        if last_seen is not None and event_id <= last_seen:
+            reached = True
+            break
+        repo = event.get('repo') or {}
+        full_name = str(repo.get('name') or '')
+        if event.get('type') != 'PushEvent' or full_name.split('/', 1)[0].lower() not in owners:
+            continue
+        key = str(repo.get('id') or full_name)
+        pushed.setdefault(key, (full_name, str(event.get('created_at') or '')))
+    return pushed, newest, reached
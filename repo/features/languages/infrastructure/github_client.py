@@ -2,14 +2,41 @@
 GitHub API client for fetching language statistics
 """
 
-import requests
-from typing import Dict, List, Optional
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 from ..domain import LanguageStat, StatsCollection
-
-
-class GitHubAPIError(Exception):
-    """Raised when GitHub API request fails"""
-    pass
+from .aggregation import (
+    approximate_language_bytes,
+    calculate_percentages,
+    distribution_error,
+    merge_language_bytes,
+)
+from .errors import GitHubAPIError, RateLimitExceededError
+from .events import EventCursorStore, scan_push_events
+from .graphql import (
+    GraphQLResponseError,
+    build_repository_languages_payload,
+    parse_repository_languages_page,
+)
+from .hedging import Hedger
+from .http_cache import CachedResponse, ConditionalRequestCache
+from .listing import RepoRecord, iter_json_array
+from .prefilter import RepoPrefilter
+from .rate_limit import RateLimitScheduler
+from .retry import CircuitBreaker, RetryPolicy
+from .snapshots import RepoSnapshotStore, repo_key
+from .transport import (
+    HTTPStatusError,
+    TransportConnectionError,
+    TransportError,
+    TransportTimeout,
+    create_transport,
+)
+from .webhooks import WEBHOOK_EVENTS, parse_webhook
 
 
 class GitHubClient:
@@ -20,55 +47,307 @@ class GitHubClient:
     """
     
     API_BASE_URL = "https://api.github.com"
+    GRAPHQL_URL = "https://api.github.com/graphql"
+    BACKENDS = ('rest', 'graphql', 'approximate')
+    REFRESH_MODES = ('listing', 'events')
+    DEFAULT_MAX_WORKERS = 8
+    GRAPHQL_LANGUAGES_PER_REPO = 100
+    TRANSIENT_ERRORS = (TransportConnectionError, TransportTimeout)
+    REPOS_PER_PAGE = 100
+    DEFAULT_TIMEOUT = (5.0, 30.0)
+    STREAM_CHUNK_SIZE = 64 * 1024
+    EVENTS_PER_PAGE = 100
+    RATE_LIMIT_RESET_MARGIN = 1.0
     
-    def __init__(self, token: Optional[str] = None, username: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, username: Optional[str] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS, cache_dir: Optional[str] = None,
+                 backend: str = 'rest', graphql_url: Optional[str] = None,
+                 rate_limit_wait: float = 0.0, tokens: Optional[Sequence[str]] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, hedge: bool = False,
+                 prefilter: Optional[RepoPrefilter] = None,
+                 max_requests: Optional[int] = None, transport: str = 'requests',
+                 refresh: str = 'listing'):
         """
         Initialize GitHub client.
         
         Args:
             token: GitHub personal access token (optional but recommended)
             username: GitHub username for fetching user repos
+            max_workers: Number of concurrent per-repo language requests
+                (1 fetches sequentially)
+            cache_dir: Directory for the conditional-request cache and per-repo
+                language snapshots; persisting it across runs lets unchanged
+                responses come back as 304s and skips unchanged repos entirely
+            backend: ``rest`` (one request per repo), ``graphql`` (repos and
+                their languages in batched pages; requires a token) or
+                ``approximate`` (each repo's primary language and size from the
+                listing, with no per-repo requests)
+            graphql_url: GraphQL endpoint override (defaults to GitHub's)
+            rate_limit_wait: Longest quota reset, in seconds, worth waiting for
+                once the rate limit is exhausted; beyond it the run fails with
+                RateLimitExceededError rather than returning partial stats
+            tokens: Additional tokens pooled with ``token``; each request goes
+                to the token with the most remaining quota
+            retry_policy: Backoff policy for transient failures
+            circuit_breaker: Breaker that fails fast while the API is down
+            timeout: ``(connect, read)`` timeout in seconds applied to every
+                request; a timed-out request counts as a transient failure
+            hedge: Race a duplicate ``languages_url`` request once the first
+                one is slower than the observed p95 latency
+            prefilter: Listing-metadata rules for repos not worth a
+                ``languages_url`` request (skips empty repos by default)
+            max_requests: Cap on per-repo ``languages_url`` requests; the
+                largest repos are queried and the rest extrapolated from their
+                primary language (None for no cap)
+            transport: HTTP transport, ``requests`` or ``stdlib`` (a pooled
+                ``http.client`` backend that does not import ``requests``)
+            refresh: ``listing`` re-reads every repo listing; ``events`` polls
+                the owners' public events feeds and refetches only repos pushed
+                to since the last run, patching the stored snapshots (rest
+                backend; requires ``cache_dir`` and no ``max_requests``)
         """
-        self.token = token
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {', '.join(self.BACKENDS)}")
+        if max_requests is not None and max_requests < 0:
+            raise ValueError("max_requests must not be negative")
+        if refresh not in self.REFRESH_MODES:
+            raise ValueError(f"refresh must be one of {', '.join(self.REFRESH_MODES)}")
+        if refresh == 'events' and (not cache_dir or max_requests is not None):
+            raise ValueError("refresh='events' needs a cache_dir and exact snapshots (no max_requests)")
+        self.tokens = [t for t in dict.fromkeys([token, *(tokens or [])]) if t]
+        self.token = token or (self.tokens[0] if self.tokens else None)
         self.username = username
-        self._session = self._create_session()
+        self.max_workers = max_workers
+        self.backend = backend
+        self.graphql_url = graphql_url or self.GRAPHQL_URL
+        self._transport = self._create_transport(transport)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.cache_dir = cache_dir
+        self._cache = (
+            ConditionalRequestCache(os.path.join(cache_dir, 'http')) if cache_dir else None
+        )
+        self._scheduler = RateLimitScheduler(
+            max_workers,
+            tokens=self.tokens or [None],
+            state_path=os.path.join(cache_dir, 'rate_limit.json') if cache_dir else None,
+            max_wait=rate_limit_wait,
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._breaker = circuit_breaker or CircuitBreaker()
+        self.timeout = timeout
+        self._hedger = Hedger(max_workers) if hedge else None
+        self.prefilter = prefilter or RepoPrefilter()
+        self.max_requests = max_requests
+        self.refresh = refresh
+        self._sleep = time.sleep
+        self._skipped_repos = 0
+        self._retries = 0
+        self._snapshots_reused = 0
+        self._snapshots_refreshed = 0
+        self._prefiltered: Dict[str, int] = {}
+        self._approximation_error: Optional[float] = None
+        self._approximation_sample = 0
+        self._extrapolated_repos = 0
+        self._duplicate_repos = 0
+        self._event_refresh: Optional[str] = None
+        self._patched_repos = 0
+        self._webhook_update: Optional[str] = None
+        self._counter_lock = threading.Lock()
     
-    def _create_session(self) -> requests.Session:
-        """Create configured requests session"""
-        session = requests.Session()
-        session.headers.update({
+    def _create_transport(self, name: str) -> Any:
+        """Create the HTTP transport with a pool sized to the worker count"""
+        headers = {
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'Lang-Stats-Generator'
-        })
+        }
         if self.token:
-            session.headers['Authorization'] = f'token {self.token}'
-        return session
+            headers['Authorization'] = f'token {self.token}'
+        return create_transport(name, pool_size=self.max_workers, headers=headers)
     
-    def fetch_language_stats(self, username: Optional[str] = None) -> StatsCollection:
+    def fetch_language_stats(self, username: Optional[str] = None, orgs: Sequence[str] = (),
+                             accounts: Sequence[str] = ()) -> StatsCollection:
         """
         Fetch language statistics for a GitHub user.
         
+        With ``orgs`` or ``accounts`` the stats cover every listed owner; a
+        repo reachable through several of them is counted and fetched once.
+        
         Args:
             username: GitHub username (uses self.username if not provided)
+            orgs: Organizations whose repositories are included as well
+            accounts: Additional user accounts whose repositories are included
             
         Returns:
             StatsCollection with language statistics
             
         Raises:
             GitHubAPIError: If API request fails
-            ValueError: If no username provided
+            ValueError: If no username provided, or several owners are
+                requested from the GraphQL backend
         """
-        username = username or self.username
-        if not username:
-            raise ValueError("Username must be provided")
+        owners = self._owners(username, orgs, accounts)
+        username = owners[0][1]
         
-        repos = self._fetch_user_repos(username)
-        language_bytes = self._aggregate_language_bytes(repos)
+        if self.backend == 'graphql':
+            if len(owners) > 1:
+                raise ValueError("The graphql backend covers a single user; use rest for orgs and accounts")
+            language_bytes = self._fetch_language_bytes_graphql(username)
+        elif self.backend == 'approximate':
+            language_bytes = self._approximate_language_bytes(owners)
+        else:
+            name = '+'.join(owner for _, owner in owners)
+            snapshots = self._open_snapshots(name)
+            cursors = None
+            polled = None
+            if self.refresh == 'events':
+                cursors = EventCursorStore(os.path.join(self.cache_dir, 'events', f'{name}.json'))
+                polled = self._poll_language_bytes(owners, snapshots, cursors)
+            language_bytes = polled
+            if language_bytes is None:
+                language_bytes = self._aggregate_language_bytes(
+                    self._iter_owners_repos(owners), snapshots
+                )
+            if snapshots is not None:
+                snapshots.save(prune=polled is None)
+            if cursors is not None:
+                cursors.save()
+            if snapshots is not None:
+                with self._counter_lock:
+                    self._snapshots_reused += snapshots.reused
+                    self._snapshots_refreshed += snapshots.refreshed
         stats = self._calculate_percentages(language_bytes)
         
         return StatsCollection(stats)
     
-    def _fetch_user_repos(self, username: str) -> List[Dict]:
+    def apply_webhook(self, event: str, payload: Dict[str, Any], username: Optional[str] = None,
+                      orgs: Sequence[str] = (), accounts: Sequence[str] = ()) -> Optional[StatsCollection]:
+        """
+        Update the stored per-repo languages from one webhook delivery.
+        
+        A ``push`` to the default branch, or a ``repository`` event that
+        creates, publishes or unarchives a repo, refetches that repo's
+        languages alone; deleting, archiving or privatizing it drops its
+        snapshot. The stats are then the sum of the stored snapshots, so a
+        delivery costs at most one request regardless of the account's size.
+        
+        Args:
+            event: Webhook event name (``X-GitHub-Event``)
+            payload: Decoded delivery body
+            username: GitHub username (uses self.username if not provided)
+            orgs: Organizations covered by the stored snapshots
+            accounts: Additional user accounts covered by the stored snapshots
+            
+        Returns:
+            StatsCollection with language statistics, or None if the full
+            listing has to be read instead: the event is not a webhook
+            event, no snapshots are stored yet, the payload has no
+            ``pushed_at`` to store the refetched languages under or the
+            refetch failed
+            
+        Raises:
+            ValueError: If no username or cache directory is configured, or
+                the payload has no repository
+        """
+        owners = self._owners(username, orgs, accounts)
+        if not self.cache_dir:
+            raise ValueError("Webhook updates need a cache_dir holding per-repo snapshots")
+        snapshots = self._open_snapshots('+'.join(owner for _, owner in owners))
+        if event not in WEBHOOK_EVENTS or not len(snapshots):
+            self._webhook_update = 'listing'
+            return None
+        
+        change = parse_webhook(event, payload)
+        if change is None or change.owner.lower() not in {owner.lower() for _, owner in owners}:
+            self._webhook_update = 'ignored'
+        elif change.action == 'remove' or change.repo.fork or not self._passes_prefilter(change.repo):
+            snapshots.remove(repo_key(change.repo))
+            self._webhook_update = 'removed'
+        else:
+            repo = change.repo
+            if not repo.languages_url:
+                repo = repo._replace(languages_url=f"{self.API_BASE_URL}/repos/{repo.full_name}/languages")
+            languages = self._fetch_repo_languages(repo.languages_url) if repo.pushed_at else None
+            if languages is None:
+                self._webhook_update = 'listing'
+                return None
+            if repo.size is not None:
+                snapshots.record(repo, languages)
+            else:
+                snapshots.patch(repo_key(repo), languages, repo.pushed_at)
+            self._webhook_update = 'refreshed'
+        snapshots.save(prune=False)
+        return StatsCollection(self._calculate_percentages(snapshots.totals()))
+    
+    def iter_repositories(self, username: Optional[str] = None, orgs: Sequence[str] = (),
+                          accounts: Sequence[str] = ()) -> Iterator[RepoRecord]:
+        """
+        Yield the repositories that count toward language stats.
+        
+        Forks and repos rejected by the prefilter are left out, and a repo
+        reachable through several owners is yielded once.
+        
+        Args:
+            username: GitHub username (uses self.username if not provided)
+            orgs: Organizations whose repositories are included as well
+            accounts: Additional user accounts whose repositories are included
+            
+        Raises:
+            GitHubAPIError: If a listing request fails
+            ValueError: If no username provided
+        """
+        for repo in self._iter_owners_repos(self._owners(username, orgs, accounts)):
+            if not repo.get('fork') and self._passes_prefilter(repo):
+                yield repo
+    
+    def open_tarball(self, full_name: str, etag: Optional[str] = None) -> Any:
+        """
+        Start streaming a repository's default-branch tarball.
+        
+        The API answers with a redirect to the download host. The transport
+        follows it and drops ``Authorization`` on the way, so the token never
+        reaches the download host.
+        
+        Args:
+            full_name: ``owner/name`` of the repository
+            etag: ``ETag`` of a previously downloaded tarball, sent as
+                ``If-None-Match``
+            
+        Returns:
+            Streamed response; read it with ``iter_content`` and ``close`` it.
+            With ``etag``, a ``304`` response means the tarball is unchanged
+            
+        Raises:
+            TransportError: If the download fails or a redirect was not followed
+        """
+        url = f"{self.API_BASE_URL}/repos/{full_name}/tarball"
+        headers = {'If-None-Match': etag} if etag else {}
+        response = self._send('core', self._transport.get, url, headers=headers, stream=True)
+        try:
+            response.raise_for_status()
+            if 300 <= response.status_code < 400 and response.status_code != 304:
+                raise HTTPStatusError(f"Unfollowed {response.status_code} for url: {url}",
+                                      response.status_code)
+        except TransportError:
+            response.close()
+            raise
+        return response
+    
+    def _owners(self, username: Optional[str], orgs: Sequence[str],
+                accounts: Sequence[str]) -> List[Tuple[str, str]]:
+        """``(kind, name)`` pairs for the user, extra accounts and orgs, without repeats"""
+        username = username or self.username
+        if not username:
+            raise ValueError("Username must be provided")
+        return list(dict.fromkeys(
+            [('users', username), *(('users', account) for account in accounts),
+             *(('orgs', org) for org in orgs)]
+        ))
+    
+    def _fetch_user_repos(self, username: str) -> List[RepoRecord]:
         """
         Fetch all repositories for a user.
         
@@ -76,52 +355,660 @@ class GitHubClient:
             username: GitHub username
             
         Returns:
-            List of repository data dictionaries
+            List of repository records
             
         Raises:
             GitHubAPIError: If request fails
         """
-        url = f"{self.API_BASE_URL}/users/{username}/repos"
-        params = {'per_page': 100, 'type': 'owner'}
+        return list(self._iter_user_repos(username))
+    
+    def _iter_user_repos(self, username: str) -> Iterator[RepoRecord]:
+        """Yield a user's repositories page by page"""
+        return self._iter_owner_repos('users', username)
+    
+    def _iter_owners_repos(self, owners: Sequence[Tuple[str, str]]) -> Iterator[RepoRecord]:
+        """
+        Yield the repositories of several owners, each repo once.
+        
+        Listings of different owners are fetched concurrently and repos are
+        de-duplicated by id, so a repo shared between a user and an org costs
+        a single ``languages_url`` request.
         
+        Args:
+            owners: ``(kind, name)`` pairs, kind being ``users`` or ``orgs``
+            
+        Yields:
+            Repository records
+            
+        Raises:
+            GitHubAPIError: If a page request fails
+        """
+        seen: Set[str] = set()
+        for repo in self._iter_listings(owners):
+            key = repo_key(repo)
+            if key in seen:
+                with self._counter_lock:
+                    self._duplicate_repos += 1
+                continue
+            seen.add(key)
+            yield repo
+    
+    def _iter_listings(self, owners: Sequence[Tuple[str, str]]) -> Iterator[RepoRecord]:
+        """Chain the owners' listings, fanning out across owners when possible"""
+        if len(owners) == 1 or self.max_workers == 1:
+            for kind, owner in owners:
+                yield from self._iter_owner_repos(kind, owner)
+            return
+        
+        # Listings wait on page requests in the shared pool, so they run on
+        # their own threads to keep the shared pool free for those requests.
+        with ThreadPoolExecutor(max_workers=min(len(owners), self.max_workers),
+                                thread_name_prefix='github-listing') as pool:
+            futures = [
+                pool.submit(lambda kind=kind, owner=owner: list(self._iter_owner_repos(kind, owner)))
+                for kind, owner in owners
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+    
+    def _iter_owner_repos(self, kind: str, owner: str) -> Iterator[RepoRecord]:
+        """
+        Yield a user's or organization's repositories page by page.
+        
+        With a worker pool, the ``public_repos`` count from the owner's profile
+        is used to request every page concurrently; pages are still yielded in
+        order. Without a usable count the listing follows ``Link: rel="next"``
+        headers one page at a time. Either way each page's repos are yielded
+        as soon as they arrive, so callers can start per-repo work before later
+        pages are fetched. Pages are decoded incrementally into compact
+        :class:`RepoRecord` entries rather than full repository objects.
+        
+        Args:
+            kind: ``users`` or ``orgs``
+            owner: User or organization login
+            
+        Yields:
+            Repository records
+            
+        Raises:
+            GitHubAPIError: If a page request fails
+        """
+        url = f"{self.API_BASE_URL}/{kind}/{owner}/repos"
+        params = {'per_page': self.REPOS_PER_PAGE, 'type': 'owner' if kind == 'users' else 'sources'}
+        
+        page_count = self._count_repo_pages(owner, kind) if self.max_workers > 1 else None
+        if not page_count or page_count < 2:
+            yield from self._walk_repo_pages(owner, url, params)
+            return
+        
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self._fetch_repo_page, owner, url, {**params, 'page': page})
+            for page in range(1, page_count + 1)
+        ]
+        next_url = None
         try:
-            response = self._session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            for future in futures:
+                page, next_url = future.result()
+                yield from page
+        finally:
+            for future in futures:
+                future.cancel()
+        
+        # The count can lag behind reality; keep walking if GitHub has more.
+        if next_url:
+            yield from self._walk_repo_pages(owner, next_url, None)
+    
+    def _walk_repo_pages(self, username: str, url: Optional[str],
+                         params: Optional[Dict]) -> Iterator[RepoRecord]:
+        """Follow ``rel="next"`` links sequentially starting at ``url``"""
+        while url:
+            page, url = self._fetch_repo_page(username, url, params)
+            # The next link already carries the query string.
+            params = None
+            yield from page
+    
+    def _fetch_repo_page(self, username: str, url: str,
+                         params: Optional[Dict]) -> Tuple[List[RepoRecord], Optional[str]]:
+        """
+        Fetch one page of a repo listing.
+        
+        Returns:
+            Tuple of the page's repos and the ``rel="next"`` URL, if any
+            
+        Raises:
+            GitHubAPIError: If the request fails
+        """
+        try:
+            return self._get_json(url, params, item_parser=RepoRecord.from_json)
+        except (TransportError, ValueError) as e:
             raise GitHubAPIError(f"Failed to fetch repos for {username}: {e}")
     
-    def _aggregate_language_bytes(self, repos: List[Dict]) -> Dict[str, int]:
+    def _count_repo_pages(self, owner: str, kind: str = 'users') -> Optional[int]:
+        """
+        Estimate the number of listing pages from the owner's ``public_repos``.
+        
+        Returns:
+            Page count, or None if the profile could not be read
+        """
+        try:
+            profile, _ = self._get_json(f"{self.API_BASE_URL}/{kind}/{owner}")
+            public_repos = profile.get('public_repos')
+        except (TransportError, AttributeError):
+            return None
+        if not isinstance(public_repos, int) or public_repos < 0:
+            return None
+        return -(-public_repos // self.REPOS_PER_PAGE)
+    
+    def _open_snapshots(self, name: str) -> Optional[RepoSnapshotStore]:
+        """Per-repo snapshot store for an account set, if a cache directory is set"""
+        if not self.cache_dir:
+            return None
+        return RepoSnapshotStore(os.path.join(self.cache_dir, 'snapshots', f'{name}.json'))
+    
+    def _aggregate_language_bytes(self, repos: Iterable[Dict],
+                                  snapshots: Optional[RepoSnapshotStore] = None) -> Dict[str, int]:
         """
         Aggregate language bytes across all repositories.
         
+        Per-repo requests run on a bounded thread pool when ``max_workers`` is
+        greater than one and are submitted as repos arrive, so a paginated
+        listing overlaps with language fetching. Forks and repos rejected by
+        the prefilter are dropped before any request, and repos whose snapshot
+        is still current are answered from ``snapshots``. Results are merged in
+        repository order either way.
+        
         Args:
-            repos: List of repository data
+            repos: Iterable of repository data
+            snapshots: Store of previously fetched per-repo languages
             
         Returns:
             Dictionary mapping language names to total bytes
         """
-        language_totals = {}
+        sources = (
+            repo for repo in repos
+            if not repo.get('fork') and repo.get('languages_url')  # Skip forked repos
+            and self._passes_prefilter(repo)
+        )
         
+        if self.max_requests is not None:
+            return self._plan_language_bytes(list(sources), snapshots)
+        return merge_language_bytes(self._iter_repo_languages(sources, snapshots))
+    
+    def _iter_repo_languages(self, repos: Iterable[Dict],
+                             snapshots: Optional[RepoSnapshotStore]) -> Iterator[Optional[Dict[str, int]]]:
+        """Yield each repo's language byte map (None for failures) in repo order"""
+        if self.max_workers == 1:
+            for repo in repos:
+                yield self._repo_languages(repo, snapshots)
+            return
+        
+        executor = self._get_executor()
+        results: List[Any] = []
+        try:
+            for repo in repos:
+                cached = snapshots.lookup(repo) if snapshots is not None else None
+                if cached is not None:
+                    results.append(cached)
+                else:
+                    results.append(executor.submit(self._refresh_repo_languages, repo, snapshots))
+        except BaseException:
+            for result in results:
+                if isinstance(result, Future):
+                    result.cancel()
+            raise
+        
+        for result in results:
+            yield result.result() if isinstance(result, Future) else result
+    
+    def _plan_language_bytes(self, repos: List[Dict],
+                             snapshots: Optional[RepoSnapshotStore]) -> Dict[str, int]:
+        """
+        Aggregate language bytes with at most ``max_requests`` per-repo requests.
+        
+        Repos with a current snapshot are free. Of the rest, the largest by
+        ``size`` are queried, since they carry most of the bytes; the remainder
+        is extrapolated from each repo's primary ``language`` and ``size``,
+        scaled by the bytes-per-KB ratio observed on the measured repos.
+        
+        Args:
+            repos: Candidate repositories (forks and prefiltered repos removed)
+            snapshots: Store of previously fetched per-repo languages
+            
+        Returns:
+            Dictionary mapping language names to total (partly estimated) bytes
+        """
+        measured: List[Tuple[Dict, Dict[str, int]]] = []
+        pending: List[Dict] = []
         for repo in repos:
-            if repo.get('fork'):
-                continue  # Skip forked repos
+            cached = snapshots.lookup(repo) if snapshots is not None else None
+            if cached is not None:
+                measured.append((repo, cached))
+            else:
+                pending.append(repo)
+        
+        pending.sort(key=lambda repo: repo.get('size') or 0, reverse=True)
+        queried, unqueried = pending[:self.max_requests], pending[self.max_requests:]
+        for repo, languages in zip(queried, self._iter_repo_languages(queried, snapshots)):
+            if languages is not None:
+                measured.append((repo, languages))
+        
+        measured_kb = sum(repo.get('size') or 0 for repo, _ in measured)
+        measured_bytes = sum(sum(languages.values()) for _, languages in measured)
+        bytes_per_kb = measured_bytes / measured_kb if measured_kb and measured_bytes else 1024
+        with self._counter_lock:
+            self._extrapolated_repos += len(unqueried)
+        return merge_language_bytes([
+            *(languages for _, languages in measured),
+            approximate_language_bytes(unqueried, bytes_per_kb),
+        ])
+    
+    def _passes_prefilter(self, repo: Dict) -> bool:
+        """Apply the prefilter, counting the requests it saves per rule"""
+        reason = self.prefilter.reason(repo)
+        if reason is None:
+            return True
+        with self._counter_lock:
+            self._prefiltered[reason] = self._prefiltered.get(reason, 0) + 1
+        return False
+    
+    def _repo_languages(self, repo: Dict,
+                        snapshots: Optional[RepoSnapshotStore]) -> Optional[Dict[str, int]]:
+        """Languages of one repository, from its snapshot while still current"""
+        cached = snapshots.lookup(repo) if snapshots is not None else None
+        if cached is not None:
+            return cached
+        return self._refresh_repo_languages(repo, snapshots)
+    
+    def _refresh_repo_languages(self, repo: Dict,
+                                snapshots: Optional[RepoSnapshotStore]) -> Optional[Dict[str, int]]:
+        """
+        Fetch one repository's languages and record them in ``snapshots``.
+        
+        Returns:
+            Dictionary of language bytes, or None if the request failed
+        """
+        languages = self._fetch_repo_languages(repo.get('languages_url'))
+        if snapshots is not None and languages is not None:
+            snapshots.record(repo, languages)
+        return languages
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the shared worker pool, creating it on first use"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='github-client',
+            )
+        return self._executor
+    
+    def _fetch_repo_languages(self, languages_url: str) -> Optional[Dict[str, int]]:
+        """
+        Fetch the language byte map for a single repository.
+        
+        Args:
+            languages_url: The repository's ``languages_url``
+            
+        Returns:
+            Dictionary of language bytes, or None if the request failed or
+            the body is not a language map
+        """
+        try:
+            if self._hedger is not None:
+                languages, _ = self._hedger.call(lambda: self._get_json(languages_url))
+            else:
+                languages, _ = self._get_json(languages_url)
+            if isinstance(languages, dict):
+                return languages
+        except TransportError:
+            pass
+        with self._counter_lock:
+            self._skipped_repos += 1
+        return None
+    
+    def _get_json(self, url: str, params: Optional[Dict] = None,
+                  item_parser: Optional[Callable[[Dict], Any]] = None) -> Tuple[Any, Optional[str]]:
+        """
+        GET ``url`` and decode its JSON body.
+        
+        With a cache directory configured, stored validators are sent as
+        ``If-None-Match`` / ``If-Modified-Since`` and a ``304 Not Modified``
+        is answered from disk.
+        
+        Args:
+            url: Request URL
+            params: Optional query parameters
+            item_parser: For JSON array bodies, a projection applied to each
+                element while the body is streamed, so the full array is never
+                held in memory
             
-            languages_url = repo.get('languages_url')
-            if not languages_url:
+        Returns:
+            Tuple of the decoded body and the ``rel="next"`` URL, if any
+            
+        Raises:
+            TransportError: If the request fails
+            ValueError: If a streamed body is not a JSON array
+        """
+        cached = self._cache.get(url, params) if self._cache else None
+        headers = cached.conditional_headers() if cached else {}
+        
+        if item_parser is None:
+            response = self._send('core', self._transport.get, url, params=params, headers=headers)
+        else:
+            response = self._send(
+                'core', self._transport.get, url, params=params, headers=headers, stream=True
+            )
+        try:
+            if cached is not None and response.status_code == 304:
+                self._cache.record(hit=True)
+                body = cached.body
+                if item_parser is not None:
+                    body = [item_parser(item) for item in body]
+                return body, cached.next_url
+            response.raise_for_status()
+            if 300 <= response.status_code < 400:
+                # Transports follow redirects; one still left here has no body worth decoding
+                raise HTTPStatusError(f"Unexpected {response.status_code} for url: {url}",
+                                      response.status_code)
+            if item_parser is None:
+                body = response.json()
+            else:
+                body = [
+                    item_parser(item)
+                    for item in iter_json_array(response.iter_content(self.STREAM_CHUNK_SIZE))
+                ]
+        finally:
+            if item_parser is not None:
+                response.close()
+        next_url = response.links.get('next', {}).get('url')
+        
+        if self._cache is not None:
+            self._cache.record(hit=False)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                stored = [item._asdict() for item in body] if item_parser is not None else body
+                self._cache.put(url, params, CachedResponse(stored, etag, last_modified, next_url))
+        return body, next_url
+    
+    def _send(self, resource: str, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Issue a request through the circuit breaker, retry policy and
+        rate-limit scheduler.
+        
+        The scheduler picks the pooled token with the most remaining quota and
+        is fed every response's quota headers. A response rejected because that
+        token ran out is retried on another token, or after the reset if every
+        token is exhausted and the reset is close enough to wait for.
+        Connection errors, timeouts, 5xx answers and secondary rate limits are
+        retried with jittered exponential backoff, honoring ``Retry-After``.
+        Consecutive connection errors and 5xx answers open the circuit breaker
+        so later requests fail fast. Every attempt is bounded by ``timeout``.
+        
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            RateLimitExceededError: If every token is exhausted beyond ``rate_limit_wait``
+            TransportError: If the request still fails after retrying
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 1
+        exhausted_tokens: Set[Optional[str]] = set()
+        while True:
+            self._breaker.before_request()
+            try:
+                with self._scheduler.slot(resource) as token:
+                    if token:
+                        kwargs['headers'] = {**(kwargs.get('headers') or {}),
+                                             'Authorization': f'token {token}'}
+                    response = method(*args, **kwargs)
+            except self.TRANSIENT_ERRORS:
+                self._breaker.record_failure()
+                if not self._wait_before_retry(attempt):
+                    raise
+                attempt += 1
+                continue
+            except RateLimitExceededError:
+                self._breaker.release_trial()
+                raise
+            
+            self._scheduler.update(response.headers, token)
+            exhausted = response.headers.get('X-RateLimit-Remaining') == '0'
+            if exhausted and response.status_code in (403, 429):
+                # A quota answer says nothing about the API's health
+                self._breaker.release_trial()
+                response.close()
+                exhausted_tokens.add(token)
+                if len(exhausted_tokens) < len(self._scheduler.tokens):
+                    continue  # The scheduler routes the retry to another token
+                delay = self._rate_limit_delay(response.headers)
+                if (attempt >= self.retry_policy.max_attempts or delay is None
+                        or delay > self._scheduler.max_wait):
+                    raise RateLimitExceededError(
+                        f"GitHub API {resource} quota exhausted for all "
+                        f"{len(self._scheduler.tokens)} token(s)"
+                        + (f"; resets in {math.ceil(delay)}s" if delay is not None else "")
+                    )
+                self._pause(delay)
+                attempt += 1
+                exhausted_tokens.clear()
                 continue
+            if not self.retry_policy.should_retry(response.status_code, response.headers):
+                self._breaker.record_success()
+                return response
+            if response.status_code >= 500:
+                self._breaker.record_failure()
+            delay = self._retry_delay(attempt, response.headers.get('Retry-After'))
+            if delay is None:
+                return response
+            response.close()
+            self._pause(delay)
+            attempt += 1
+    
+    def _wait_before_retry(self, attempt: int, retry_after: Optional[str] = None) -> bool:
+        """
+        Sleep before retry number ``attempt`` if the policy allows one.
+        
+        Returns:
+            False when the request should not be retried again
+        """
+        delay = self._retry_delay(attempt, retry_after)
+        if delay is None:
+            return False
+        self._pause(delay)
+        return True
+    
+    def _rate_limit_delay(self, headers: Mapping[str, str]) -> Optional[float]:
+        """Seconds until an exhausted quota resets, plus a margin, or None if unknown"""
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0.0) + self.RATE_LIMIT_RESET_MARGIN
+            except ValueError:
+                pass
+        try:
+            reset = float(headers['X-RateLimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return max(reset - time.time(), 0.0) + self.RATE_LIMIT_RESET_MARGIN
+    
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Backoff before retry number ``attempt``, or None if the policy allows no retry"""
+        if attempt >= self.retry_policy.max_attempts:
+            return None
+        return self.retry_policy.delay(attempt, retry_after)
+    
+    def _pause(self, delay: float) -> None:
+        """Count a retry and sleep for its backoff"""
+        with self._counter_lock:
+            self._retries += 1
+        self._sleep(delay)
+    
+    def _poll_language_bytes(self, owners: Sequence[Tuple[str, str]], snapshots: RepoSnapshotStore,
+                             cursors: EventCursorStore) -> Optional[Dict[str, int]]:
+        """
+        Bring the stored snapshots up to date from the owners' events feeds.
+        
+        Each feed is requested with its stored ``ETag``; when all answer
+        ``304 Not Modified`` the stored totals are returned as they are.
+        Otherwise only the repos that received a ``PushEvent`` since the last
+        cursor are refetched and patched into ``snapshots``.
+        
+        Args:
+            owners: ``(kind, name)`` pairs, kind being ``users`` or ``orgs``
+            snapshots: Per-repo languages from earlier runs
+            cursors: Feed validators and cursors, advanced even when a full
+                listing is needed
+            
+        Returns:
+            Language byte totals, or None if the feeds cannot be trusted to
+            cover every change (no cursor yet, events missed since the last
+            run, a pushed repo without a snapshot or a failed refetch) and the
+            full listing has to be read instead
+            
+        Raises:
+            GitHubAPIError: If a feed request fails
+        """
+        owner_names = {owner.lower() for _, owner in owners}
+        pushed: Dict[str, Tuple[str, str]] = {}
+        complete = True
+        for kind, owner in owners:
+            changes = self._poll_events(kind, owner, owner_names, cursors)
+            if changes is None:
+                complete = False
+            else:
+                pushed.update(changes)
+        if not complete or any(key not in snapshots for key in pushed):
+            self._event_refresh = 'listing'
+            return None
+        
+        for key, (full_name, pushed_at) in pushed.items():
+            languages = self._fetch_repo_languages(f"{self.API_BASE_URL}/repos/{full_name}/languages")
+            if languages is None:
+                self._event_refresh = 'listing'
+                return None
+            snapshots.patch(key, languages, pushed_at)
+        self._patched_repos += len(pushed)
+        self._event_refresh = 'patched' if pushed else 'not_modified'
+        return snapshots.totals()
+    
+    def _poll_events(self, kind: str, owner: str, owner_names: Set[str],
+                     cursors: EventCursorStore) -> Optional[Dict[str, Tuple[str, str]]]:
+        """
+        Read one owner's events feed back to its stored cursor.
+        
+        Returns:
+            Pushed repos since the cursor (empty on ``304``), or None if the
+            feed does not reach back to the cursor
+            
+        Raises:
+            GitHubAPIError: If a feed request fails
+        """
+        state = cursors.get(owner)
+        url: Optional[str] = f"{self.API_BASE_URL}/{kind}/{owner}/events"
+        params: Optional[Dict] = {'per_page': self.EVENTS_PER_PAGE}
+        headers = {'If-None-Match': state['etag']} if state['etag'] else {}
+        pushed: Dict[str, Tuple[str, str]] = {}
+        etag: Optional[str] = None
+        newest: Optional[str] = None
+        reached = False
+        try:
+            while url and not reached:
+                response = self._send('core', self._transport.get, url, params=params, headers=headers)
+                if response.status_code == 304:
+                    return {}
+                response.raise_for_status()
+                if etag is None:
+                    etag = response.headers.get('ETag')
+                changes, page_newest, reached = scan_push_events(response.json(), state['cursor'], owner_names)
+                for key, change in changes.items():
+                    pushed.setdefault(key, change)
+                newest = newest or page_newest
+                url = response.links.get('next', {}).get('url')
+                params, headers = None, {}
+        except (TransportError, ValueError) as e:
+            raise GitHubAPIError(f"Failed to poll events for {owner}: {e}") from e
+        
+        cursors.update(owner, etag, newest or state['cursor'])
+        return pushed if reached else None
+    
+    def _fetch_language_bytes_graphql(self, username: str) -> Dict[str, int]:
+        """
+        Aggregate language bytes with the GraphQL API.
+        
+        Each page returns up to 100 non-fork repositories together with their
+        language sizes, so a user costs one request per 100 repos instead of
+        one per repo.
+        
+        Args:
+            username: GitHub username
+            
+        Returns:
+            Dictionary mapping language names to total bytes
             
+        Raises:
+            GitHubAPIError: If a request fails or the API reports errors
+        """
+        if not self.tokens:
+            raise GitHubAPIError("The GraphQL backend requires a token")
+        
+        language_maps: List[Dict[str, int]] = []
+        cursor: Optional[str] = None
+        while True:
+            payload = build_repository_languages_payload(
+                username, cursor, self.GRAPHQL_LANGUAGES_PER_REPO
+            )
             try:
-                response = self._session.get(languages_url)
+                response = self._send('graphql', self._transport.post, self.graphql_url, json=payload)
                 response.raise_for_status()
-                languages = response.json()
-                
-                for lang, bytes_count in languages.items():
-                    language_totals[lang] = language_totals.get(lang, 0) + bytes_count
-            except requests.RequestException:
-                continue  # Skip repos with errors
+                page, cursor = parse_repository_languages_page(response.json())
+            except (TransportError, GraphQLResponseError) as e:
+                raise GitHubAPIError(f"GraphQL query for {username} failed: {e}")
+            language_maps.extend(page)
+            if cursor is None:
+                return merge_language_bytes(language_maps)
+    
+    def _approximate_language_bytes(self, owners: Sequence[Tuple[str, str]]) -> Dict[str, int]:
+        """
+        Estimate language bytes from the repo listing alone.
+        
+        Each non-fork repo that passes the prefilter contributes its ``size``
+        to its primary ``language``. When exact snapshots from earlier runs
+        exist for unchanged repos, the estimate over those repos is compared
+        with their exact byte maps to report an error estimate.
+        
+        Args:
+            owners: ``(kind, name)`` pairs whose repositories are counted
+            
+        Returns:
+            Dictionary mapping language names to estimated bytes
+            
+        Raises:
+            GitHubAPIError: If a listing request fails
+        """
+        repos = [
+            repo for repo in self._iter_owners_repos(owners)
+            if not repo.get('fork') and self.prefilter.reason(repo) is None
+        ]
         
-        return language_totals
+        snapshots = self._open_snapshots('+'.join(owner for _, owner in owners))
+        if snapshots is not None:
+            sampled, exact = [], []
+            for repo in repos:
+                languages = snapshots.lookup(repo)
+                if languages is not None:
+                    sampled.append(repo)
+                    exact.append(languages)
+            if sampled:
+                self._approximation_error = distribution_error(
+                    approximate_language_bytes(sampled), merge_language_bytes(exact)
+                )
+                self._approximation_sample = len(sampled)
+        
+        return approximate_language_bytes(repos)
     
     def _calculate_percentages(self, language_bytes: Dict[str, int]) -> List[LanguageStat]:
         """
@@ -136,21 +1023,115 @@ class GitHubClient:
         Raises:
             ValueError: If no languages found
         """
-        if not language_bytes:
-            raise ValueError("No language data found")
-        
-        total_bytes = sum(language_bytes.values())
-        stats = []
+        return calculate_percentages(language_bytes)
+    
+    def run_metrics(self) -> Dict[str, Any]:
+        """
+        Report counters gathered while fetching.
         
-        for lang, bytes_count in language_bytes.items():
-            percentage = (bytes_count / total_bytes) * 100
-            stats.append(LanguageStat(name=lang, percentage=percentage, bytes=bytes_count))
+        Returns:
+            Dictionary with skipped repos, per-repo requests saved by the
+            prefilter and snapshots, retry and circuit breaker counters,
+            the remaining API budget and, when enabled, cache hits and misses,
+            reused and refreshed repo snapshots and hedged requests, and in
+            approximate mode the estimated error against exact snapshots; with
+            a request cap, the number of extrapolated repos
+        """
+        metrics: Dict[str, Any] = {
+            'skipped_repos': self._skipped_repos,
+            'prefiltered_repos': dict(self._prefiltered),
+            'requests_saved': sum(self._prefiltered.values()) + self._snapshots_reused,
+            'retries': self._retries,
+            'circuit_breaker_trips': self._breaker.trips,
+            'circuit_breaker_rejections': self._breaker.rejected,
+        }
+        quota = self._scheduler.quota('graphql' if self.backend == 'graphql' else 'core')
+        if quota is not None:
+            metrics['rate_limit_remaining'] = quota.remaining
+            metrics['rate_limit_limit'] = quota.limit
+            metrics['rate_limit_reset'] = int(quota.reset)
+        if self._cache is not None:
+            metrics['cache_hits'] = self._cache.hits
+            metrics['cache_misses'] = self._cache.misses
+            metrics['snapshots_reused'] = self._snapshots_reused
+            metrics['snapshots_refreshed'] = self._snapshots_refreshed
+        if self._duplicate_repos:
+            metrics['duplicate_repos'] = self._duplicate_repos
+        if self._event_refresh is not None:
+            metrics['event_refresh'] = self._event_refresh
+            metrics['patched_repos'] = self._patched_repos
+        if self._webhook_update is not None:
+            metrics['webhook_update'] = self._webhook_update
+        if self.max_requests is not None:
+            metrics['extrapolated_repos'] = self._extrapolated_repos
+        if self._approximation_error is not None:
+            metrics['approximation_error'] = round(self._approximation_error, 2)
+            metrics['approximation_sample'] = self._approximation_sample
+        if self._hedger is not None:
+            metrics['hedged_requests'] = self._hedger.hedged
+            metrics['hedge_wins'] = self._hedger.hedge_wins
+        return metrics
+    
+    def describe_metrics(self, metrics: Dict[str, Any]) -> List[str]:
+        """
+        Summarize ``run_metrics`` output for the run log.
         
-        return stats
+        Args:
+            metrics: Counters returned by ``run_metrics``
+            
+        Returns:
+            Log lines, empty when there is nothing worth reporting
+        """
+        lines = []
+        remaining = metrics.get('rate_limit_remaining')
+        if remaining is not None:
+            lines.append(f"API budget remaining: {remaining}/{metrics.get('rate_limit_limit', '?')}")
+        if metrics.get('requests_saved'):
+            saved_by = [f"{rule}={count}" for rule, count in (metrics.get('prefiltered_repos') or {}).items()]
+            if metrics.get('snapshots_reused'):
+                saved_by.append(f"snapshots={metrics['snapshots_reused']}")
+            lines.append(f"Saved {metrics['requests_saved']} per-repo requests ({', '.join(saved_by)}).")
+        error = metrics.get('approximation_error')
+        if error is not None:
+            lines.append(
+                f"Approximate stats are within ~{error:.1f} percentage points of exact stats "
+                f"for {metrics.get('approximation_sample', 0)} repositories with snapshots."
+            )
+        event_refresh = metrics.get('event_refresh')
+        if event_refresh == 'not_modified':
+            lines.append("Events feed unchanged; reused the stored totals.")
+        elif event_refresh == 'patched':
+            lines.append(f"Patched {metrics.get('patched_repos', 0)} pushed repositories from the events feed.")
+        elif event_refresh == 'listing':
+            lines.append("Events feed did not cover every change; read the full repository listing.")
+        webhook_update = metrics.get('webhook_update')
+        if webhook_update in ('refreshed', 'removed'):
+            lines.append(f"Webhook delivery {webhook_update} one repository; other snapshots were reused.")
+        elif webhook_update == 'ignored':
+            lines.append("Webhook delivery does not affect language stats; reused the stored snapshots.")
+        if metrics.get('extrapolated_repos'):
+            lines.append(
+                f"Request budget reached: {metrics['extrapolated_repos']} smaller repositories "
+                "were extrapolated from their primary language."
+            )
+        if metrics.get('skipped_repos'):
+            lines.append(f"Warning: {metrics['skipped_repos']} repositories could not be fetched and were skipped.")
+        if metrics.get('retries') or metrics.get('circuit_breaker_trips'):
+            lines.append(
+                f"Retried {metrics.get('retries', 0)} requests; "
+                f"circuit breaker tripped {metrics.get('circuit_breaker_trips', 0)} times."
+            )
+        return lines
     
     def close(self):
-        """Close the session"""
-        self._session.close()
+        """Close the transport and worker pool and persist the last-known quota"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._hedger is not None:
+            self._hedger.shutdown()
+        self._transport.close()
+        self._scheduler.save()
     
     def __enter__(self):
         """Context manager entry"""
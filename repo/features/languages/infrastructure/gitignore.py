@@ -0,0 +1,121 @@
+"""
+Minimal ``.gitignore`` matcher for the local repository scanner
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Pattern, Tuple
+
+
+class _Rule(NamedTuple):
+    base: str
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression"""
+    out: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '*':
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif char == '?':
+            out.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif char == '\\' and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return ''.join(out)
+
+
+class GitIgnore:
+    """
+    Ignore rules accumulated from the ``.gitignore`` files of a directory
+    and its parents.
+
+    Supports comments, ``!`` negation, trailing ``/`` for directories,
+    patterns anchored by a ``/`` and ``*``, ``?``, ``[...]`` and ``**``
+    globs. The last matching rule wins, as in git.
+    """
+
+    def __init__(self, rules: Tuple[_Rule, ...] = ()):
+        self._rules = rules
+
+    def child(self, base: str, text: str) -> 'GitIgnore':
+        """
+        Extend the rules with a ``.gitignore`` found in ``base``.
+
+        Args:
+            base: Directory of the file, relative to the scan root ('' for
+                the root itself)
+            text: Contents of the file
+
+        Returns:
+            New matcher; ``self`` is left unchanged
+        """
+        rules = list(self._rules)
+        for line in text.splitlines():
+            rule = self._parse(base, line)
+            if rule is not None:
+                rules.append(rule)
+        return GitIgnore(tuple(rules))
+
+    @staticmethod
+    def _parse(base: str, line: str) -> Optional[_Rule]:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            return None
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+        anchored = '/' in line
+        line = line.lstrip('/')
+        return _Rule(base, re.compile(_translate(line) + r'\Z'), negate, dir_only, anchored)
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        """
+        Whether ``path`` (relative to the scan root, ``/``-separated) is ignored.
+        """
+        result = False
+        name = path.rsplit('/', 1)[-1]
+        for rule in self._rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.base:
+                if not path.startswith(rule.base + '/'):
+                    continue
+                relative = path[len(rule.base) + 1:]
+            else:
+                relative = path
+            if rule.regex.match(relative if rule.anchored else name):
+                result = not rule.negate
+        return result
@@ -0,0 +1,86 @@
+"""
+GraphQL query and response parsing for the batched language stats backend
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+REPOSITORY_LANGUAGES_QUERY = """
+query($login: String!, $cursor: String, $languages: Int!) {
+  user(login: $login) {
+    repositories(
+      first: 100
+      after: $cursor
+      ownerAffiliations: OWNER
+      isFork: false
+      privacy: PUBLIC
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        languages(first: $languages, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLResponseError(ValueError):
+    """Raised when a GraphQL response carries errors or an unexpected shape"""
+    pass
+
+
+def build_repository_languages_payload(login: str, cursor: Optional[str],
+                                       languages_per_repo: int) -> Dict[str, Any]:
+    """
+    Build the POST body for one page of the repository languages query.
+
+    Args:
+        login: GitHub username
+        cursor: ``endCursor`` of the previous page (None for the first page)
+        languages_per_repo: Maximum languages returned per repository
+
+    Returns:
+        JSON-serializable request body
+    """
+    return {
+        'query': REPOSITORY_LANGUAGES_QUERY,
+        'variables': {'login': login, 'cursor': cursor, 'languages': languages_per_repo},
+    }
+
+
+def parse_repository_languages_page(
+    payload: Dict[str, Any],
+) -> Tuple[List[Dict[str, int]], Optional[str]]:
+    """
+    Extract per-repo language byte maps from one page of results.
+
+    Args:
+        payload: Decoded GraphQL response
+
+    Returns:
+        Tuple of per-repo language byte maps and the next cursor
+        (None when this was the last page)
+
+    Raises:
+        GraphQLResponseError: If the response reports errors or the user is missing
+    """
+    errors = payload.get('errors')
+    if errors:
+        messages = "; ".join(str(error.get('message', error)) for error in errors)
+        raise GraphQLResponseError(messages)
+
+    user = (payload.get('data') or {}).get('user')
+    if not user:
+        raise GraphQLResponseError("User not found")
+
+    repositories = user['repositories']
+    language_maps = []
+    for node in repositories.get('nodes') or []:
+        edges = (node or {}).get('languages', {}).get('edges') or []
+        language_maps.append({edge['node']['name']: edge['size'] for edge in edges})
+
+    page_info = repositories.get('pageInfo') or {}
+    cursor = page_info.get('endCursor') if page_info.get('hasNextPage') else None
+    return language_maps, cursor
@@ -0,0 +1,121 @@
+"""
+Hedged requests: bound tail latency by racing a duplicate of slow calls
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class LatencyTracker:
+    """Rolling window of call latencies with percentile lookup"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of most recent samples kept
+            min_samples: Samples required before percentiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add one latency sample"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the window.
+
+        Returns:
+            The latency, or None until ``min_samples`` samples were recorded
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = max(1, math.ceil(quantile * len(ordered)))
+        return ordered[rank - 1]
+
+
+class Hedger:
+    """
+    Run calls so that slow ones get a backup.
+
+    When a call is still pending after the observed ``quantile`` latency, an
+    identical call is started and whichever succeeds first wins. The loser is
+    left to finish in the background. Hedging starts once the tracker has
+    enough samples to estimate the percentile.
+    """
+
+    def __init__(self, max_workers: int, quantile: float = 0.95,
+                 tracker: Optional[LatencyTracker] = None):
+        """
+        Initialize the hedger.
+
+        Args:
+            max_workers: Callers that may hedge at once (the pool holds two
+                threads per caller)
+            quantile: Latency percentile after which a backup is started
+            tracker: Latency tracker (a fresh one by default)
+        """
+        self.quantile = quantile
+        self.tracker = tracker or LatencyTracker()
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=2 * max_workers, thread_name_prefix='github-hedge'
+        )
+        self._lock = threading.Lock()
+
+    def _timed(self, fn: Callable[[], T]) -> T:
+        started = time.monotonic()
+        result = fn()
+        self.tracker.record(time.monotonic() - started)
+        return result
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn``, racing a duplicate if it exceeds the latency threshold.
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The primary call's error if both attempts fail
+        """
+        threshold = self.tracker.percentile(self.quantile)
+        primary = self._executor.submit(self._timed, fn)
+        if threshold is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        with self._lock:
+            self.hedged += 1
+        backup = self._executor.submit(self._timed, fn)
+        pending = {primary, backup}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        return primary.result()
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for abandoned duplicates"""
+        self._executor.shutdown(wait=False)
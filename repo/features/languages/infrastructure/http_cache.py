@@ -0,0 +1,106 @@
+"""
+On-disk store for conditional (ETag / Last-Modified) GitHub API requests
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class CachedResponse:
+    """
+    A stored API response together with its cache validators.
+
+    Attributes:
+        body: Decoded JSON body
+        etag: ``ETag`` header of the original response
+        last_modified: ``Last-Modified`` header of the original response
+        next_url: ``rel="next"`` pagination link of the original response
+    """
+    body: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    next_url: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn a GET into a conditional request"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ConditionalRequestCache:
+    """
+    Persist response bodies and validators so later runs can send conditional
+    requests and serve ``304 Not Modified`` answers from disk.
+
+    GitHub does not count 304 responses against the rate limit, so unchanged
+    listings and language maps become nearly free on scheduled runs. Entries
+    are written atomically, one file per request, so the cache is safe to use
+    from the client's worker threads.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Folder that holds the cached entries (created if missing)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Stable file name for a request"""
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+    def _path(self, url: str, params: Optional[Dict[str, Any]] = None) -> Path:
+        return self.directory / f"{self._key(url, params)}.json"
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[CachedResponse]:
+        """
+        Look up the stored response for a request.
+
+        Returns:
+            CachedResponse, or None if nothing usable is stored
+        """
+        try:
+            data = json.loads(self._path(url, params).read_text(encoding='utf-8'))
+            return CachedResponse(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, url: str, params: Optional[Dict[str, Any]], entry: CachedResponse) -> None:
+        """Store ``entry`` for a request, replacing any previous one"""
+        path = self._path(url, params)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(asdict(entry), handle)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def record(self, hit: bool) -> None:
+        """Count a revalidated (hit) or refetched (miss) request"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
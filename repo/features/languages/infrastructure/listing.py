@@ -0,0 +1,103 @@
+"""
+Streaming, field-projecting parser for GitHub repository listings
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Union
+
+
+class RepoRecord(NamedTuple):
+    """
+    The fields of a listed repository that language stats depend on.
+
+    A full listing entry carries about 90 fields plus ``owner`` and
+    ``license`` objects; keeping only these makes org-scale listings a
+    fraction of the size in memory and in the request cache. ``get`` mirrors
+    ``dict.get`` so code reading listing entries accepts records and raw
+    dictionaries alike.
+    """
+    id: Optional[int] = None
+    name: Optional[str] = None
+    full_name: Optional[str] = None
+    fork: bool = False
+    languages_url: Optional[str] = None
+    language: Optional[str] = None
+    size: Optional[int] = None
+    pushed_at: Optional[str] = None
+    archived: bool = False
+    is_template: bool = False
+    mirror_url: Optional[str] = None
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'RepoRecord':
+        """Project a decoded listing entry onto the record's fields"""
+        return cls(**{name: data[name] for name in cls._fields if data.get(name) is not None})
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Field value by name, like ``dict.get``"""
+        return getattr(self, name) if name in self._fields else default
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]]) -> Iterator[Any]:
+    """
+    Decode the elements of a top-level JSON array as its bytes arrive.
+
+    Only the element being decoded is held in memory, never the whole array.
+
+    Args:
+        chunks: Raw response body in chunks (UTF-8 bytes or text)
+
+    Yields:
+        Each decoded array element in order
+
+    Raises:
+        ValueError: If the body is not a JSON array
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    started = False
+    exhausted = False
+    chunk_iter = iter(chunks)
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n':
+            position += 1
+        if position < len(buffer):
+            char = buffer[position]
+            if not started:
+                if char != '[':
+                    raise ValueError("Expected a JSON array")
+                started = True
+                position += 1
+                continue
+            if char == ']':
+                return
+            if char == ',':
+                position += 1
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                # A number may continue in the next chunk ("3" of "3.5"); only
+                # accept it once a delimiter or the end of the body follows.
+                complete = end < len(buffer) and buffer[end] in ' \t\r\n,]'
+                if complete or exhausted or not isinstance(item, (int, float)):
+                    yield item
+                    buffer, position = buffer[end:], 0
+                    continue
+        if exhausted:
+            raise ValueError("Unterminated JSON array")
+        chunk = next(chunk_iter, None)
+        if chunk is None:
+            exhausted = True
+            buffer += text_decoder.decode(b'', final=True)
+        elif isinstance(chunk, bytes):
+            buffer += text_decoder.decode(chunk)
+        else:
+            buffer += chunk
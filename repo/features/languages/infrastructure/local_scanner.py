@@ -0,0 +1,353 @@
+"""
+Offline language statistics from repositories checked out on disk
+"""
+
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..domain import StatsCollection
+from .aggregation import calculate_percentages
+from .gitignore import GitIgnore
+
+# Extension and file name tables follow GitHub Linguist for the languages it
+# counts (programming and markup); data and prose formats such as JSON, YAML
+# and Markdown never appear in GitHub's stats and are left out.
+EXTENSION_LANGUAGES: Dict[str, str] = {
+    '.asm': 'Assembly', '.s': 'Assembly',
+    '.c': 'C', '.h': 'C',
+    '.cc': 'C++', '.cpp': 'C++', '.cxx': 'C++', '.hh': 'C++', '.hpp': 'C++', '.hxx': 'C++',
+    '.cs': 'C#',
+    '.clj': 'Clojure', '.cljs': 'Clojure',
+    '.cmake': 'CMake',
+    '.css': 'CSS',
+    '.cu': 'Cuda',
+    '.dart': 'Dart',
+    '.dockerfile': 'Dockerfile',
+    '.ex': 'Elixir', '.exs': 'Elixir',
+    '.elm': 'Elm',
+    '.erl': 'Erlang',
+    '.fs': 'F#', '.fsx': 'F#',
+    '.go': 'Go',
+    '.groovy': 'Groovy',
+    '.hs': 'Haskell',
+    '.tf': 'HCL', '.hcl': 'HCL',
+    '.html': 'HTML', '.htm': 'HTML',
+    '.java': 'Java',
+    '.js': 'JavaScript', '.cjs': 'JavaScript', '.mjs': 'JavaScript', '.jsx': 'JavaScript',
+    '.jl': 'Julia',
+    '.ipynb': 'Jupyter Notebook',
+    '.kt': 'Kotlin', '.kts': 'Kotlin',
+    '.less': 'Less',
+    '.lua': 'Lua',
+    '.m': 'Objective-C', '.mm': 'Objective-C++',
+    '.ml': 'OCaml', '.mli': 'OCaml',
+    '.nim': 'Nim',
+    '.nix': 'Nix',
+    '.pl': 'Perl', '.pm': 'Perl',
+    '.php': 'PHP',
+    '.ps1': 'PowerShell', '.psm1': 'PowerShell',
+    '.py': 'Python', '.pyi': 'Python', '.pyx': 'Cython',
+    '.r': 'R',
+    '.rb': 'Ruby',
+    '.rs': 'Rust',
+    '.scala': 'Scala',
+    '.scss': 'SCSS', '.sass': 'Sass',
+    '.sh': 'Shell', '.bash': 'Shell', '.zsh': 'Shell',
+    '.sol': 'Solidity',
+    '.svelte': 'Svelte',
+    '.swift': 'Swift',
+    '.tex': 'TeX',
+    '.ts': 'TypeScript', '.mts': 'TypeScript', '.cts': 'TypeScript',
+    '.tsx': 'TSX',
+    '.vb': 'Visual Basic .NET',
+    '.vue': 'Vue',
+    '.zig': 'Zig',
+}
+
+FILENAME_LANGUAGES: Dict[str, str] = {
+    'CMakeLists.txt': 'CMake',
+    'Dockerfile': 'Dockerfile',
+    'GNUmakefile': 'Makefile',
+    'Makefile': 'Makefile',
+    'makefile': 'Makefile',
+    'Rakefile': 'Ruby',
+    'Gemfile': 'Ruby',
+}
+
+INTERPRETER_LANGUAGES: Dict[str, str] = {
+    'bash': 'Shell', 'sh': 'Shell', 'zsh': 'Shell', 'dash': 'Shell',
+    'node': 'JavaScript', 'deno': 'TypeScript',
+    'perl': 'Perl', 'php': 'PHP', 'python': 'Python', 'ruby': 'Ruby',
+}
+
+# Directories Linguist treats as vendored or build output, never descended into.
+SKIPPED_DIRS = frozenset({
+    '.git', '.hg', '.svn', '.tox', '.venv', 'venv', '__pycache__', 'bower_components',
+    'node_modules', 'site-packages', 'third_party', 'vendor', 'dist',
+})
+
+GENERATED_SUFFIXES = (
+    '.min.js', '.min.css', '-min.js', '.pb.go', '.pb.cc', '.pb.h', '_pb2.py', '_pb2_grpc.py',
+    '.designer.cs', '.g.dart', '.generated.ts',
+)
+GENERATED_MARKERS = (b'Code generated', b'@generated', b'<auto-generated', b'DO NOT EDIT')
+HEADER_BYTES = 1024
+
+
+def looks_generated(header: bytes) -> bool:
+    """Whether a file's first bytes mark it as binary or generated"""
+    return b'\0' in header or any(marker in header for marker in GENERATED_MARKERS)
+
+
+_IndexEntry = Tuple[int, int, Optional[str]]
+
+
+class LocalRepoScanner:
+    """
+    Stats source that classifies the files of local checkouts instead of
+    calling the API.
+
+    Directories are walked in parallel with ``os.scandir``. Each file's
+    language comes from its name or extension (or a shebang for files
+    without one) and counts with its size in bytes, the way GitHub counts.
+    ``.git``, vendored and build directories, generated files and anything
+    matched by ``.gitignore`` are skipped. With ``index_path`` the language of
+    every file is remembered with its mtime and size, so a rescan reads only
+    files that changed.
+    """
+
+    def __init__(self, paths: Sequence[str], max_workers: int = 8,
+                 index_path: Optional[str] = None):
+        """
+        Initialize the scanner.
+
+        Args:
+            paths: Checkout directories whose files are counted together
+            max_workers: Number of directories scanned concurrently
+            index_path: JSON file remembering classified files between runs
+
+        Raises:
+            ValueError: If no path is given, a path is not a directory or
+                ``max_workers`` is below 1
+        """
+        if not paths:
+            raise ValueError("At least one path must be provided")
+        missing = [path for path in paths if not os.path.isdir(path)]
+        if missing:
+            raise ValueError(f"Not a directory: {', '.join(missing)}")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.roots = [os.path.abspath(path) for path in dict.fromkeys(paths)]
+        self.max_workers = max_workers
+        self.index_path = Path(index_path) if index_path else None
+        self._index: Dict[str, Dict[str, _IndexEntry]] = self._load_index()
+        self._files_scanned = 0
+        self._files_read = 0
+        self._counter_lock = threading.Lock()
+
+    def fetch_language_stats(self, username: Optional[str] = None) -> StatsCollection:
+        """
+        Scan the checkouts and compute language statistics.
+
+        Args:
+            username: Accepted for interface parity with ``GitHubClient``;
+                the checkouts define what is counted
+
+        Returns:
+            StatsCollection with language statistics
+        """
+        language_bytes: Dict[str, int] = {}
+        index: Dict[str, Dict[str, _IndexEntry]] = {}
+        for root in self.roots:
+            previous = self._index.get(root, {})
+            current = index.setdefault(root, {})
+            for rel_path, mtime_ns, size, language in self._scan(root, previous):
+                current[rel_path] = (mtime_ns, size, language)
+                if language is not None:
+                    language_bytes[language] = language_bytes.get(language, 0) + size
+        self._index = index
+        self._save_index()
+        return StatsCollection(calculate_percentages(language_bytes))
+
+    def _scan(self, root: str,
+              previous: Dict[str, _IndexEntry]) -> List[Tuple[str, int, int, Optional[str]]]:
+        """Walk ``root`` with a pool, one task per directory"""
+        results: List[Tuple[str, int, int, Optional[str]]] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='local-scan') as executor:
+            pending: Set[Future] = {executor.submit(self._scan_directory, root, '', GitIgnore(), previous)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    results.extend(files)
+                    pending.update(
+                        executor.submit(self._scan_directory, root, rel_dir, ignore, previous)
+                        for rel_dir, ignore in subdirs
+                    )
+        return results
+
+    def _scan_directory(self, root: str, rel_dir: str, ignore: GitIgnore,
+                        previous: Dict[str, _IndexEntry]) -> Tuple[list, list]:
+        """
+        Classify one directory's files and list the subdirectories to visit.
+
+        Returns:
+            Tuple of ``(rel_path, mtime_ns, size, language)`` per counted
+            file and ``(rel_dir, ignore)`` per subdirectory
+        """
+        directory = os.path.join(root, rel_dir)
+        try:
+            with open(os.path.join(directory, '.gitignore'), encoding='utf-8', errors='replace') as handle:
+                ignore = ignore.child(rel_dir, handle.read())
+        except OSError:
+            pass
+
+        files = []
+        subdirs = []
+        scanned = read = 0
+        try:
+            with os.scandir(directory) as iterator:
+                entries = list(iterator)
+        except OSError:
+            return files, subdirs
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRS and not ignore.ignored(rel_path, True):
+                        subdirs.append((rel_path, ignore))
+                    continue
+                if not entry.is_file(follow_symlinks=False) or ignore.ignored(rel_path, False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            scanned += 1
+            cached = previous.get(rel_path)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                language = cached[2]
+            else:
+                language, was_read = _classify(entry.path, entry.name)
+                read += was_read
+            files.append((rel_path, stat.st_mtime_ns, stat.st_size, language))
+        with self._counter_lock:
+            self._files_scanned += scanned
+            self._files_read += read
+        return files, subdirs
+
+    def _load_index(self) -> Dict[str, Dict[str, _IndexEntry]]:
+        if self.index_path is None:
+            return {}
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {
+            root: {path: tuple(entry) for path, entry in files.items() if len(entry) == 3}
+            for root, files in data.items() if isinstance(files, dict)
+        }
+
+    def _save_index(self) -> None:
+        """Atomically persist the file index, if enabled"""
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.index_path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(self._index, handle)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def run_metrics(self) -> Dict[str, Any]:
+        """
+        Report counters gathered while scanning.
+
+        Returns:
+            Dictionary with the files considered and the files whose
+            contents had to be read (the rest came from the index)
+        """
+        return {'files_scanned': self._files_scanned, 'files_read': self._files_read}
+
+    def describe_metrics(self, metrics: Dict[str, Any]) -> List[str]:
+        """Summarize ``run_metrics`` output for the run log"""
+        return [
+            f"Scanned {metrics['files_scanned']} local files; "
+            f"read {metrics.get('files_read', 0)}, the rest were unchanged since the last scan."
+        ]
+
+    def close(self) -> None:
+        """Nothing to release; present for parity with ``GitHubClient``"""
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+
+
+def language_for_path(path: str) -> Optional[str]:
+    """
+    Language of a repository path judged by its name alone.
+
+    Paths inside vendored or build directories and generated file names map
+    to None, like names that no counted language uses.
+
+    Args:
+        path: ``/``-separated path relative to the repository root
+    """
+    *directories, name = path.split('/')
+    if any(directory in SKIPPED_DIRS for directory in directories) or name.endswith(GENERATED_SUFFIXES):
+        return None
+    return FILENAME_LANGUAGES.get(name) or EXTENSION_LANGUAGES.get(os.path.splitext(name)[1].lower())
+
+
+def _classify(path: str, name: str) -> Tuple[Optional[str], bool]:
+    """
+    Language of one file.
+
+    Returns:
+        Tuple of the language (None if not counted) and whether the file's
+        header had to be read
+    """
+    if name.endswith(GENERATED_SUFFIXES):
+        return None, False
+    language = language_for_path(name)
+    if language is None and os.path.splitext(name)[1]:
+        return None, False
+    try:
+        with open(path, 'rb') as handle:
+            header = handle.read(HEADER_BYTES)
+    except OSError:
+        return None, True
+    if language is None:
+        return _shebang_language(header), True
+    if looks_generated(header):
+        return None, True
+    return language, True
+
+
+def _shebang_language(header: bytes) -> Optional[str]:
+    """Language named by a ``#!`` line, e.g. ``#!/usr/bin/env python3``"""
+    if not header.startswith(b'#!'):
+        return None
+    words = header[2:].split(b'\n', 1)[0].decode('utf-8', 'replace').split()
+    if not words:
+        return None
+    interpreter = os.path.basename(words[0])
+    if interpreter == 'env' and len(words) > 1:
+        interpreter = words[1]
+    return INTERPRETER_LANGUAGES.get(interpreter.rstrip('0123456789.'))
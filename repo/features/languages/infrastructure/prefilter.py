@@ -0,0 +1,70 @@
+"""
+Listing-metadata prefilter for repositories that cannot contribute languages
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+PREFILTER_RULES = ('empty', 'archived', 'template', 'mirror')
+
+
+@dataclass(frozen=True)
+class RepoPrefilter:
+    """
+    Decide from the repo listing alone whether a ``languages_url`` request is
+    worth issuing.
+
+    Attributes:
+        skip: Rules to apply: ``empty`` (``size == 0``), ``archived``,
+            ``template`` and ``mirror``
+        stale_after_days: Also skip repos not pushed to for this many days
+    """
+    skip: Tuple[str, ...] = ('empty',)
+    stale_after_days: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        unknown = [rule for rule in self.skip if rule not in PREFILTER_RULES]
+        if unknown:
+            raise ValueError(
+                f"Unknown prefilter rule(s) {', '.join(unknown)}; "
+                f"expected {', '.join(PREFILTER_RULES)}"
+            )
+        if self.stale_after_days is not None and self.stale_after_days < 1:
+            raise ValueError("stale_after_days must be at least 1")
+
+    def reason(self, repo: Dict[str, Any], now: Optional[datetime] = None) -> Optional[str]:
+        """
+        Name the rule that excludes ``repo``.
+
+        Args:
+            repo: Repository data from the listing
+            now: Reference time for the staleness rule (defaults to UTC now)
+
+        Returns:
+            The matching rule (``stale`` for the age cut-off), or None if the
+            repo should be fetched
+        """
+        if 'empty' in self.skip and repo.get('size') == 0:
+            return 'empty'
+        if 'archived' in self.skip and repo.get('archived'):
+            return 'archived'
+        if 'template' in self.skip and repo.get('is_template'):
+            return 'template'
+        if 'mirror' in self.skip and repo.get('mirror_url'):
+            return 'mirror'
+        if self.stale_after_days is not None and repo.get('pushed_at'):
+            pushed_at = _parse_timestamp(repo.get('pushed_at'))
+            cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.stale_after_days)
+            if pushed_at is not None and pushed_at < cutoff:
+                return 'stale'
+        return None
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse GitHub's ISO 8601 timestamps (``2024-01-01T00:00:00Z``)"""
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
@@ -0,0 +1,253 @@
+"""
+Rate-limit-aware request scheduling driven by GitHub's X-RateLimit headers
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .errors import RateLimitExceededError
+
+
+@dataclass
+class Quota:
+    """
+    Last-known quota for one API resource (``core``, ``graphql``, ...).
+
+    Attributes:
+        limit: Requests allowed per window
+        remaining: Requests left in the current window
+        reset: Epoch seconds at which the window resets
+    """
+    limit: int
+    remaining: int
+    reset: float
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> Optional['Quota']:
+        """Parse ``X-RateLimit-*`` headers, returning None if they are absent"""
+        try:
+            return cls(
+                limit=int(headers['X-RateLimit-Limit']),
+                remaining=int(headers['X-RateLimit-Remaining']),
+                reset=float(headers['X-RateLimit-Reset']),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def token_fingerprint(token: Optional[str]) -> str:
+    """Stable, non-reversible key for persisting per-token state"""
+    if not token:
+        return 'anonymous'
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+
+
+class RateLimitScheduler:
+    """
+    Gate concurrent requests on the remaining API quota of a pool of tokens.
+
+    Quotas are tracked per token and resource from response headers. Each
+    request takes a slot, which is routed to the token with the most remaining
+    quota; tokens whose quota is exhausted are retired until their reset. Once
+    the local clock passes a reset, a single probe request is sent with that
+    token and its response headers, not the clock, restore the budget. While
+    the pool's combined budget is healthy up to ``max_concurrency`` requests run
+    at once; below the low-water mark the allowed concurrency shrinks in
+    proportion to the remaining budget. Once every token is exhausted, requests
+    wait for the earliest reset, or fail with :class:`RateLimitExceededError`
+    when that is further away than ``max_wait`` seconds, instead of quietly
+    producing incomplete stats.
+
+    The last-known quotas can be persisted to ``state_path`` so the next run
+    starts from them rather than at full speed.
+    """
+
+    LOW_WATER_RATIO = 0.1
+
+    def __init__(self, max_concurrency: int, tokens: Sequence[Optional[str]] = (None,),
+                 state_path: Optional[str] = None, max_wait: float = 0.0,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Upper bound on simultaneous requests
+            tokens: Token pool to route requests across (None for anonymous)
+            state_path: JSON file holding the last-known quotas between runs
+            max_wait: Longest quota reset, in seconds, worth waiting for
+            clock: Time source (epoch seconds)
+        """
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self.state_path = Path(state_path) if state_path else None
+        self.tokens: List[Optional[str]] = list(dict.fromkeys(tokens)) or [None]
+        self._fingerprints = {token: token_fingerprint(token) for token in self.tokens}
+        self._clock = clock
+        self._quotas: Dict[Tuple[str, str], Quota] = {}
+        self._probing: Set[Tuple[str, str]] = set()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._load()
+
+    def _key(self, token: Optional[str], resource: str) -> Tuple[str, str]:
+        return self._fingerprints[token], resource
+
+    def update(self, headers: Mapping[str, str], token: Optional[str] = None) -> None:
+        """
+        Record the quota reported by a response's headers.
+
+        Args:
+            headers: Response headers
+            token: Token the request was sent with (defaults to the first in the pool)
+        """
+        quota = Quota.from_headers(headers)
+        if quota is None:
+            return
+        if token not in self._fingerprints:
+            token = self.tokens[0]
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        with self._cond:
+            self._quotas[self._key(token, resource)] = quota
+            self._cond.notify_all()
+
+    def quota(self, resource: str = 'core') -> Optional[Quota]:
+        """
+        Last-known combined quota of the pool for ``resource``.
+
+        Returns:
+            Summed limit and remaining budget with the earliest reset, or None
+            until a response reports one
+        """
+        with self._cond:
+            return self._pool_quota(resource)
+
+    def _pool_quota(self, resource: str) -> Optional[Quota]:
+        known = [
+            quota for quota in (self._quotas.get(self._key(token, resource)) for token in self.tokens)
+            if quota is not None
+        ]
+        if not known:
+            return None
+        return Quota(
+            limit=sum(quota.limit for quota in known),
+            remaining=sum(max(quota.remaining, 0) for quota in known),
+            reset=min(quota.reset for quota in known),
+        )
+
+    def allowed_concurrency(self, resource: str = 'core') -> int:
+        """Number of requests currently allowed to run at once"""
+        with self._cond:
+            return self._allowed(self._pool_quota(resource))
+
+    def _allowed(self, quota: Optional[Quota]) -> int:
+        if quota is None or quota.limit <= 0:
+            return self.max_concurrency
+        low_water = max(self.max_concurrency, int(quota.limit * self.LOW_WATER_RATIO))
+        if quota.remaining >= low_water:
+            return self.max_concurrency
+        return max(1, math.ceil(self.max_concurrency * quota.remaining / low_water))
+
+    @contextmanager
+    def slot(self, resource: str = 'core') -> Iterator[Optional[str]]:
+        """
+        Hold a request slot for ``resource``.
+
+        Yields:
+            The token the request should be sent with
+
+        Raises:
+            RateLimitExceededError: If every token is exhausted and none resets
+                within ``max_wait`` seconds
+        """
+        probe_key: Optional[Tuple[str, str]] = None
+        with self._cond:
+            while True:
+                now = self._clock()
+                available: List[Tuple[Optional[str], Optional[Quota]]] = []
+                earliest_reset = math.inf
+                for token in self.tokens:
+                    key = self._key(token, resource)
+                    quota = self._quotas.get(key)
+                    if quota is not None and quota.remaining <= 0:
+                        if quota.reset > now:
+                            earliest_reset = min(earliest_reset, quota.reset)
+                            continue  # Retired until its reset
+                        if key in self._probing:
+                            continue  # Waiting for the probe's headers
+                        # The window should have rolled over; let one request
+                        # confirm it rather than trusting the local clock.
+                        available.append((token, None))
+                        continue
+                    available.append((token, quota))
+                if not available and earliest_reset == math.inf:
+                    self._cond.wait()
+                    continue
+                if not available:
+                    wait = earliest_reset - now
+                    if wait > self.max_wait:
+                        raise RateLimitExceededError(
+                            f"GitHub API {resource} quota exhausted for all {len(self.tokens)} "
+                            f"token(s); resets in {math.ceil(wait)}s"
+                        )
+                    self._cond.wait(timeout=wait)
+                    continue
+                if self._in_flight < self._allowed(self._pool_quota(resource)):
+                    # Prefer tokens with unknown quotas so every budget gets discovered.
+                    token, quota = max(
+                        available, key=lambda item: math.inf if item[1] is None else item[1].remaining
+                    )
+                    break
+                self._cond.wait()
+            self._in_flight += 1
+            key = self._key(token, resource)
+            if quota is not None:
+                quota.remaining -= 1  # Reserve; the response headers will correct it
+            elif key in self._quotas:
+                probe_key = key
+                self._probing.add(key)
+        try:
+            yield token
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                if probe_key is not None:
+                    self._probing.discard(probe_key)
+                self._cond.notify_all()
+
+    def _load(self) -> None:
+        """Restore quotas persisted by a previous run whose window is still open"""
+        if self.state_path is None:
+            return
+        try:
+            state = json.loads(self.state_path.read_text(encoding='utf-8'))
+            now = self._clock()
+            for fingerprint in self._fingerprints.values():
+                for resource, data in state.get(fingerprint, {}).items():
+                    quota = Quota(**data)
+                    if quota.reset > now:
+                        self._quotas[(fingerprint, resource)] = quota
+        except (OSError, ValueError, TypeError, AttributeError):
+            return
+
+    def save(self) -> None:
+        """Persist the last-known quotas to ``state_path``"""
+        if self.state_path is None:
+            return
+        try:
+            state = json.loads(self.state_path.read_text(encoding='utf-8'))
+            if not isinstance(state, dict):
+                state = {}
+        except (OSError, ValueError):
+            state = {}
+        with self._cond:
+            for (fingerprint, resource), quota in self._quotas.items():
+                state.setdefault(fingerprint, {})[resource] = asdict(quota)
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
@@ -0,0 +1,143 @@
+"""
+Retry policy and circuit breaker for GitHub API requests
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Mapping, Optional
+
+from .errors import CircuitOpenError
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Jittered exponential backoff for transient failures.
+
+    Attributes:
+        max_attempts: Total attempts per request, including the first
+        base_delay: Backoff ceiling for the first retry, in seconds
+        max_delay: Upper bound on any computed backoff, in seconds
+        max_retry_after: Longest ``Retry-After`` worth honoring; responses
+            asking for more are returned to the caller as failures
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    max_retry_after: float = 60.0
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+    def should_retry(self, status_code: int, headers: Mapping[str, str]) -> bool:
+        """Whether a response is a transient failure (5xx, 429 or a secondary rate limit)"""
+        if status_code in self.RETRY_STATUSES:
+            return True
+        # Secondary rate limits answer 403 with a Retry-After header.
+        return status_code == 403 and 'Retry-After' in headers
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None,
+              rand: Callable[[], float] = random.random) -> Optional[float]:
+        """
+        Seconds to wait before retry number ``attempt`` (1-based).
+
+        Returns:
+            The delay, or None if ``Retry-After`` asks for longer than
+            ``max_retry_after``
+        """
+        if retry_after is not None:
+            try:
+                requested = float(retry_after)
+            except ValueError:
+                requested = None
+            if requested is not None:
+                return requested if requested <= self.max_retry_after else None
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling * rand()  # Full jitter
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the API looks down.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are rejected with :class:`CircuitOpenError` without being sent.
+    Once ``reset_timeout`` seconds have passed a single trial request is let
+    through; its success closes the circuit, its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 10, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request
+            clock: Monotonic time source
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.trips = 0
+        self.rejected = 0
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently being rejected"""
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_request(self) -> None:
+        """
+        Admit or reject a request.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            elapsed = self._clock() - self._opened_at
+            if elapsed >= self.reset_timeout and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"GitHub API circuit open after {self._failures} consecutive failures; "
+                f"retrying in {max(0.0, self.reset_timeout - elapsed):.0f}s"
+            )
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful response"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Let another trial through when one ended without a verdict on the API's health"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold"""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or (
+                self._opened_at is None and self._failures >= self.failure_threshold
+            ):
+                self.trips += 1
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
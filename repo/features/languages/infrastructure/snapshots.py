@@ -0,0 +1,146 @@
+"""
+Persisted per-repo language snapshots for incremental refreshes
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from .aggregation import merge_language_bytes
+
+
+def repo_key(repo: Dict[str, Any]) -> str:
+    """Stable identifier for a repository in the listing payload"""
+    return str(repo.get('id') or repo.get('full_name') or repo.get('languages_url'))
+
+
+class RepoSnapshotStore:
+    """
+    Language byte maps of one account's repositories, keyed by repo.
+
+    Each snapshot remembers the ``pushed_at`` and ``size`` the repo had when
+    its languages were fetched. While both still match the listing, the
+    snapshot is reused instead of calling ``languages_url`` again, so a
+    steady-state run costs the listing plus one request per changed repo.
+    Repos that no longer appear in the listing are dropped on :meth:`save`.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file holding the snapshots (created on save)
+        """
+        self.path = Path(path)
+        self.reused = 0
+        self.refreshed = 0
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _signature(repo: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if repo.get('pushed_at') is None or repo.get('size') is None:
+            return None
+        return {'pushed_at': repo.get('pushed_at'), 'size': repo.get('size')}
+
+    def lookup(self, repo: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        """
+        Return the stored languages of ``repo`` if it is unchanged.
+
+        Returns:
+            Language byte map, or None if the repo has to be fetched
+        """
+        key = repo_key(repo)
+        signature = self._signature(repo)
+        with self._lock:
+            self._seen.add(key)
+            snapshot = self._snapshots.get(key)
+            if signature is None or snapshot is None or snapshot['signature'] != signature:
+                return None
+            self.reused += 1
+            return dict(snapshot['languages'])
+
+    def record(self, repo: Dict[str, Any], languages: Dict[str, int]) -> None:
+        """Store freshly fetched languages for ``repo``"""
+        signature = self._signature(repo)
+        if signature is None:
+            return
+        key = repo_key(repo)
+        with self._lock:
+            self._seen.add(key)
+            self._snapshots[key] = {'signature': signature, 'languages': dict(languages)}
+            self.refreshed += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._snapshots)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._snapshots
+
+    def patch(self, key: str, languages: Dict[str, int], pushed_at: str) -> None:
+        """
+        Replace the languages of the repo stored under ``key``.
+
+        Used when a push is learned from the events feed rather than the
+        listing. The repo's ``size`` is unknown then, so the snapshot no
+        longer matches the listing and the next listing run refetches it.
+        """
+        with self._lock:
+            self._snapshots[key] = {
+                'signature': {'pushed_at': pushed_at, 'size': None},
+                'languages': dict(languages),
+            }
+            self.refreshed += 1
+
+    def remove(self, key: str) -> bool:
+        """Drop the snapshot stored under ``key``; returns whether there was one"""
+        with self._lock:
+            return self._snapshots.pop(key, None) is not None
+
+    def totals(self) -> Dict[str, int]:
+        """Language bytes summed over every stored repo"""
+        with self._lock:
+            return merge_language_bytes(snapshot['languages'] for snapshot in self._snapshots.values())
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self._snapshots = {
+                key: value for key, value in data.items()
+                if isinstance(value, dict) and 'signature' in value and 'languages' in value
+            }
+
+    def save(self, prune: bool = True) -> None:
+        """
+        Atomically persist the snapshots.
+
+        Args:
+            prune: Keep only the repos seen this run; False keeps every
+                snapshot, for runs that did not read the full listing
+        """
+        with self._lock:
+            if prune:
+                data = {key: self._snapshots[key] for key in self._seen if key in self._snapshots}
+            else:
+                data = dict(self._snapshots)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
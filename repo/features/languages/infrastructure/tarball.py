@@ -0,0 +1,283 @@
+"""
+Line counts per language from streamed repository tarballs
+"""
+
+import io
+import json
+import os
+import tarfile
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence
+
+from ..domain import StatsCollection
+from .aggregation import calculate_percentages, merge_language_bytes
+from .local_scanner import HEADER_BYTES, language_for_path, looks_generated
+from .snapshots import repo_key
+from .transport import TransportError
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, b'')
+            if not self._pending:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def count_tarball_lines(fileobj: IO[bytes]) -> Dict[str, int]:
+    """
+    Count lines per language in a tarball read as a stream.
+
+    The archive is read front to back in ``r|*`` mode, one member at a time
+    and each member in fixed-size chunks, so memory stays bounded whatever
+    the archive size and nothing is written to disk. Member paths lose their
+    first component, the ``owner-repo-sha/`` directory of GitHub tarballs
+    (``git archive --prefix=name/`` produces the same layout). Members are
+    classified like the local scanner does; binary and generated files are
+    skipped.
+
+    Args:
+        fileobj: Readable binary stream of a plain or compressed tar archive
+
+    Returns:
+        Dictionary mapping language names to line counts
+
+    Raises:
+        tarfile.TarError: If the stream is not a tar archive
+    """
+    lines: Dict[str, int] = {}
+    with tarfile.open(fileobj=fileobj, mode='r|*') as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            path = member.name.split('/', 1)[1] if '/' in member.name else member.name
+            language = language_for_path(path)
+            if language is None:
+                continue
+            handle = archive.extractfile(member)
+            if handle is None:
+                continue
+            count = _count_lines(handle)
+            if count:
+                lines[language] = lines.get(language, 0) + count
+    return lines
+
+
+def _count_lines(handle: IO[bytes]) -> int:
+    """Lines in a member, or 0 if it looks binary or generated"""
+    count = 0
+    last = b''
+    first = True
+    while True:
+        chunk = handle.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        if first and looks_generated(chunk[:HEADER_BYTES]):
+            return 0
+        first = False
+        count += chunk.count(b'\n')
+        last = chunk[-1:]
+    if last and last != b'\n':
+        count += 1
+    return count
+
+
+class TarballLineSource:
+    """
+    Stats source counting lines instead of bytes, from repository tarballs.
+
+    Tarballs come from the API through a ``GitHubClient`` (one streamed
+    download per repository, forks and prefiltered repos excluded) or, as a
+    stand-in, from local archive files. Repositories are processed
+    concurrently. With ``cache_dir`` each repository's line counts are kept
+    against its tarball's ``ETag``, which follows the default branch's head
+    commit, and the download is sent as a conditional request: an unchanged
+    tarball answers ``304 Not Modified`` and is never streamed again, whatever
+    happens on other branches. Local archives are keyed by mtime and size.
+    ``LanguageStat.bytes`` carries the line count.
+    """
+
+    def __init__(self, client: Optional[Any] = None, archives: Sequence[str] = (),
+                 max_workers: int = 4, cache_dir: Optional[str] = None,
+                 orgs: Sequence[str] = (), accounts: Sequence[str] = ()):
+        """
+        Initialize the source.
+
+        Args:
+            client: ``GitHubClient`` used to list repositories and download
+                their tarballs (required unless ``archives`` are given)
+            archives: Local tarball files used instead of the API
+            max_workers: Number of tarballs streamed concurrently
+            cache_dir: Directory keeping per-repo line counts between runs
+            orgs: Organizations whose repositories are counted as well
+            accounts: Additional user accounts whose repositories are counted
+
+        Raises:
+            ValueError: If neither a client nor archives are given, or
+                ``max_workers`` is below 1
+        """
+        if client is None and not archives:
+            raise ValueError("Either a client or local archives must be provided")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.client = client
+        self.archives = [os.path.abspath(path) for path in dict.fromkeys(archives)]
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.orgs = tuple(orgs)
+        self.accounts = tuple(accounts)
+        self._streamed = 0
+        self._failed = 0
+        self._counter_lock = threading.Lock()
+
+    def fetch_language_stats(self, username: Optional[str] = None) -> StatsCollection:
+        """
+        Count lines per language across the repositories.
+
+        Args:
+            username: GitHub username (uses the client's if not provided;
+                ignored for local archives)
+
+        Returns:
+            StatsCollection weighted by line counts
+
+        Raises:
+            GitHubAPIError: If listing the repositories fails
+        """
+        if self.archives:
+            name = 'local'
+            repos: List[Dict[str, Any]] = [{'id': path} for path in self.archives]
+        else:
+            repos = list(self.client.iter_repositories(username, self.orgs, self.accounts))
+            name = '+'.join([username or self.client.username or '', *self.accounts, *self.orgs])
+        cache_path = (
+            os.path.join(self.cache_dir, 'tarball_lines', f'{name}.json') if self.cache_dir else None
+        )
+        cache = self._load_cache(cache_path)
+        fresh: Dict[str, Dict[str, Any]] = {}
+
+        def _lines(repo: Dict[str, Any]) -> Optional[Dict[str, int]]:
+            key = repo_key(repo)
+            entry = self._repo_lines(repo, cache.get(key))
+            if entry is not None:
+                with self._counter_lock:
+                    fresh[key] = entry
+                return entry['lines']
+            return None
+
+        if self.max_workers == 1:
+            results = [_lines(repo) for repo in repos]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix='tarball') as executor:
+                results = list(executor.map(_lines, repos))
+        if cache_path is not None:
+            self._save_cache(cache_path, {key: entry for key, entry in fresh.items() if entry['validator']})
+        return StatsCollection(calculate_percentages(merge_language_bytes(results)))
+
+    def _repo_lines(self, repo: Dict[str, Any],
+                    cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Line counts of one repository with their cache validator.
+
+        Returns:
+            ``{'validator': ..., 'lines': ...}`` from the cache when the
+            tarball is unchanged or from a fresh stream, or None on failure
+        """
+        try:
+            if self.archives:
+                stat = os.stat(repo['id'])
+                validator = f"{stat.st_mtime_ns}:{stat.st_size}"
+                if cached is not None and cached.get('validator') == validator:
+                    return cached
+                with open(repo['id'], 'rb') as handle:
+                    lines = count_tarball_lines(handle)
+            else:
+                etag = cached.get('validator') if cached is not None else None
+                response = self.client.open_tarball(repo.get('full_name'), etag=etag)
+                try:
+                    if etag and response.status_code == 304:
+                        return cached
+                    validator = response.headers.get('ETag')
+                    stream = io.BufferedReader(_ChunkStream(response.iter_content(CHUNK_SIZE)))
+                    lines = count_tarball_lines(stream)
+                finally:
+                    response.close()
+        except (OSError, TransportError, tarfile.TarError):
+            with self._counter_lock:
+                self._failed += 1
+            return None
+        with self._counter_lock:
+            self._streamed += 1
+        return {'validator': validator, 'lines': lines}
+
+    @staticmethod
+    def _load_cache(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        if path is None:
+            return {}
+        try:
+            with open(path, encoding='utf-8') as handle:
+                cache = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    @staticmethod
+    def _save_cache(path: str, cache: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically persist the entries of the repositories seen this run"""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(cache, handle)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def run_metrics(self) -> Dict[str, Any]:
+        """
+        Report counters gathered while streaming.
+
+        Returns:
+            Dictionary with the tarballs streamed this run and the ones that
+            failed and were skipped
+        """
+        return {'tarballs_streamed': self._streamed, 'tarballs_failed': self._failed}
+
+    def describe_metrics(self, metrics: Dict[str, Any]) -> List[str]:
+        """Summarize ``run_metrics`` output for the run log"""
+        return [
+            f"Streamed {metrics['tarballs_streamed']} tarballs; "
+            f"{metrics.get('tarballs_failed', 0)} could not be read and were skipped."
+        ]
+
+    def close(self) -> None:
+        """Nothing to release; the client is owned by the caller"""
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
@@ -0,0 +1,376 @@
+"""
+HTTP transports used by the GitHub client
+
+A transport exposes ``get`` / ``post`` with the subset of the
+``requests.Session`` call signature the client relies on (``params``,
+``headers``, ``json``, ``timeout``, ``stream``) and returns responses offering
+``status_code``, ``headers``, ``links``, ``json()``, ``iter_content()``,
+``raise_for_status()`` and ``close()``. Failures surface as
+:class:`TransportError` subclasses whichever library is underneath, so the
+client's retry logic does not depend on ``requests``.
+"""
+
+import http.client
+import json
+import queue
+import socket
+import threading
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple, Union
+from urllib.parse import urlencode, urljoin, urlsplit
+
+TRANSPORTS = ('requests', 'stdlib')
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+
+class TransportError(IOError):
+    """Base class for request failures raised by a transport"""
+    pass
+
+
+class TransportConnectionError(TransportError):
+    """The connection could not be established or was dropped"""
+    pass
+
+
+class TransportTimeout(TransportError):
+    """Connecting or reading took longer than the configured timeout"""
+    pass
+
+
+class TransportDecodeError(TransportError):
+    """The response body is not the JSON the caller asked for"""
+    pass
+
+
+class HTTPStatusError(TransportError):
+    """Raised by ``raise_for_status`` for 4xx and 5xx responses"""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Parse an RFC 8288 ``Link`` header the way ``requests`` exposes it.
+
+    Returns:
+        Mapping of ``rel`` to a dict holding ``url`` and ``rel``
+    """
+    links: Dict[str, Dict[str, str]] = {}
+    for part in (value or '').split(','):
+        segments = part.split(';')
+        url = segments[0].strip().strip('<>')
+        if not url:
+            continue
+        link = {'url': url}
+        for segment in segments[1:]:
+            key, _, param = segment.strip().partition('=')
+            link[key.strip()] = param.strip().strip('"\'')
+        links[link.get('rel', url)] = link
+    return links
+
+
+def create_transport(name: str = 'requests', pool_size: int = 10,
+                     headers: Optional[Mapping[str, str]] = None) -> Any:
+    """
+    Build a transport by name.
+
+    Args:
+        name: ``requests`` or ``stdlib`` (pooled ``http.client``)
+        pool_size: Keep-alive connections kept per host
+        headers: Headers sent with every request
+
+    Raises:
+        ValueError: If ``name`` is unknown
+    """
+    if name == 'requests':
+        return RequestsTransport(pool_size, headers)
+    if name == 'stdlib':
+        return HTTPClientTransport(pool_size, headers)
+    raise ValueError(f"transport must be one of {', '.join(TRANSPORTS)}")
+
+
+class RequestsTransport:
+    """Transport backed by a ``requests.Session`` with a sized connection pool"""
+
+    def __init__(self, pool_size: int = 10, headers: Optional[Mapping[str, str]] = None):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._requests = requests
+        self.session = requests.Session()
+        # Size the connection pool to the worker count so concurrent
+        # requests reuse keep-alive connections instead of discarding them.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(headers or {})
+
+    def get(self, url: str, **kwargs: Any) -> '_RequestsResponse':
+        return self._request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> '_RequestsResponse':
+        return self._request('POST', url, **kwargs)
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> '_RequestsResponse':
+        requests = self._requests
+        try:
+            return _RequestsResponse(self.session.request(method, url, **kwargs))
+        except requests.Timeout as e:
+            raise TransportTimeout(str(e)) from e
+        except requests.ConnectionError as e:
+            raise TransportConnectionError(str(e)) from e
+        except requests.RequestException as e:
+            raise TransportError(str(e)) from e
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class _RequestsResponse:
+    """``requests.Response`` with transport-neutral errors"""
+
+    def __init__(self, response: Any):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.links = response.links
+
+    def json(self) -> Any:
+        try:
+            return self._response.json()
+        except ValueError as e:
+            raise TransportDecodeError(f"Invalid JSON from {self._response.url}: {e}") from e
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_content(chunk_size)
+        except Exception as e:
+            raise TransportConnectionError(f"Response body interrupted: {e}") from e
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPStatusError(
+                f"{self.status_code} {self._response.reason} for url: {self._response.url}",
+                self.status_code,
+            )
+
+    def close(self) -> None:
+        self._response.close()
+
+
+ConnectionFactory = Callable[[str, str, Optional[int]], http.client.HTTPConnection]
+
+
+def _default_connection_factory(scheme: str, host: str,
+                                port: Optional[int]) -> http.client.HTTPConnection:
+    if scheme == 'https':
+        return http.client.HTTPSConnection(host, port)
+    return http.client.HTTPConnection(host, port)
+
+
+class HTTPClientTransport:
+    """
+    Lean transport on the standard library's ``http.client``.
+
+    Idle keep-alive connections are pooled per host, up to ``pool_size`` each.
+    A request that fails on a reused connection, which the server may have
+    closed meanwhile, is sent once more on a fresh one. Redirects are followed
+    like ``requests`` does, dropping ``Authorization`` when the host changes
+    and switching to ``GET`` for ``303`` (and ``301``/``302`` after a
+    ``POST``). Connections come from
+    ``connection_factory``, so tests can plug in an in-memory fake with the
+    ``HTTPConnection`` interface.
+    """
+
+    def __init__(self, pool_size: int = 10, headers: Optional[Mapping[str, str]] = None,
+                 connection_factory: ConnectionFactory = _default_connection_factory):
+        self.pool_size = pool_size
+        self.headers = dict(headers or {})
+        self._connection_factory = connection_factory
+        self._pools: Dict[Tuple[str, str, Optional[int]], 'queue.LifoQueue'] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs: Any) -> 'HTTPClientResponse':
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> 'HTTPClientResponse':
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method: str, url: str, params: Optional[Mapping[str, Any]] = None,
+                headers: Optional[Mapping[str, str]] = None, json: Any = None,
+                timeout: Timeout = None, stream: bool = False) -> 'HTTPClientResponse':
+        """
+        Send a request, following redirects.
+
+        Raises:
+            TransportTimeout: If connecting or reading timed out
+            TransportConnectionError: If the connection failed
+            TransportError: If the request redirects more than ``MAX_REDIRECTS`` times
+        """
+        request_headers = {**self.headers, **(headers or {})}
+        body = None
+        if json is not None:
+            body = _json_dumps(json)
+            request_headers.setdefault('Content-Type', 'application/json')
+
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, params, request_headers, body, timeout, stream)
+            location = response.headers.get('Location')
+            if response.status_code not in REDIRECT_STATUSES or not location:
+                return response
+            response.close()
+            target = urljoin(url, location)
+            if urlsplit(target).hostname != urlsplit(url).hostname:
+                request_headers = {
+                    name: value for name, value in request_headers.items()
+                    if name.lower() != 'authorization'
+                }
+            if response.status_code == 303 or (response.status_code in (301, 302) and method == 'POST'):
+                method, body = 'GET', None
+                request_headers = {
+                    name: value for name, value in request_headers.items()
+                    if name.lower() != 'content-type'
+                }
+            url, params = target, None
+        raise TransportError(f"{method} {url} redirected more than {MAX_REDIRECTS} times")
+
+    def _send(self, method: str, url: str, params: Optional[Mapping[str, Any]],
+              request_headers: Dict[str, str], body: Optional[bytes], timeout: Timeout,
+              stream: bool) -> 'HTTPClientResponse':
+        """Send one request without following redirects"""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname or '', parts.port)
+        path = parts.path or '/'
+        query = '&'.join(q for q in (parts.query, urlencode(params or {})) if q)
+        if query:
+            path = f"{path}?{query}"
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+
+        connection, reused = self._checkout(key)
+        while True:
+            try:
+                if connection.sock is None:
+                    connection.timeout = connect_timeout
+                    connection.connect()
+                if connection.sock is not None:
+                    connection.sock.settimeout(read_timeout)
+                connection.request(method, path, body=body, headers=request_headers)
+                raw = connection.getresponse()
+                break
+            except socket.timeout as e:
+                connection.close()
+                raise TransportTimeout(f"{method} {url} timed out") from e
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                if reused:
+                    connection, reused = self._connection_factory(*key), False
+                    continue
+                raise TransportConnectionError(f"{method} {url} failed: {e}") from e
+
+        response = HTTPClientResponse(raw, url, lambda: self._checkin(key, connection), connection)
+        if not stream:
+            response.read()
+        return response
+
+    def _checkout(self, key: Tuple[str, str, Optional[int]]) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            pool = self._pools.setdefault(key, queue.LifoQueue(maxsize=self.pool_size))
+        try:
+            return pool.get_nowait(), True
+        except queue.Empty:
+            return self._connection_factory(*key), False
+
+    def _checkin(self, key: Tuple[str, str, Optional[int]],
+                 connection: http.client.HTTPConnection) -> None:
+        try:
+            self._pools[key].put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+class HTTPClientResponse:
+    """Response read from an ``http.client`` connection"""
+
+    def __init__(self, raw: http.client.HTTPResponse, url: str,
+                 release: Callable[[], None], connection: http.client.HTTPConnection):
+        self.status_code = raw.status
+        self.reason = raw.reason
+        self.url = url
+        self.headers = raw.headers
+        self.links = parse_link_header(raw.headers.get('Link'))
+        self._raw = raw
+        self._release = release
+        self._connection = connection
+        self._content: Optional[bytes] = None
+        self._done = False
+
+    def read(self) -> bytes:
+        """Read the whole body and return the connection to the pool"""
+        if self._content is None:
+            self._content = b''.join(self.iter_content(64 * 1024))
+        return self._content
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        if self._content is not None:
+            yield self._content
+            return
+        try:
+            while True:
+                chunk = self._raw.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        except socket.timeout as e:
+            self._discard()
+            raise TransportTimeout(f"Reading {self.url} timed out") from e
+        except (OSError, http.client.HTTPException) as e:
+            self._discard()
+            raise TransportConnectionError(f"Reading {self.url} failed: {e}") from e
+        self._finish()
+
+    def json(self) -> Any:
+        try:
+            return json.loads(self.read().decode('utf-8'))
+        except ValueError as e:
+            raise TransportDecodeError(f"Invalid JSON from {self.url}: {e}") from e
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPStatusError(f"{self.status_code} {self.reason} for url: {self.url}", self.status_code)
+
+    def _finish(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        if self._raw.will_close:
+            self._connection.close()
+        else:
+            self._release()
+
+    def _discard(self) -> None:
+        self._done = True
+        self._connection.close()
+
+    def close(self) -> None:
+        """Release the connection, dropping it if the body was not fully read"""
+        if not self._done:
+            self._discard()
+
+
+def _json_dumps(payload: Any) -> bytes:
+    return json.dumps(payload).encode('utf-8')
@@ -0,0 +1,104 @@
+"""
+Interpretation of GitHub ``push`` and ``repository`` webhook payloads
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional
+
+from .listing import RepoRecord
+
+WEBHOOK_EVENTS = ('push', 'repository')
+
+# ``repository`` actions after which the repo no longer counts, and after
+# which its languages have to be (re)fetched. Others (``edited``,
+# ``renamed``) leave the languages alone: snapshots are keyed by repo id.
+REMOVING_ACTIONS = ('deleted', 'privatized', 'archived')
+REFRESHING_ACTIONS = ('created', 'publicized', 'unarchived', 'transferred')
+
+
+class WebhookChange(NamedTuple):
+    """
+    What a webhook delivery means for the stored per-repo languages.
+
+    Attributes:
+        action: ``refresh`` to refetch the repo's languages or ``remove`` to
+            drop them
+        repo: The affected repository, projected like a listing entry
+        owner: Login of the repository owner
+    """
+    action: str
+    repo: RepoRecord
+    owner: str
+
+
+def parse_webhook(event: str, payload: Dict[str, Any]) -> Optional[WebhookChange]:
+    """
+    Reduce a webhook delivery to the change it implies.
+
+    Args:
+        event: Value of the ``X-GitHub-Event`` header (``GITHUB_EVENT_NAME``
+            in Actions)
+        payload: Decoded delivery body
+
+    Returns:
+        The change, or None if the delivery does not affect language stats
+
+    Raises:
+        ValueError: If ``event`` is not a supported webhook event or the
+            payload has no repository
+    """
+    if event not in WEBHOOK_EVENTS:
+        raise ValueError(f"Unsupported webhook event {event!r}; expected {', '.join(WEBHOOK_EVENTS)}")
+    repository = payload.get('repository')
+    if not isinstance(repository, dict):
+        raise ValueError("Webhook payload has no repository")
+
+    if event == 'push':
+        # GitHub computes languages from the default branch only.
+        ref = payload.get('ref')
+        default_branch = repository.get('default_branch') or repository.get('master_branch')
+        if payload.get('deleted') or ref and default_branch and ref != f"refs/heads/{default_branch}":
+            return None
+        action = 'refresh'
+    else:
+        action = payload.get('action')
+        if action in REMOVING_ACTIONS:
+            action = 'remove'
+        elif action in REFRESHING_ACTIONS:
+            action = 'refresh'
+        else:
+            return None
+
+    owner = repository.get('owner') or {}
+    record = RepoRecord.from_json({**repository, 'pushed_at': _timestamp(repository.get('pushed_at'))})
+    return WebhookChange(action, record, str(owner.get('login') or owner.get('name') or ''))
+
+
+def read_payload(path: str) -> Dict[str, Any]:
+    """
+    Load a webhook payload saved to disk (``GITHUB_EVENT_PATH`` in Actions).
+
+    Raises:
+        ValueError: If the file cannot be read or is not a JSON object
+    """
+    try:
+        with open(path, encoding='utf-8') as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Cannot read webhook payload {path}: {e}") from e
+    if not isinstance(payload, dict):
+        raise ValueError(f"Webhook payload {path} is not a JSON object")
+    return payload
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    """
+    Normalize ``pushed_at`` to the listing's ISO 8601 form.
+
+    Push payloads carry it as a Unix timestamp; converting it lets the next
+    listing run recognize the snapshot as current.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return value
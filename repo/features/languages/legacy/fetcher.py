@@ -2,19 +2,25 @@
 GitHub API data fetcher for language statistics
 """
 
-import requests
 import warnings
-from collections import defaultdict
+from typing import Optional
+from ..infrastructure import GitHubAPIError, GitHubClient
 from .config import MAX_LANGUAGES, EXCLUDED_LANGUAGES
 
 
-def fetch_language_stats(username, token):
+def fetch_language_stats(username, token, *, max_workers=GitHubClient.DEFAULT_MAX_WORKERS,
+                         cache_dir: Optional[str] = None):
     """
     Fetch language statistics from GitHub API
     
+    Backed by :class:`GitHubClient`, so repos are listed and their languages
+    fetched concurrently over pooled keep-alive connections.
+    
     Args:
         username: GitHub username
         token: GitHub API token
+        max_workers: Concurrent per-repo language requests
+        cache_dir: Optional conditional-request cache directory
         
     Returns:
         List of tuples: [(language_name, percentage), ...]
@@ -30,23 +36,14 @@ def fetch_language_stats(username, token):
         stacklevel=2,
     )
 
-    headers = {'Authorization': f'token {token}'}
-    
-    # Get all repos
-    repos_url = f'https://api.github.com/users/{username}/repos?per_page=100'
-    repos = requests.get(repos_url, headers=headers).json()
-    
-    # Aggregate language bytes across all repos
-    lang_bytes = defaultdict(int)
-    
-    for repo in repos:
-        if isinstance(repo, dict) and not repo.get('fork', False):
-            lang_url = repo.get('languages_url')
-            if lang_url:
-                languages = requests.get(lang_url, headers=headers).json()
-                if isinstance(languages, dict):
-                    for lang, bytes_count in languages.items():
-                        lang_bytes[lang] += bytes_count
+    # Aggregate language bytes across all non-fork repos
+    try:
+        with GitHubClient(token=token, username=username, max_workers=max_workers,
+                          cache_dir=cache_dir) as client:
+            stats = client.fetch_language_stats(username)
+    except (GitHubAPIError, ValueError):
+        return []  # Unknown user or no language data
+    lang_bytes = {stat.name: stat.bytes for stat in stats}
     
     # Filter out excluded languages
     for excluded_lang in EXCLUDED_LANGUAGES:
@@ -22,6 +22,9 @@ setup(
         'requests>=2.31.0',
     ],
     extras_require={
+        'async': [
+            'aiohttp>=3.9.0',
+        ],
         'dev': [
             'pytest>=7.4.0',
             'pytest-cov>=4.1.0',
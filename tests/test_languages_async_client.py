@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from repo.features.languages.infrastructure import AsyncGitHubClient, GitHubAPIError
+
+REPOS_URL = "https://api.github.com/users/octocat/repos"
+
+
+def _lang_url(name: str) -> str:
+    return f"https://api.github.com/repos/octocat/{name}/languages"
+
+
+class FakeAsyncResponse:
+    def __init__(self, payload, status: int = 200, next_url: str | None = None) -> None:
+        self._payload = payload
+        self.status = status
+        self.links = {"next": {"url": next_url}} if next_url else {}
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self) -> "FakeAsyncResponse":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        return None
+
+
+class FakeAsyncSession:
+    """Minimal ``aiohttp.ClientSession`` stand-in that tracks concurrency."""
+
+    def __init__(self, routes: dict, delay: float = 0.01) -> None:
+        self.routes = routes
+        self.delay = delay
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url: str, **_kwargs):
+        self.calls.append(url)
+        return _FakeRequest(self, url)
+
+
+class _FakeRequest:
+    def __init__(self, session: FakeAsyncSession, url: str) -> None:
+        self.session = session
+        self.url = url
+
+    async def __aenter__(self) -> FakeAsyncResponse:
+        session = self.session
+        session.in_flight += 1
+        session.max_in_flight = max(session.max_in_flight, session.in_flight)
+        try:
+            await asyncio.sleep(session.delay)
+        finally:
+            session.in_flight -= 1
+        route = session.routes.get(self.url)
+        if route is None or isinstance(route, Exception):
+            raise route or ConnectionError(f"no route for {self.url}")
+        return route
+
+    async def __aexit__(self, *_exc) -> None:
+        return None
+
+
+def _routes() -> dict:
+    names = [f"repo{i}" for i in range(6)]
+    routes = {
+        REPOS_URL: FakeAsyncResponse(
+            [{"name": name, "fork": False, "languages_url": _lang_url(name)} for name in names]
+            + [{"name": "forked", "fork": True, "languages_url": _lang_url("forked")}]
+        ),
+    }
+    for name in names:
+        routes[_lang_url(name)] = FakeAsyncResponse({"Python": 100, "Go": 50})
+    routes[_lang_url("repo5")] = FakeAsyncResponse({}, status=502)
+    routes[_lang_url("repo4")] = ConnectionError("reset by peer")
+    return routes
+
+
+def test_async_client_fetches_languages_concurrently() -> None:
+    session = FakeAsyncSession(_routes())
+    client = AsyncGitHubClient(token="token", username="octocat", max_workers=3, session=session)
+
+    stats = asyncio.run(client.fetch_language_stats())
+
+    assert [(stat.name, stat.bytes) for stat in stats] == [("Python", 400), ("Go", 200)]
+    assert _lang_url("forked") not in session.calls
+    assert session.max_in_flight == 3
+
+
+def test_async_client_raises_when_listing_fails() -> None:
+    session = FakeAsyncSession({REPOS_URL: FakeAsyncResponse([], status=404)})
+    client = AsyncGitHubClient(token="token", session=session)
+
+    with pytest.raises(GitHubAPIError):
+        asyncio.run(client.fetch_language_stats("octocat"))
+
+
+def test_async_client_requires_username() -> None:
+    client = AsyncGitHubClient(token="token", session=FakeAsyncSession({}))
+
+    with pytest.raises(ValueError):
+        asyncio.run(client.fetch_language_stats())
+
+
+def test_async_client_follows_pagination() -> None:
+    page_two_url = f"{REPOS_URL}?page=2"
+    routes = {
+        REPOS_URL: FakeAsyncResponse(
+            [{"name": "a", "fork": False, "languages_url": _lang_url("a")}], next_url=page_two_url
+        ),
+        page_two_url: FakeAsyncResponse([{"name": "b", "fork": False, "languages_url": _lang_url("b")}]),
+        _lang_url("a"): FakeAsyncResponse({"Rust": 5}),
+        _lang_url("b"): FakeAsyncResponse({"Rust": 5, "C": 10}),
+    }
+    client = AsyncGitHubClient(token="token", session=FakeAsyncSession(routes))
+
+    stats = asyncio.run(client.fetch_language_stats("octocat"))
+
+    assert [(stat.name, stat.bytes) for stat in stats] == [("Rust", 10), ("C", 10)]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from repo.features.languages.infrastructure import GitChurnSource
+from repo.features.languages.infrastructure.churn import parse_numstat, update_churn
+
+
+def test_parse_numstat_streams_churn_per_day() -> None:
+    output = [
+        "\x1e1717200000\n",
+        "\n",
+        "3\t1\tsrc/app.py\n",
+        "-\t-\tlogo.png\n",
+        "\x1e1717286400\n",
+        "2\t0\tmain.go\n",
+    ]
+
+    assert list(parse_numstat(output)) == [
+        ("2024-06-01", "src/app.py", 4),
+        ("2024-06-02", "main.go", 2),
+    ]
+
+
+def _git(path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-C", str(path), "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_churn_resumes_from_the_last_parsed_commit(tmp_path) -> None:
+    clone = tmp_path / "clone"
+    clone.mkdir()
+    _git(clone, "init", "-q")
+    (clone / "app.py").write_text("a\nb\nc\n")
+    (clone / "main.go").write_text("x\ny\n")
+    (clone / "vendor").mkdir()
+    (clone / "vendor" / "dep.go").write_text("v\n" * 50)
+    _git(clone, "add", ".")
+    _git(clone, "commit", "-q", "-m", "initial")
+    state_dir = str(tmp_path / "cache")
+
+    first = GitChurnSource([str(clone)], state_dir=state_dir)
+    assert {stat.name: stat.bytes for stat in first.fetch_language_stats()} == {"Python": 3, "Go": 2}
+
+    (clone / "app.py").write_text("a\nB\nc\n")
+    _git(clone, "commit", "-q", "-am", "edit")
+    second = GitChurnSource([str(clone)], state_dir=state_dir)
+
+    assert {stat.name: stat.bytes for stat in second.fetch_language_stats()} == {"Python": 5, "Go": 2}
+    assert second.run_metrics() == {"commits_parsed": 1, "repos_resumed": 1}
+
+
+def test_churn_source_validates_arguments() -> None:
+    with pytest.raises(ValueError):
+        GitChurnSource([])
+    with pytest.raises(ValueError):
+        GitChurnSource(["."], window_days=0)
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_full_parse_reads_and_keeps_only_the_window(tmp_path) -> None:
+    clone = tmp_path / "clone"
+    clone.mkdir()
+    _git(clone, "init", "-q")
+    (clone / "old.py").write_text("a\n" * 10)
+    _git(clone, "add", ".")
+    subprocess.run(
+        ["git", "-C", str(clone), "-c", "user.name=t", "-c", "user.email=t@example.com",
+         "commit", "-q", "-m", "old"],
+        check=True,
+        capture_output=True,
+        env={**os.environ, "GIT_AUTHOR_DATE": "2001-01-01T00:00:00Z",
+             "GIT_COMMITTER_DATE": "2001-01-01T00:00:00Z"},
+    )
+    (clone / "main.go").write_text("x\ny\n")
+    _git(clone, "add", ".")
+    _git(clone, "commit", "-q", "-m", "recent")
+
+    state, commits = update_churn(str(clone), {"head": "rewritten", "days": {"2000-01-01": {"C": 99}}},
+                                  since="2020-01-01")
+
+    assert commits == 1
+    assert state["since"] == "2020-01-01"
+    assert [bucket for bucket in state["days"].values()] == [{"Go": 2}]
+
+    wider, commits = update_churn(str(clone), state, since="2000-06-01")
+
+    assert commits == 2
+    assert sorted(language for bucket in wider["days"].values() for language in bucket) == ["Go", "Python"]
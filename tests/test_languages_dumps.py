@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+
+from repo.features.languages.core import LanguagesRequest
+from repo.features.languages.generate_languages import _run_job
+from repo.features.languages.infrastructure import DumpIngest, RepoPrefilter
+from repo.features.languages.infrastructure.dumps import aggregate_dump
+
+
+def _write_dump(path, records, compress: bool = True) -> str:
+    lines = [record if isinstance(record, str) else json.dumps(record) for record in records]
+    data = "\n".join(lines) + "\n"
+    if compress:
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            handle.write(data)
+    else:
+        path.write_text(data, encoding="utf-8")
+    return str(path)
+
+
+RECORDS = [
+    {"full_name": "octocat/alpha", "owner": {"login": "octocat"}, "languages": {"Python": 700, "Go": 300}},
+    {"full_name": "octocat/fork", "owner": {"login": "octocat"}, "fork": True, "languages": {"C": 9000}},
+    {"full_name": "octocat/old", "owner": {"login": "octocat"}, "archived": True, "languages": {"Perl": 50}},
+    {"full_name": "hubot/beta", "language": "Rust", "size": 2},
+    "{not json",
+    "",
+    {"full_name": "../escape", "owner": "../escape", "languages": {"Python": 1}},
+]
+
+
+def test_dump_is_aggregated_per_owner_in_one_pass(tmp_path) -> None:
+    path = _write_dump(tmp_path / "repos.jsonl.gz", RECORDS)
+
+    totals, records, malformed = aggregate_dump(path, RepoPrefilter(("archived",)))
+
+    assert totals == {"octocat": {"Python": 700, "Go": 300}, "hubot": {"Rust": 2048}}
+    assert (records, malformed) == (4, 2)
+
+
+def test_several_dumps_are_merged_across_processes(tmp_path) -> None:
+    first = _write_dump(tmp_path / "a.jsonl.gz", RECORDS[:1])
+    second = _write_dump(
+        tmp_path / "b.jsonl",
+        [{"full_name": "octocat/gamma", "languages": {"Go": 700}}],
+        compress=False,
+    )
+
+    ingest = DumpIngest([first, second], max_workers=2)
+    stats = ingest.owner_stats()
+
+    assert list(stats) == ["octocat"]
+    assert {stat.name: stat.bytes for stat in stats["octocat"]} == {"Go": 1000, "Python": 700}
+    assert ingest.run_metrics() == {"dump_records": 2, "dump_malformed": 0, "dump_owners": 1}
+
+
+def test_dump_backend_writes_a_card_per_owner(tmp_path) -> None:
+    path = _write_dump(tmp_path / "repos.jsonl.gz", RECORDS)
+    request = LanguagesRequest(
+        token="t",
+        username="unused",
+        output_mode="vector",
+        backend="dump",
+        local_paths=(path,),
+        cards_dir=str(tmp_path / "cards"),
+    )
+
+    result = _run_job(request)
+
+    assert sorted(result.assets) == sorted(
+        str(tmp_path / "cards" / owner / name)
+        for owner in ("hubot", "octocat")
+        for name in ("langs-mono-light.svg", "langs-mono-dark.svg")
+    )
+    assert "Rust" in (tmp_path / "cards" / "hubot" / "langs-mono-dark.svg").read_text()
+    assert result.metrics["dump_owners"] == 2
+
+
+def test_text_mode_writes_marked_sections(tmp_path) -> None:
+    path = _write_dump(tmp_path / "repos.jsonl.gz", RECORDS[:1])
+    request = LanguagesRequest(
+        token="t",
+        username="unused",
+        backend="dump",
+        local_paths=(path,),
+        cards_dir=str(tmp_path / "cards"),
+    )
+
+    _run_job(request)
+
+    section = (tmp_path / "cards" / "octocat" / "README.md").read_text()
+    assert section.startswith(request.start_marker)
+    assert section.rstrip().endswith(request.end_marker)
+    assert "Python" in section
+
+
+def test_dump_backend_requires_dump_files() -> None:
+    with pytest.raises(ValueError, match="local_paths"):
+        LanguagesRequest(token="t", username="u", backend="dump")
+
+
+def test_owner_with_only_excluded_languages_is_skipped(tmp_path) -> None:
+    path = _write_dump(tmp_path / "repos.jsonl.gz", [
+        {"full_name": "alice/api", "languages": {"Python": 100}},
+        {"full_name": "bob/site", "languages": {"JavaScript": 100}},
+    ])
+    request = LanguagesRequest(
+        token="t",
+        username="unused",
+        output_mode="vector",
+        excluded_languages=("JavaScript", "HTML", "CSS", "SCSS"),
+        backend="dump",
+        local_paths=(path,),
+        cards_dir=str(tmp_path / "cards"),
+    )
+
+    result = _run_job(request)
+
+    assert (tmp_path / "cards" / "alice" / "langs-mono-dark.svg").exists()
+    assert not (tmp_path / "cards" / "bob").exists()
+    assert result.metrics["dump_skipped_owners"] == 1
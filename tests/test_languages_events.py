@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from repo.features.languages.infrastructure.events import EventCursorStore, scan_push_events
+
+
+def _event(event_id: int, name: str, event_type: str = "PushEvent", repo_id: int = 1) -> dict:
+    return {"id": str(event_id), "type": event_type, "created_at": f"2024-06-0{event_id}T00:00:00Z",
+            "repo": {"id": repo_id, "name": name}}
+
+
+def test_scan_collects_own_pushes_newer_than_the_cursor() -> None:
+    events = [
+        _event(4, "octocat/alpha"),
+        _event(3, "someone/else", repo_id=2),
+        _event(2, "octocat/alpha", "CreateEvent"),
+        _event(1, "octocat/beta", repo_id=3),
+    ]
+
+    pushed, newest, reached = scan_push_events(events, "1", {"octocat"})
+
+    assert pushed == {"1": ("octocat/alpha", "2024-06-04T00:00:00Z")}
+    assert newest == "4"
+    assert reached is True
+
+
+def test_scan_reports_a_gap_when_the_cursor_is_not_reached() -> None:
+    pushed, newest, reached = scan_push_events([_event(9, "octocat/alpha")], "5", {"octocat"})
+
+    assert pushed == {"1": ("octocat/alpha", "2024-06-09T00:00:00Z")}
+    assert (newest, reached) == ("9", False)
+
+
+def test_cursor_store_round_trips(tmp_path) -> None:
+    path = tmp_path / "events" / "octocat.json"
+    store = EventCursorStore(str(path))
+    assert store.get("octocat") == {"etag": None, "cursor": None}
+
+    store.update("octocat", '"e1"', "42")
+    store.save()
+
+    assert EventCursorStore(str(path)).get("octocat") == {"etag": '"e1"', "cursor": "42"}
@@ -0,0 +1,924 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from urllib.parse import urlencode
+
+import pytest
+
+from repo.features.languages.infrastructure import (
+    CircuitBreaker,
+    CircuitOpenError,
+    GitHubAPIError,
+    GitHubClient,
+    RateLimitExceededError,
+    RepoPrefilter,
+    RetryPolicy,
+)
+from repo.features.languages.infrastructure.listing import RepoRecord
+from repo.features.languages.infrastructure.transport import (
+    HTTPStatusError,
+    RequestsTransport,
+    TransportConnectionError,
+    TransportDecodeError,
+    TransportTimeout,
+)
+
+
+class FakeResponse:
+    def __init__(
+        self,
+        payload,
+        status_code: int = 200,
+        next_url: str | None = None,
+        headers: dict | None = None,
+    ) -> None:
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.links = {"next": {"url": next_url, "rel": "next"}} if next_url else {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPStatusError(f"HTTP {self.status_code}", self.status_code)
+
+    def json(self):
+        return self._payload
+
+    def iter_content(self, chunk_size: int = 1):
+        body = json.dumps(self._payload).encode("utf-8")
+        # Small chunks so streamed parsing sees values split across reads.
+        for start in range(0, len(body), 7):
+            yield body[start:start + 7]
+
+    def close(self) -> None:
+        pass
+
+
+class FakeSession:
+    """Stand-in transport that serves canned payloads by URL."""
+
+    def __init__(self, routes: dict) -> None:
+        self.routes = routes
+        self.calls: list[str] = []
+        self.sent_headers: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None, **_kwargs) -> FakeResponse:
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        with self._lock:
+            self.calls.append(url)
+            self.sent_headers[url] = dict(headers or {})
+        # Fall back to the bare URL so routes can ignore query strings.
+        route = self.routes.get(url, self.routes.get(url.split("?", 1)[0]))
+        if route is None:
+            raise TransportConnectionError(f"no route for {url}")
+        if isinstance(route, Exception):
+            raise route
+        if callable(route):
+            return route()
+        return route
+
+    def close(self) -> None:
+        pass
+
+
+USER_URL = "https://api.github.com/users/octocat"
+REPOS_URL = f"{USER_URL}/repos"
+FIRST_PAGE_URL = f"{REPOS_URL}?per_page=100&type=owner"
+
+
+def _lang_url(name: str) -> str:
+    return f"https://api.github.com/repos/octocat/{name}/languages"
+
+
+def _routes() -> dict:
+    return {
+        REPOS_URL: FakeResponse(
+            [
+                {"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")},
+                {"name": "beta", "fork": False, "languages_url": _lang_url("beta")},
+                {"name": "forked", "fork": True, "languages_url": _lang_url("forked")},
+                {"name": "broken", "fork": False, "languages_url": _lang_url("broken")},
+                {"name": "gone", "fork": False, "languages_url": _lang_url("gone")},
+            ]
+        ),
+        _lang_url("alpha"): FakeResponse({"Python": 600, "Rust": 100}),
+        _lang_url("beta"): FakeResponse({"Python": 200, "Go": 100}),
+        _lang_url("forked"): FakeResponse({"Java": 10_000}),
+        _lang_url("broken"): FakeResponse({}, status_code=500),
+        _lang_url("gone"): TransportTimeout("timed out"),
+    }
+
+
+def _client(routes: dict, **kwargs) -> tuple[GitHubClient, FakeSession]:
+    client = GitHubClient(token="token", username="octocat", **kwargs)
+    session = FakeSession(routes)
+    client._transport = session
+    client._sleep = lambda _: None
+    return client, session
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_fetch_language_stats_aggregates_and_skips_failures(max_workers: int) -> None:
+    client, session = _client(_routes(), max_workers=max_workers)
+
+    stats = client.fetch_language_stats()
+
+    assert [(stat.name, stat.bytes) for stat in stats] == [
+        ("Python", 800),
+        ("Rust", 100),
+        ("Go", 100),
+    ]
+    assert _lang_url("forked") not in session.calls
+    assert set(session.calls) - {USER_URL} == {
+        FIRST_PAGE_URL, _lang_url("alpha"), _lang_url("beta"), _lang_url("broken"), _lang_url("gone")
+    }
+
+
+def test_concurrent_fetch_matches_sequential_fetch() -> None:
+    sequential, _ = _client(_routes(), max_workers=1)
+    concurrent, _ = _client(_routes(), max_workers=8)
+
+    assert sequential.fetch_language_stats().to_tuples() == concurrent.fetch_language_stats().to_tuples()
+
+
+def test_connection_pool_is_sized_to_worker_count() -> None:
+    client = GitHubClient(token="token", max_workers=12)
+
+    assert isinstance(client._transport, RequestsTransport)
+    adapter = client._transport.session.get_adapter("https://api.github.com")
+
+    assert adapter._pool_maxsize == 12
+    client.close()
+
+
+def test_max_workers_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        GitHubClient(token="token", max_workers=0)
+
+
+def test_listing_follows_link_headers_and_overlaps_language_fetches() -> None:
+    page_two_url = f"{REPOS_URL}?per_page=100&type=owner&page=2"
+    page_one_languages_started = threading.Event()
+
+    def page_one_languages() -> FakeResponse:
+        page_one_languages_started.set()
+        return FakeResponse({"Python": 10})
+
+    def page_two() -> FakeResponse:
+        # Page 1's language requests must already be in flight.
+        assert page_one_languages_started.wait(timeout=2)
+        return FakeResponse([{"name": "beta", "fork": False, "languages_url": _lang_url("beta")}])
+
+    routes = {
+        REPOS_URL: FakeResponse(
+            [{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}],
+            next_url=page_two_url,
+        ),
+        page_two_url: page_two,
+        _lang_url("alpha"): page_one_languages,
+        _lang_url("beta"): FakeResponse({"Go": 30}),
+    }
+    client, session = _client(routes, max_workers=4)
+
+    stats = client.fetch_language_stats()
+
+    assert [(stat.name, stat.bytes) for stat in stats] == [("Go", 30), ("Python", 10)]
+    assert session.calls.count(page_two_url) == 1
+    client.close()
+
+
+def test_fetch_user_repos_returns_every_page() -> None:
+    pages = [f"{REPOS_URL}?page={n}" for n in range(2, 4)]
+    routes = {
+        REPOS_URL: FakeResponse([{"name": "r1"}], next_url=pages[0]),
+        pages[0]: FakeResponse([{"name": "r2"}], next_url=pages[1]),
+        pages[1]: FakeResponse([{"name": "r3"}]),
+    }
+    client, _ = _client(routes, max_workers=1)
+
+    assert [repo.name for repo in client._fetch_user_repos("octocat")] == ["r1", "r2", "r3"]
+
+
+def test_listing_failure_raises_api_error() -> None:
+    client, _ = _client({REPOS_URL: FakeResponse([], status_code=502)})
+
+    with pytest.raises(GitHubAPIError):
+        client.fetch_language_stats()
+
+
+def test_listing_fans_out_pages_from_public_repos_count() -> None:
+    def page_url(page: int) -> str:
+        return f"{FIRST_PAGE_URL}&page={page}"
+
+    routes = {
+        USER_URL: FakeResponse({"login": "octocat", "public_repos": 250}),
+        page_url(1): FakeResponse([{"name": "r1"}], next_url=page_url(2)),
+        page_url(2): FakeResponse([{"name": "r2"}], next_url=page_url(3)),
+        page_url(3): FakeResponse([{"name": "r3"}]),
+    }
+    client, session = _client(routes, max_workers=4)
+
+    names = [repo.name for repo in client._iter_user_repos("octocat")]
+
+    assert names == ["r1", "r2", "r3"]
+    assert session.calls[0] == USER_URL
+    assert sorted(session.calls[1:]) == [page_url(1), page_url(2), page_url(3)]
+    client.close()
+
+
+def test_listing_fan_out_keeps_walking_when_count_is_stale() -> None:
+    def page_url(page: int) -> str:
+        return f"{FIRST_PAGE_URL}&page={page}"
+
+    routes = {
+        USER_URL: FakeResponse({"public_repos": 101}),
+        page_url(1): FakeResponse([{"name": "r1"}], next_url=page_url(2)),
+        page_url(2): FakeResponse([{"name": "r2"}], next_url=page_url(3)),
+        page_url(3): FakeResponse([{"name": "r3"}]),
+    }
+    client, _ = _client(routes, max_workers=4)
+
+    assert [repo.name for repo in client._iter_user_repos("octocat")] == ["r1", "r2", "r3"]
+    client.close()
+
+
+def test_listing_falls_back_to_link_walking_without_count() -> None:
+    page_two_url = f"{REPOS_URL}?page=2"
+    routes = {
+        USER_URL: FakeResponse({}, status_code=404),
+        FIRST_PAGE_URL: FakeResponse([{"name": "r1"}], next_url=page_two_url),
+        page_two_url: FakeResponse([{"name": "r2"}]),
+    }
+    client, session = _client(routes, max_workers=4)
+
+    assert [repo.name for repo in client._iter_user_repos("octocat")] == ["r1", "r2"]
+    assert session.calls == [USER_URL, FIRST_PAGE_URL, page_two_url]
+    client.close()
+
+
+def test_conditional_cache_serves_not_modified_responses_from_disk(tmp_path) -> None:
+    listing = [{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}]
+    first_run = {
+        FIRST_PAGE_URL: FakeResponse(listing, headers={"ETag": 'W/"list-1"'}),
+        _lang_url("alpha"): FakeResponse(
+            {"Python": 70, "Rust": 30},
+            headers={"ETag": '"alpha-1"', "Last-Modified": "Tue, 01 Oct 2024 00:00:00 GMT"},
+        ),
+    }
+    client, _ = _client(first_run, max_workers=1, cache_dir=str(tmp_path))
+    expected = client.fetch_language_stats().to_tuples()
+
+    not_modified = {
+        FIRST_PAGE_URL: FakeResponse(None, status_code=304),
+        _lang_url("alpha"): FakeResponse(None, status_code=304),
+    }
+    cached_client, session = _client(not_modified, max_workers=1, cache_dir=str(tmp_path))
+
+    assert cached_client.fetch_language_stats().to_tuples() == expected
+    assert session.sent_headers[FIRST_PAGE_URL]["If-None-Match"] == 'W/"list-1"'
+    assert "If-Modified-Since" not in session.sent_headers[FIRST_PAGE_URL]
+    assert session.sent_headers[_lang_url("alpha")]["If-None-Match"] == '"alpha-1"'
+    assert session.sent_headers[_lang_url("alpha")]["If-Modified-Since"] == "Tue, 01 Oct 2024 00:00:00 GMT"
+    assert (cached_client._cache.hits, cached_client._cache.misses) == (2, 0)
+
+
+def test_conditional_cache_refreshes_changed_responses(tmp_path) -> None:
+    listing = [{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}]
+    client, _ = _client(
+        {
+            FIRST_PAGE_URL: FakeResponse(listing, headers={"ETag": '"list-1"'}),
+            _lang_url("alpha"): FakeResponse({"Python": 10}, headers={"ETag": '"alpha-1"'}),
+        },
+        max_workers=1,
+        cache_dir=str(tmp_path),
+    )
+    client.fetch_language_stats()
+
+    refreshed, _ = _client(
+        {
+            FIRST_PAGE_URL: FakeResponse(None, status_code=304),
+            _lang_url("alpha"): FakeResponse({"Go": 10}, headers={"ETag": '"alpha-2"'}),
+        },
+        max_workers=1,
+        cache_dir=str(tmp_path),
+    )
+
+    assert refreshed.fetch_language_stats().to_tuples() == [("Go", 100.0)]
+    assert refreshed._cache.get(_lang_url("alpha")).etag == '"alpha-2"'
+
+
+def test_rate_limit_headers_are_reported_in_run_metrics() -> None:
+    quota_headers = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4321", "X-RateLimit-Reset": "4102444800"}
+    routes = {
+        FIRST_PAGE_URL: FakeResponse(
+            [{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}], headers=quota_headers
+        ),
+        _lang_url("alpha"): FakeResponse({"Python": 1}, headers=quota_headers),
+    }
+    client, _ = _client(routes, max_workers=1)
+
+    client.fetch_language_stats()
+
+    assert client.run_metrics() == {
+        "skipped_repos": 0,
+        "prefiltered_repos": {},
+        "requests_saved": 0,
+        "retries": 0,
+        "circuit_breaker_trips": 0,
+        "circuit_breaker_rejections": 0,
+        "rate_limit_remaining": 4321,
+        "rate_limit_limit": 5000,
+        "rate_limit_reset": 4102444800,
+    }
+
+
+def test_exhausted_rate_limit_fails_instead_of_dropping_repos() -> None:
+    exhausted = {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4102444800"}
+    routes = {
+        FIRST_PAGE_URL: FakeResponse([{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}]),
+        _lang_url("alpha"): FakeResponse({"message": "API rate limit exceeded"}, status_code=403, headers=exhausted),
+    }
+    client, session = _client(routes, max_workers=1)
+
+    with pytest.raises(RateLimitExceededError):
+        client.fetch_language_stats()
+    assert session.calls.count(_lang_url("alpha")) == 1
+
+
+def test_failed_repos_are_counted_as_skipped() -> None:
+    client, _ = _client(_routes(), max_workers=1)
+
+    client.fetch_language_stats()
+
+    metrics = client.run_metrics()
+    assert metrics["skipped_repos"] == 2
+    assert metrics["retries"] == 4
+
+
+def test_undecodable_or_non_map_language_bodies_are_skipped() -> None:
+    class UndecodableResponse(FakeResponse):
+        def json(self):
+            raise TransportDecodeError("Invalid JSON")
+
+    routes = _routes()
+    routes[_lang_url("broken")] = UndecodableResponse(None)
+    routes[_lang_url("gone")] = FakeResponse(["not", "a", "map"])
+    client, _ = _client(routes, max_workers=1)
+
+    stats = client.fetch_language_stats()
+
+    assert {stat.name for stat in stats} == {"Python", "Rust", "Go"}
+    assert client.run_metrics()["skipped_repos"] == 2
+
+
+def test_unfollowed_redirect_is_not_taken_as_a_language_map() -> None:
+    routes = _routes()
+    routes[_lang_url("broken")] = FakeResponse(
+        {"message": "Moved Permanently", "url": _lang_url("renamed")}, status_code=301
+    )
+    client, _ = _client(routes, max_workers=1)
+
+    stats = client.fetch_language_stats()
+
+    assert "message" not in {stat.name for stat in stats}
+    assert client.run_metrics()["skipped_repos"] == 2
+
+
+def test_responses_are_closed_before_retrying() -> None:
+    class ClosingResponse(FakeResponse):
+        closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    failures = [
+        ClosingResponse({}, status_code=502),
+        ClosingResponse({"message": "API rate limit exceeded"}, status_code=403,
+                        headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}),
+    ]
+    served = iter([*failures, FakeResponse({"Python": 10})])
+    routes = {
+        FIRST_PAGE_URL: FakeResponse([{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}]),
+        _lang_url("alpha"): lambda: next(served),
+    }
+    client, _ = _client(routes, max_workers=1, tokens=["spare"], retry_policy=RetryPolicy(max_attempts=3))
+
+    client.fetch_language_stats()
+
+    assert all(response.closed for response in failures)
+
+
+def test_describe_metrics_summarizes_the_run() -> None:
+    client, _ = _client({})
+
+    lines = client.describe_metrics({
+        "rate_limit_remaining": 12,
+        "rate_limit_limit": 5000,
+        "requests_saved": 5,
+        "prefiltered_repos": {"empty": 2, "archived": 1},
+        "snapshots_reused": 2,
+        "skipped_repos": 0,
+    })
+
+    assert lines == [
+        "API budget remaining: 12/5000",
+        "Saved 5 per-repo requests (empty=2, archived=1, snapshots=2).",
+    ]
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) - 5)},
+        {"X-RateLimit-Remaining": "0"},
+    ],
+    ids=["reset-in-the-past", "missing-quota-headers"],
+)
+def test_exhausted_quota_is_retried_a_bounded_number_of_times(headers: dict) -> None:
+    routes = {
+        FIRST_PAGE_URL: FakeResponse({"message": "API rate limit exceeded"}, status_code=403, headers=headers),
+    }
+    client, session = _client(routes, max_workers=1, rate_limit_wait=5,
+                              retry_policy=RetryPolicy(max_attempts=3))
+    sleeps = []
+    client._sleep = sleeps.append
+
+    with pytest.raises(RateLimitExceededError):
+        client.fetch_language_stats()
+
+    if "X-RateLimit-Reset" in headers:
+        assert len(session.calls) == 3
+        assert sleeps == [pytest.approx(GitHubClient.RATE_LIMIT_RESET_MARGIN)] * 2
+    else:
+        assert len(session.calls) == 1
+        assert sleeps == []
+
+
+def test_quota_failover_releases_a_half_open_trial() -> None:
+    exhausted = {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4102444800"}
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    routes = {
+        FIRST_PAGE_URL: FakeResponse({"message": "API rate limit exceeded"}, status_code=403, headers=exhausted),
+    }
+    client, _ = _client(routes, max_workers=1, circuit_breaker=breaker)
+
+    with pytest.raises(RateLimitExceededError):
+        client.fetch_language_stats()
+
+    breaker.before_request()  # A new trial is admitted
+
+
+def test_token_pool_fails_over_when_a_token_is_exhausted() -> None:
+    exhausted = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4102444800"}
+    healthy = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "4102444800"}
+
+    class TokenAwareSession(FakeSession):
+        def get(self, url, params=None, headers=None, **kwargs):
+            response = super().get(url, params=params, headers=headers, **kwargs)
+            if headers and headers.get("Authorization") == "token first":
+                return FakeResponse({"message": "rate limited"}, status_code=403, headers=exhausted)
+            response.headers = healthy
+            return response
+
+    client = GitHubClient(token="first", tokens=["second"], username="octocat", max_workers=1)
+    client._transport = TokenAwareSession(
+        {
+            FIRST_PAGE_URL: FakeResponse([{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}]),
+            _lang_url("alpha"): FakeResponse({"Python": 5}),
+        }
+    )
+
+    assert client.fetch_language_stats().to_tuples() == [("Python", 100.0)]
+    assert [headers["Authorization"] for headers in client._transport.sent_headers.values()] == [
+        "token second",
+        "token second",
+    ]
+
+
+def test_transient_failures_are_retried_with_backoff() -> None:
+    attempts = iter(
+        [
+            TransportConnectionError("reset"),
+            FakeResponse({}, status_code=502),
+            FakeResponse({"Python": 5}),
+        ]
+    )
+
+    def flaky() -> FakeResponse:
+        outcome = next(attempts)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    routes = {
+        FIRST_PAGE_URL: FakeResponse([{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}]),
+        _lang_url("alpha"): flaky,
+    }
+    client, session = _client(routes, max_workers=1)
+    delays: list[float] = []
+    client._sleep = delays.append
+
+    assert client.fetch_language_stats().to_tuples() == [("Python", 100.0)]
+    assert session.calls.count(_lang_url("alpha")) == 3
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 0.5 and 0 <= delays[1] <= 1.0
+    assert client.run_metrics()["retries"] == 2
+
+
+def test_secondary_rate_limit_honors_retry_after() -> None:
+    attempts = iter(
+        [
+            FakeResponse({"message": "secondary rate limit"}, status_code=403, headers={"Retry-After": "7"}),
+            FakeResponse({"Go": 1}),
+        ]
+    )
+    routes = {
+        FIRST_PAGE_URL: FakeResponse([{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}]),
+        _lang_url("alpha"): lambda: next(attempts),
+    }
+    client, _ = _client(routes, max_workers=1)
+    delays: list[float] = []
+    client._sleep = delays.append
+
+    assert client.fetch_language_stats().to_tuples() == [("Go", 100.0)]
+    assert delays == [7.0]
+
+
+def test_circuit_breaker_fails_fast_when_api_is_down() -> None:
+    repos = [{"name": f"r{i}", "fork": False, "languages_url": _lang_url(f"r{i}")} for i in range(10)]
+    routes = {FIRST_PAGE_URL: FakeResponse(repos)}
+    routes.update({_lang_url(f"r{i}"): TransportTimeout("timed out") for i in range(10)})
+    client, session = _client(
+        routes,
+        max_workers=1,
+        retry_policy=RetryPolicy(max_attempts=2),
+        circuit_breaker=CircuitBreaker(failure_threshold=4, reset_timeout=60),
+    )
+
+    with pytest.raises(CircuitOpenError):
+        client.fetch_language_stats()
+
+    assert len(session.calls) == 1 + 4
+    metrics = client.run_metrics()
+    assert metrics["circuit_breaker_trips"] == 1
+    assert metrics["circuit_breaker_rejections"] == 1
+
+
+def test_every_request_carries_the_configured_timeout() -> None:
+    timeouts: list = []
+
+    class RecordingSession(FakeSession):
+        def get(self, url, params=None, headers=None, **kwargs):
+            timeouts.append(kwargs.get("timeout"))
+            return super().get(url, params=params, headers=headers)
+
+    client = GitHubClient(token="token", username="octocat", max_workers=1, timeout=(2.0, 7.0))
+    client._transport = RecordingSession(
+        {
+            FIRST_PAGE_URL: FakeResponse([{"name": "alpha", "fork": False, "languages_url": _lang_url("alpha")}]),
+            _lang_url("alpha"): FakeResponse({"Python": 5}),
+        }
+    )
+
+    client.fetch_language_stats()
+
+    assert timeouts == [(2.0, 7.0), (2.0, 7.0)]
+
+
+def test_hedged_language_requests_report_metrics() -> None:
+    client, session = _client(_routes(), max_workers=2, hedge=True)
+
+    stats = client.fetch_language_stats()
+
+    assert [name for name, _ in stats.to_tuples()] == ["Python", "Rust", "Go"]
+    metrics = client.run_metrics()
+    assert metrics["hedged_requests"] == 0
+    assert metrics["skipped_repos"] == 2
+    client.close()
+
+
+def _snapshot_routes(alpha_pushed_at: str) -> dict:
+    return {
+        FIRST_PAGE_URL: FakeResponse(
+            [
+                {"id": 1, "name": "alpha", "fork": False, "languages_url": _lang_url("alpha"),
+                 "pushed_at": alpha_pushed_at, "size": 10},
+                {"id": 2, "name": "beta", "fork": False, "languages_url": _lang_url("beta"),
+                 "pushed_at": "2024-01-01T00:00:00Z", "size": 20},
+            ]
+        ),
+        _lang_url("alpha"): FakeResponse({"Python": 300}),
+        _lang_url("beta"): FakeResponse({"Go": 100}),
+    }
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_snapshots_refetch_only_changed_repos(tmp_path, max_workers: int) -> None:
+    first, _ = _client(_snapshot_routes("2024-01-01T00:00:00Z"), max_workers=max_workers,
+                       cache_dir=str(tmp_path))
+    first.fetch_language_stats()
+    first.close()
+
+    routes = _snapshot_routes("2024-06-01T00:00:00Z")
+    routes[_lang_url("alpha")] = FakeResponse({"Python": 100})
+    second, session = _client(routes, max_workers=max_workers, cache_dir=str(tmp_path))
+
+    assert second.fetch_language_stats().to_tuples() == [("Python", 50.0), ("Go", 50.0)]
+    assert _lang_url("beta") not in session.calls
+    assert session.calls.count(_lang_url("alpha")) == 1
+    metrics = second.run_metrics()
+    assert (metrics["snapshots_reused"], metrics["snapshots_refreshed"]) == (1, 1)
+    second.close()
+
+
+def test_snapshots_drop_repos_missing_from_listing(tmp_path) -> None:
+    first, _ = _client(_snapshot_routes("2024-01-01T00:00:00Z"), max_workers=1, cache_dir=str(tmp_path))
+    first.fetch_language_stats()
+    first.close()
+
+    routes = _snapshot_routes("2024-01-01T00:00:00Z")
+    routes[FIRST_PAGE_URL] = FakeResponse(routes[FIRST_PAGE_URL].json()[1:])
+    second, session = _client(routes, max_workers=1, cache_dir=str(tmp_path))
+
+    assert second.fetch_language_stats().to_tuples() == [("Go", 100.0)]
+    assert session.calls == [FIRST_PAGE_URL]
+    second.close()
+    snapshot = (tmp_path / "snapshots" / "octocat.json").read_text()
+    assert '"1"' not in snapshot and '"2"' in snapshot
+
+
+def test_prefilter_skips_requests_and_reports_savings() -> None:
+    routes = {
+        FIRST_PAGE_URL: FakeResponse(
+            [
+                {"name": "alpha", "fork": False, "languages_url": _lang_url("alpha"), "size": 10},
+                {"name": "empty", "fork": False, "languages_url": _lang_url("empty"), "size": 0},
+                {"name": "old", "fork": False, "languages_url": _lang_url("old"), "size": 5, "archived": True},
+            ]
+        ),
+        _lang_url("alpha"): FakeResponse({"Python": 5}),
+    }
+    client, session = _client(routes, max_workers=1, prefilter=RepoPrefilter(skip=("empty", "archived")))
+
+    assert client.fetch_language_stats().to_tuples() == [("Python", 100.0)]
+    assert session.calls == [FIRST_PAGE_URL, _lang_url("alpha")]
+    metrics = client.run_metrics()
+    assert metrics["requests_saved"] == 2
+    assert metrics["prefiltered_repos"] == {"empty": 1, "archived": 1}
+
+
+def test_approximate_backend_uses_only_the_listing(tmp_path) -> None:
+    listing = [
+        {"id": 1, "name": "alpha", "fork": False, "languages_url": _lang_url("alpha"),
+         "language": "Python", "size": 3, "pushed_at": "2024-01-01T00:00:00Z"},
+        {"id": 2, "name": "beta", "fork": False, "languages_url": _lang_url("beta"),
+         "language": "Go", "size": 1, "pushed_at": "2024-01-01T00:00:00Z"},
+        {"id": 3, "name": "forked", "fork": True, "languages_url": _lang_url("forked"),
+         "language": "Java", "size": 50},
+    ]
+    exact, _ = _client(
+        {FIRST_PAGE_URL: FakeResponse(listing), _lang_url("alpha"): FakeResponse({"Python": 100}),
+         _lang_url("beta"): FakeResponse({"Go": 100})},
+        max_workers=1,
+        cache_dir=str(tmp_path),
+    )
+    exact.fetch_language_stats()
+    exact.close()
+
+    client, session = _client(
+        {FIRST_PAGE_URL: FakeResponse(listing)}, max_workers=1, backend="approximate", cache_dir=str(tmp_path)
+    )
+
+    assert client.fetch_language_stats().to_tuples() == [("Python", 75.0), ("Go", 25.0)]
+    assert session.calls == [FIRST_PAGE_URL]
+    metrics = client.run_metrics()
+    assert metrics["approximation_error"] == 25.0
+    assert metrics["approximation_sample"] == 2
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_request_budget_queries_largest_repos_and_extrapolates_the_rest(max_workers: int) -> None:
+    listing = [
+        {"name": "small", "fork": False, "languages_url": _lang_url("small"), "language": "Go", "size": 1},
+        {"name": "big", "fork": False, "languages_url": _lang_url("big"), "language": "Python", "size": 4},
+        {"name": "mid", "fork": False, "languages_url": _lang_url("mid"), "language": "Rust", "size": 2},
+    ]
+    routes = {
+        FIRST_PAGE_URL: FakeResponse(listing),
+        _lang_url("big"): FakeResponse({"Python": 300, "Shell": 100}),
+        _lang_url("mid"): FakeResponse({"Rust": 200}),
+        _lang_url("small"): FakeResponse({"Go": 100}),
+    }
+    client, session = _client(routes, max_workers=max_workers, max_requests=2)
+
+    stats = client.fetch_language_stats()
+
+    assert _lang_url("small") not in session.calls
+    # 600 bytes over 6 KB measured, so the 1 KB Go repo is estimated at 100 bytes.
+    assert {stat.name: stat.bytes for stat in stats} == {"Python": 300, "Rust": 200, "Shell": 100, "Go": 100}
+    assert client.run_metrics()["extrapolated_repos"] == 1
+
+
+def test_listing_is_streamed_into_compact_records(tmp_path) -> None:
+    full_entry = {
+        "id": 7,
+        "name": "alpha",
+        "full_name": "octocat/alpha",
+        "fork": False,
+        "languages_url": _lang_url("alpha"),
+        "size": 12,
+        "pushed_at": "2024-01-01T00:00:00Z",
+        "owner": {"login": "octocat", "id": 1},
+        "license": {"key": "mit"},
+        "description": "x" * 500,
+    }
+    routes = {FIRST_PAGE_URL: FakeResponse([full_entry], headers={"ETag": '"v1"'})}
+    client, _ = _client(routes, max_workers=1, cache_dir=str(tmp_path))
+
+    (record,) = client._fetch_user_repos("octocat")
+
+    assert record == RepoRecord(
+        id=7, name="alpha", full_name="octocat/alpha", languages_url=_lang_url("alpha"),
+        size=12, pushed_at="2024-01-01T00:00:00Z",
+    )
+    cached = next((tmp_path / "http").glob("*.json")).read_text()
+    assert "owner" not in cached and "description" not in cached
+
+    client._transport = FakeSession({FIRST_PAGE_URL: FakeResponse(None, status_code=304)})
+    assert client._fetch_user_repos("octocat") == [record]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_orgs_and_accounts_are_aggregated_without_double_counting(max_workers: int) -> None:
+    org_repos = "https://api.github.com/orgs/acme/repos"
+    shared = {"id": 1, "name": "shared", "fork": False, "languages_url": _lang_url("shared")}
+    routes = {
+        FIRST_PAGE_URL: FakeResponse([shared]),
+        f"{org_repos}?per_page=100&type=sources": FakeResponse(
+            [shared, {"id": 2, "name": "tool", "fork": False, "languages_url": _lang_url("tool")}]
+        ),
+        "https://api.github.com/users/hubot/repos?per_page=100&type=owner": FakeResponse(
+            [{"id": 3, "name": "bot", "fork": False, "languages_url": _lang_url("bot")}]
+        ),
+        _lang_url("shared"): FakeResponse({"Python": 100}),
+        _lang_url("tool"): FakeResponse({"Go": 100}),
+        _lang_url("bot"): FakeResponse({"Rust": 200}),
+    }
+    client, session = _client(routes, max_workers=max_workers)
+
+    stats = client.fetch_language_stats(orgs=["acme"], accounts=["hubot"])
+
+    assert {stat.name: stat.bytes for stat in stats} == {"Rust": 200, "Python": 100, "Go": 100}
+    assert session.calls.count(_lang_url("shared")) == 1
+    assert client.run_metrics()["duplicate_repos"] == 1
+
+
+def test_graphql_backend_rejects_orgs() -> None:
+    client, _ = _client({}, backend="graphql")
+
+    with pytest.raises(ValueError):
+        client.fetch_language_stats(orgs=["acme"])
+
+
+EVENTS_URL = f"{USER_URL}/events"
+
+
+def _push_event(event_id: int, repo_id: int, name: str, event_type: str = "PushEvent") -> dict:
+    return {"id": str(event_id), "type": event_type, "created_at": "2024-06-01T00:00:00Z",
+            "repo": {"id": repo_id, "name": f"octocat/{name}"}}
+
+
+def test_event_refresh_patches_only_pushed_repos(tmp_path) -> None:
+    routes = _snapshot_routes("2024-01-01T00:00:00Z")
+    routes[EVENTS_URL] = FakeResponse([_push_event(5, 2, "beta")], headers={"ETag": '"e1"'})
+    first, _ = _client(routes, max_workers=1, cache_dir=str(tmp_path), refresh="events")
+    assert first.fetch_language_stats().to_tuples() == [("Python", 75.0), ("Go", 25.0)]
+    assert first.run_metrics()["event_refresh"] == "listing"
+    first.close()
+
+    unchanged, session = _client({EVENTS_URL: FakeResponse(None, status_code=304)},
+                                 max_workers=1, cache_dir=str(tmp_path), refresh="events")
+    assert unchanged.fetch_language_stats().to_tuples() == [("Python", 75.0), ("Go", 25.0)]
+    assert session.calls == [f"{EVENTS_URL}?per_page=100"]
+    assert session.sent_headers[session.calls[0]]["If-None-Match"] == '"e1"'
+    assert unchanged.run_metrics()["event_refresh"] == "not_modified"
+    unchanged.close()
+
+    routes = {
+        EVENTS_URL: FakeResponse(
+            [_push_event(7, 2, "beta"), _push_event(6, 9, "beta", "WatchEvent"), _push_event(5, 2, "beta")],
+            headers={"ETag": '"e2"'},
+        ),
+        _lang_url("beta"): FakeResponse({"Go": 900}),
+    }
+    patched, session = _client(routes, max_workers=1, cache_dir=str(tmp_path), refresh="events")
+    assert patched.fetch_language_stats().to_tuples() == [("Go", 75.0), ("Python", 25.0)]
+    assert session.calls == [f"{EVENTS_URL}?per_page=100", _lang_url("beta")]
+    metrics = patched.run_metrics()
+    assert (metrics["event_refresh"], metrics["patched_repos"]) == ("patched", 1)
+    patched.close()
+
+
+def test_event_refresh_falls_back_to_listing_when_events_were_missed(tmp_path) -> None:
+    routes = _snapshot_routes("2024-01-01T00:00:00Z")
+    routes[EVENTS_URL] = FakeResponse([_push_event(5, 2, "beta")])
+    first, _ = _client(routes, max_workers=1, cache_dir=str(tmp_path), refresh="events")
+    first.fetch_language_stats()
+    first.close()
+
+    routes = _snapshot_routes("2024-06-01T00:00:00Z")
+    routes[EVENTS_URL] = FakeResponse([_push_event(9, 1, "alpha")])
+    routes[_lang_url("alpha")] = FakeResponse({"Python": 100})
+    second, session = _client(routes, max_workers=1, cache_dir=str(tmp_path), refresh="events")
+
+    assert second.fetch_language_stats().to_tuples() == [("Python", 50.0), ("Go", 50.0)]
+    assert FIRST_PAGE_URL in session.calls
+    assert second.run_metrics()["event_refresh"] == "listing"
+
+
+def test_event_refresh_requires_cache_dir() -> None:
+    with pytest.raises(ValueError):
+        GitHubClient(token="token", refresh="events")
+
+
+def _push_payload(repo_id: int, name: str) -> dict:
+    return {
+        "ref": "refs/heads/main",
+        "repository": {"id": repo_id, "name": name, "full_name": f"octocat/{name}",
+                       "owner": {"login": "octocat"}, "default_branch": "main",
+                       "size": 30, "pushed_at": 1717200000},
+    }
+
+
+def test_webhook_refetches_only_the_pushed_repo(tmp_path) -> None:
+    first, _ = _client(_snapshot_routes("2024-01-01T00:00:00Z"), max_workers=1, cache_dir=str(tmp_path))
+    first.fetch_language_stats()
+    first.close()
+
+    client, session = _client({_lang_url("beta"): FakeResponse({"Go": 900})},
+                              max_workers=1, cache_dir=str(tmp_path))
+    stats = client.apply_webhook("push", _push_payload(2, "beta"))
+
+    assert stats.to_tuples() == [("Go", 75.0), ("Python", 25.0)]
+    assert session.calls == [_lang_url("beta")]
+    assert client.run_metrics()["webhook_update"] == "refreshed"
+    client.close()
+
+    deleted, session = _client({}, max_workers=1, cache_dir=str(tmp_path))
+    payload = {"action": "deleted", **_push_payload(2, "beta")}
+    assert deleted.apply_webhook("repository", payload).to_tuples() == [("Python", 100.0)]
+    assert session.calls == []
+
+
+def test_webhook_without_size_patches_the_snapshot(tmp_path) -> None:
+    first, _ = _client(_snapshot_routes("2024-01-01T00:00:00Z"), max_workers=1, cache_dir=str(tmp_path))
+    first.fetch_language_stats()
+    first.close()
+
+    client, session = _client({_lang_url("beta"): FakeResponse({"Go": 900})},
+                              max_workers=1, cache_dir=str(tmp_path))
+    payload = _push_payload(2, "beta")
+    del payload["repository"]["size"]
+
+    assert client.apply_webhook("push", payload).to_tuples() == [("Go", 75.0), ("Python", 25.0)]
+    assert client.run_metrics()["webhook_update"] == "refreshed"
+    client.close()
+
+    undated, session = _client({_lang_url("beta"): FakeResponse({"Go": 1})},
+                               max_workers=1, cache_dir=str(tmp_path))
+    del payload["repository"]["pushed_at"]
+
+    assert undated.apply_webhook("push", payload) is None
+    assert session.calls == []
+    assert undated.run_metrics()["webhook_update"] == "listing"
+    undated.close()
+
+
+def test_webhook_without_snapshots_asks_for_a_full_listing(tmp_path) -> None:
+    client, session = _client({}, max_workers=1, cache_dir=str(tmp_path))
+
+    assert client.apply_webhook("push", _push_payload(2, "beta")) is None
+    assert client.apply_webhook("schedule", {}) is None
+    assert session.calls == []
+    assert client.run_metrics()["webhook_update"] == "listing"
+
+
+def test_open_tarball_leaves_redirects_to_the_transport() -> None:
+    codeload = "https://codeload.github.com/octocat/alpha/legacy.tar.gz/main"
+    routes = {
+        "https://api.github.com/repos/octocat/alpha/tarball": FakeResponse(
+            None, status_code=302, headers={"Location": codeload}
+        ),
+        codeload: FakeResponse({"tar": "bytes"}),
+    }
+    client, session = _client(routes)
+
+    # The token-carrying client never sends a hop to the download host itself.
+    with pytest.raises(HTTPStatusError, match="302"):
+        client.open_tarball("octocat/alpha")
+    assert session.calls == ["https://api.github.com/repos/octocat/alpha/tarball"]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from repo.features.languages.infrastructure import GitHubAPIError, GitHubClient
+
+PAGES = {
+    None: {
+        "data": {
+            "user": {
+                "repositories": {
+                    "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                    "nodes": [
+                        {"languages": {"edges": [
+                            {"size": 600, "node": {"name": "Python"}},
+                            {"size": 100, "node": {"name": "Rust"}},
+                        ]}},
+                        {"languages": {"edges": []}},
+                    ],
+                }
+            }
+        }
+    },
+    "c1": {
+        "data": {
+            "user": {
+                "repositories": {
+                    "pageInfo": {"hasNextPage": False, "endCursor": "c2"},
+                    "nodes": [
+                        {"languages": {"edges": [
+                            {"size": 200, "node": {"name": "Python"}},
+                            {"size": 100, "node": {"name": "Go"}},
+                        ]}},
+                    ],
+                }
+            }
+        }
+    },
+}
+
+
+class _StandInGraphQL(BaseHTTPRequestHandler):
+    requests_seen: list = []
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests_seen.append((self.headers.get("Authorization"), body))
+        login = body["variables"]["login"]
+        if login == "ghost":
+            payload = {"data": {"user": None}, "errors": [{"message": "Could not resolve to a User"}]}
+        else:
+            payload = PAGES[body["variables"]["cursor"]]
+        encoded = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+@pytest.fixture
+def graphql_url() -> Iterator[str]:
+    _StandInGraphQL.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInGraphQL)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/graphql"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize("transport", ["requests", "stdlib"])
+def test_graphql_backend_pages_through_repositories(graphql_url: str, transport: str) -> None:
+    with GitHubClient(token="secret", backend="graphql", graphql_url=graphql_url, transport=transport) as client:
+        stats = client.fetch_language_stats("octocat")
+
+    assert [(stat.name, stat.bytes) for stat in stats] == [("Python", 800), ("Rust", 100), ("Go", 100)]
+    assert [body["variables"]["cursor"] for _, body in _StandInGraphQL.requests_seen] == [None, "c1"]
+    assert all(auth == "token secret" for auth, _ in _StandInGraphQL.requests_seen)
+    assert "isFork: false" in _StandInGraphQL.requests_seen[0][1]["query"]
+
+
+def test_graphql_backend_matches_rest_aggregation(graphql_url: str) -> None:
+    with GitHubClient(token="secret", backend="graphql", graphql_url=graphql_url) as client:
+        graphql_stats = client.fetch_language_stats("octocat")
+    rest_stats = GitHubClient(token="secret")._calculate_percentages(
+        {"Python": 800, "Rust": 100, "Go": 100}
+    )
+
+    assert graphql_stats.to_tuples() == [(s.name, s.percentage) for s in rest_stats]
+
+
+def test_graphql_backend_surfaces_api_errors(graphql_url: str) -> None:
+    with GitHubClient(token="secret", backend="graphql", graphql_url=graphql_url) as client:
+        with pytest.raises(GitHubAPIError, match="Could not resolve"):
+            client.fetch_language_stats("ghost")
+
+
+def test_graphql_backend_requires_token() -> None:
+    with GitHubClient(backend="graphql") as client:
+        with pytest.raises(GitHubAPIError):
+            client.fetch_language_stats("octocat")
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        GitHubClient(token="secret", backend="soap")
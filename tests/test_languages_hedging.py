@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from repo.features.languages.infrastructure.hedging import Hedger, LatencyTracker
+
+
+def _warm_tracker(latency: float, samples: int = 5) -> LatencyTracker:
+    tracker = LatencyTracker(min_samples=samples)
+    for _ in range(samples):
+        tracker.record(latency)
+    return tracker
+
+
+def test_percentile_needs_enough_samples() -> None:
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record(1.0)
+    tracker.record(2.0)
+    assert tracker.percentile(0.95) is None
+
+    tracker.record(3.0)
+    assert tracker.percentile(0.95) == 3.0
+    assert tracker.percentile(0.5) == 2.0
+
+
+def test_slow_call_is_hedged_and_first_result_wins() -> None:
+    hedger = Hedger(max_workers=1, tracker=_warm_tracker(0.01))
+    release = threading.Event()
+    calls = iter(["slow", "fast"])
+
+    def fetch() -> str:
+        if next(calls) == "slow":
+            release.wait(timeout=5)
+            return "slow"
+        return "fast"
+
+    try:
+        assert hedger.call(fetch) == "fast"
+        assert (hedger.hedged, hedger.hedge_wins) == (1, 1)
+    finally:
+        release.set()
+        hedger.shutdown()
+
+
+def test_fast_call_is_not_hedged() -> None:
+    hedger = Hedger(max_workers=1, tracker=_warm_tracker(5.0))
+    try:
+        assert hedger.call(lambda: 42) == 42
+        assert hedger.hedged == 0
+    finally:
+        hedger.shutdown()
+
+
+def test_error_is_raised_when_both_attempts_fail() -> None:
+    hedger = Hedger(max_workers=1, tracker=_warm_tracker(0.0))
+
+    def fail() -> None:
+        threading.Event().wait(0.05)
+        raise RuntimeError("down")
+
+    try:
+        with pytest.raises(RuntimeError, match="down"):
+            hedger.call(fail)
+    finally:
+        hedger.shutdown()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+
+from repo.features.languages.domain import LanguageStat, StatsCollection
+from repo.features.languages.infrastructure import GitHubAPIError
+from repo.features.languages.legacy import fetcher
+
+
+class FakeClient:
+    instances: list["FakeClient"] = []
+
+    def __init__(self, outcome, **kwargs) -> None:
+        self.outcome = outcome
+        self.kwargs = kwargs
+        self.closed = False
+        FakeClient.instances.append(self)
+
+    def fetch_language_stats(self, username: str) -> StatsCollection:
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    def __enter__(self) -> "FakeClient":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.closed = True
+
+
+def _install(monkeypatch, outcome) -> None:
+    FakeClient.instances = []
+    monkeypatch.setattr(fetcher, "GitHubClient", lambda **kwargs: FakeClient(outcome, **kwargs))
+
+
+def _stats(language_bytes: dict) -> StatsCollection:
+    total = sum(language_bytes.values())
+    return StatsCollection(
+        [LanguageStat(name=name, percentage=size / total * 100, bytes=size) for name, size in language_bytes.items()]
+    )
+
+
+def test_legacy_fetch_uses_pooled_client_and_keeps_tuple_contract(monkeypatch) -> None:
+    _install(
+        monkeypatch,
+        _stats({"Python": 500, "JavaScript": 1000, "Go": 200, "Rust": 200, "C": 50, "Zig": 25, "Lua": 25}),
+    )
+
+    with pytest.warns(DeprecationWarning):
+        stats = fetcher.fetch_language_stats("octocat", "token")
+
+    assert [name for name, _ in stats] == ["Python", "Go", "Rust", "C", "Zig"]
+    assert stats[0] == ("Python", 50.0)
+    (client,) = FakeClient.instances
+    assert client.kwargs["token"] == "token" and client.closed
+
+
+def test_legacy_fetch_returns_empty_list_on_api_errors(monkeypatch) -> None:
+    _install(monkeypatch, GitHubAPIError("Not Found"))
+
+    with pytest.warns(DeprecationWarning):
+        assert fetcher.fetch_language_stats("ghost", "token") == []
+
+
+def test_legacy_fetch_tuning_options_are_keyword_only() -> None:
+    with pytest.raises(TypeError):
+        fetcher.fetch_language_stats("octocat", "token", 4)
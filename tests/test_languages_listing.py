@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from repo.features.languages.infrastructure.listing import RepoRecord, iter_json_array
+
+
+def _chunks(text: str, size: int) -> list[bytes]:
+    body = text.encode("utf-8")
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 10_000])
+def test_iter_json_array_matches_json_loads(chunk_size: int) -> None:
+    payload = [{"name": "ünïcode", "size": 12345, "nested": {"list": [1, 2]}}, 42, "s", None, 3.5]
+    text = json.dumps(payload, indent=1, ensure_ascii=False)
+
+    assert list(iter_json_array(_chunks(text, chunk_size))) == payload
+
+
+def test_iter_json_array_handles_empty_arrays() -> None:
+    assert list(iter_json_array([b" [ ", b" ]"])) == []
+
+
+@pytest.mark.parametrize("text", ['{"message": "Not Found"}', '[{"a": 1},', '[{"a": '])
+def test_iter_json_array_rejects_malformed_bodies(text: str) -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_array(_chunks(text, 4)))
+
+
+def test_repo_record_projects_fields_and_supports_get() -> None:
+    record = RepoRecord.from_json({"name": "alpha", "size": 3, "owner": {"login": "x"}, "language": None})
+
+    assert record.get("name") == "alpha"
+    assert record.get("size") == 3
+    assert record.get("owner") is None
+    assert record.get("language", "unset") is None
+    assert record.fork is False
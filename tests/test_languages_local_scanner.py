@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from repo.features.languages.infrastructure import LocalRepoScanner
+from repo.features.languages.infrastructure.gitignore import GitIgnore
+
+
+def _write(root, path: str, content: str) -> None:
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content)
+
+
+def _checkout(root) -> None:
+    _write(root, "src/app.py", "x" * 300)
+    _write(root, "src/lib/util.go", "y" * 100)
+    _write(root, "bin/run", "#!/usr/bin/env bash\necho hi\n")
+    _write(root, "README.md", "z" * 5000)
+    _write(root, "node_modules/dep/index.js", "v" * 5000)
+    _write(root, ".git/objects/blob.py", "g" * 5000)
+    _write(root, "web/app.min.js", "m" * 5000)
+    _write(root, "api/service_pb2.py", "p" * 5000)
+    _write(root, "gen/models.go", "// Code generated by tool. DO NOT EDIT.\n" + "q" * 5000)
+    _write(root, "build/out.py", "b" * 5000)
+    _write(root, "logs/keep.py", "k" * 50)
+    _write(root, ".gitignore", "build/\nlogs/*\n!logs/keep.py\n")
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_scanner_counts_bytes_and_skips_vendored_generated_and_ignored_files(tmp_path, max_workers: int) -> None:
+    _checkout(tmp_path)
+
+    stats = LocalRepoScanner([str(tmp_path)], max_workers=max_workers).fetch_language_stats()
+
+    assert {stat.name: stat.bytes for stat in stats} == {"Python": 350, "Go": 100, "Shell": 28}
+
+
+def test_rescan_reads_only_changed_files(tmp_path) -> None:
+    checkout = tmp_path / "checkout"
+    _checkout(checkout)
+    index = str(tmp_path / "cache" / "local_index.json")
+    LocalRepoScanner([str(checkout)], index_path=index).fetch_language_stats()
+
+    _write(checkout, "src/app.py", "x" * 600)
+    os.utime(checkout / "src/app.py", ns=(1, 1))
+    scanner = LocalRepoScanner([str(checkout)], index_path=index)
+    stats = scanner.fetch_language_stats()
+
+    assert {stat.name: stat.bytes for stat in stats}["Python"] == 650
+    assert scanner.run_metrics()["files_read"] == 1
+
+
+def test_gitignore_rules_follow_git_semantics() -> None:
+    ignore = GitIgnore().child("", "*.log\n/top.txt\ndocs/**/draft.md\n!keep.log\n").child("sub", "local/\n")
+
+    assert ignore.ignored("a/b/error.log", False)
+    assert not ignore.ignored("a/keep.log", False)
+    assert ignore.ignored("top.txt", False)
+    assert not ignore.ignored("a/top.txt", False)
+    assert ignore.ignored("docs/x/y/draft.md", False)
+    assert ignore.ignored("sub/local", True)
+    assert not ignore.ignored("sub/local", False)
+    assert not ignore.ignored("local", True)
+
+
+def test_scanner_rejects_missing_directories(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        LocalRepoScanner([str(tmp_path / "missing")])
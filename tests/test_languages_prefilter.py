@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from repo.features.languages.infrastructure import RepoPrefilter
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    ("repo", "expected"),
+    [
+        ({"size": 0}, "empty"),
+        ({"size": 10, "archived": True}, "archived"),
+        ({"size": 10, "is_template": True}, "template"),
+        ({"size": 10, "mirror_url": "https://example.com/mirror.git"}, "mirror"),
+        ({"size": 10, "pushed_at": "2020-01-01T00:00:00Z"}, "stale"),
+        ({"size": 10, "pushed_at": "2024-12-01T00:00:00Z"}, None),
+        ({}, None),
+    ],
+)
+def test_prefilter_reports_matching_rule(repo: dict, expected: str | None) -> None:
+    prefilter = RepoPrefilter(skip=("empty", "archived", "template", "mirror"), stale_after_days=365)
+
+    assert prefilter.reason(repo, now=NOW) == expected
+
+
+def test_default_prefilter_only_skips_empty_repos() -> None:
+    prefilter = RepoPrefilter()
+
+    assert prefilter.reason({"size": 0}) == "empty"
+    assert prefilter.reason({"size": 5, "archived": True, "pushed_at": "2001-01-01T00:00:00Z"}) is None
+
+
+def test_unknown_rule_is_rejected() -> None:
+    with pytest.raises(ValueError, match="forks"):
+        RepoPrefilter(skip=("forks",))
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import pytest
+
+from repo.features.languages.infrastructure import RateLimitExceededError
+from repo.features.languages.infrastructure.rate_limit import Quota, RateLimitScheduler
+
+NOW = 1_700_000_000.0
+
+
+def _headers(remaining: int, limit: int = 5000, reset: float = NOW + 600, resource: str = "core") -> dict:
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(reset)),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def _scheduler(**kwargs) -> RateLimitScheduler:
+    kwargs.setdefault("tokens", ["token"])
+    return RateLimitScheduler(8, clock=lambda: NOW, **kwargs)
+
+
+def test_concurrency_shrinks_as_budget_drains() -> None:
+    scheduler = _scheduler()
+    assert scheduler.allowed_concurrency() == 8
+
+    scheduler.update(_headers(remaining=4000))
+    assert scheduler.allowed_concurrency() == 8
+
+    scheduler.update(_headers(remaining=250))
+    assert scheduler.allowed_concurrency() == 4
+
+    scheduler.update(_headers(remaining=1))
+    assert scheduler.allowed_concurrency() == 1
+
+
+def test_quotas_are_tracked_per_resource() -> None:
+    scheduler = _scheduler()
+    scheduler.update(_headers(remaining=10, resource="graphql"))
+
+    assert scheduler.quota("core") is None
+    assert scheduler.quota("graphql").remaining == 10
+
+
+def test_slot_reserves_budget_until_headers_correct_it() -> None:
+    scheduler = _scheduler()
+    scheduler.update(_headers(remaining=100))
+
+    with scheduler.slot():
+        assert scheduler.quota().remaining == 99
+
+
+def test_exhausted_quota_fails_fast_when_reset_is_too_far() -> None:
+    scheduler = _scheduler(max_wait=60)
+    scheduler.update(_headers(remaining=0, reset=NOW + 600))
+
+    with pytest.raises(RateLimitExceededError, match="resets in 600s"):
+        with scheduler.slot():
+            pass
+
+
+def test_passed_reset_lets_one_probe_through_until_headers_confirm_it() -> None:
+    scheduler = _scheduler()
+    scheduler.update(_headers(remaining=0, limit=60, reset=NOW - 1))
+
+    with scheduler.slot():
+        assert scheduler.quota().remaining == 0
+        scheduler.update(_headers(remaining=59, limit=60, reset=NOW + 3600))
+
+    with scheduler.slot():
+        assert scheduler.quota().remaining == 58
+
+
+def test_quota_persists_between_runs(tmp_path) -> None:
+    state_path = tmp_path / "rate_limit.json"
+    first = _scheduler(state_path=str(state_path))
+    first.update(_headers(remaining=42))
+    first.save()
+
+    second = _scheduler(state_path=str(state_path))
+    other_token = RateLimitScheduler(8, tokens=["other"], state_path=str(state_path), clock=lambda: NOW)
+    expired = RateLimitScheduler(8, tokens=["token"], state_path=str(state_path), clock=lambda: NOW + 3600)
+
+    assert second.quota() == Quota(limit=5000, remaining=42, reset=NOW + 600)
+    assert other_token.quota() is None
+    assert expired.quota() is None
+    assert "token" not in state_path.read_text()
+
+
+def test_pool_routes_to_token_with_most_remaining_quota() -> None:
+    scheduler = _scheduler(tokens=["a", "b", "c"])
+    scheduler.update(_headers(remaining=100), token="a")
+    scheduler.update(_headers(remaining=900), token="b")
+    scheduler.update(_headers(remaining=500), token="c")
+
+    with scheduler.slot() as token:
+        assert token == "b"
+
+
+def test_pool_discovers_unknown_tokens_first() -> None:
+    scheduler = _scheduler(tokens=["a", "b"])
+    scheduler.update(_headers(remaining=4999), token="a")
+
+    with scheduler.slot() as token:
+        assert token == "b"
+
+
+def test_exhausted_tokens_are_retired_until_reset() -> None:
+    scheduler = _scheduler(tokens=["a", "b"])
+    scheduler.update(_headers(remaining=0, reset=NOW + 600), token="a")
+    scheduler.update(_headers(remaining=3), token="b")
+
+    for _ in range(3):
+        with scheduler.slot() as token:
+            assert token == "b"
+    with pytest.raises(RateLimitExceededError, match="all 2 token"):
+        with scheduler.slot():
+            pass
+
+
+def test_pool_budget_is_combined_across_tokens() -> None:
+    scheduler = _scheduler(tokens=["a", "b"])
+    scheduler.update(_headers(remaining=300, reset=NOW + 60), token="a")
+    scheduler.update(_headers(remaining=400, reset=NOW + 30), token="b")
+
+    assert scheduler.quota() == Quota(limit=10_000, remaining=700, reset=NOW + 30)
+    assert scheduler.allowed_concurrency() == 6
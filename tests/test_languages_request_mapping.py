@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+
+import pytest
+
 from repo.core.feature_registry import FeatureConfig
 from repo.features.languages.generate_languages import (
     DEFAULT_EXCLUDED_LANGUAGES,
     _build_request_from_env,
     _build_request_from_feature_config,
+    _check_async_support,
+    run_feature_async,
 )
 
 
@@ -21,7 +27,18 @@ def test_build_request_from_feature_config_normalizes_values() -> None:
             "extra_excluded_languages": "go, Rust",
             "min_percentage": "12.5",
             "max_languages": "6",
+            "max_workers": "3",
+            "cache_dir": " .cache/re-po ",
+            "read_timeout": "12.5",
+            "hedge": "true",
+            "prefilter": "Empty, archived",
+            "stale_after_days": "400",
+            "max_requests": "50",
+            "transport": "STDLIB",
+            "orgs": "acme, acme-labs",
+            "accounts": "cute-user, hubot",
         },
+        extra_tokens=["token-456", "token-123", " token-456 "],
     )
 
     request = _build_request_from_feature_config(config)
@@ -33,6 +50,18 @@ def test_build_request_from_feature_config_normalizes_values() -> None:
     assert request.excluded_languages == ("Python", "Go", "Rust")
     assert request.min_percentage == 12.5
     assert request.max_languages == 6
+    assert request.max_workers == 3
+    assert request.cache_dir == ".cache/re-po"
+    assert request.extra_tokens == ("token-456",)
+    assert request.connect_timeout == 5.0
+    assert request.read_timeout == 12.5
+    assert request.hedge is True
+    assert request.prefilter == ("empty", "archived")
+    assert request.stale_after_days == 400
+    assert request.max_requests == 50
+    assert request.transport == "stdlib"
+    assert request.orgs == ("acme", "acme-labs")
+    assert request.accounts == ("hubot",)
 
 
 def test_build_request_from_feature_config_uses_default_exclusions() -> None:
@@ -61,3 +90,66 @@ def test_build_request_from_env_maps_defaults(monkeypatch) -> None:
     assert request.excluded_languages == tuple(DEFAULT_EXCLUDED_LANGUAGES)
     assert request.min_percentage == 9.0
     assert request.max_languages == 4
+    assert request.hedge is False
+    assert request.prefilter == ("empty",)
+    assert request.transport == "requests"
+    assert request.orgs == ()
+    assert request.refresh == "listing"
+
+
+def test_event_refresh_requires_a_cache_dir() -> None:
+    options = {"refresh": "Events", "cache_dir": ".cache/re-po"}
+    request = _build_request_from_feature_config(FeatureConfig(token="x", actor="octocat", options=options))
+    assert request.refresh == "events"
+
+    with pytest.raises(ValueError):
+        _build_request_from_feature_config(
+            FeatureConfig(token="x", actor="octocat", options={"refresh": "events"})
+        )
+
+
+def test_webhook_options_are_mapped() -> None:
+    options = {"cache_dir": ".cache", "webhook_event": " Push ", "webhook_payload": "event.json"}
+    request = _build_request_from_feature_config(FeatureConfig(token="x", actor="octocat", options=options))
+
+    assert (request.webhook_event, request.webhook_payload) == ("push", "event.json")
+    with pytest.raises(ValueError):
+        _build_request_from_feature_config(
+            FeatureConfig(token="x", actor="octocat", options={"webhook_payload": "event.json"})
+        )
+
+
+def test_local_backend_scans_the_workspace_by_default() -> None:
+    config = FeatureConfig(token="x", actor="octocat", options={"backend": "local"})
+
+    assert _build_request_from_feature_config(config).local_paths == (".",)
+
+    config = FeatureConfig(token="x", actor="octocat", options={"backend": "local", "local_paths": "a, b"})
+    assert _build_request_from_feature_config(config).local_paths == ("a", "b")
+
+
+def test_churn_backend_maps_its_window() -> None:
+    options = {"backend": "churn", "churn_days": "90"}
+    request = _build_request_from_feature_config(FeatureConfig(token="x", actor="octocat", options=options))
+
+    assert (request.backend, request.churn_days, request.local_paths) == ("churn", 90, (".",))
+
+
+def test_dump_backend_maps_dump_files_and_cards_dir() -> None:
+    options = {"backend": "dump", "local_paths": "a.jsonl.gz,b.jsonl.gz", "cards_dir": "out"}
+    request = _build_request_from_feature_config(FeatureConfig(token="x", actor="octocat", options=options))
+
+    assert (request.backend, request.local_paths, request.cards_dir) == (
+        "dump", ("a.jsonl.gz", "b.jsonl.gz"), "out"
+    )
+
+
+def test_async_runner_rejects_options_it_cannot_honour() -> None:
+    plain = FeatureConfig(token="x", actor="octocat", options={"max_workers": "4", "max_languages": "5"})
+    _check_async_support(_build_request_from_feature_config(plain))
+
+    options = {"backend": "local", "cache_dir": ".cache"}
+    config = FeatureConfig(token="x", actor="octocat", options=options)
+
+    with pytest.raises(ValueError, match="cache_dir, backend"):
+        asyncio.run(run_feature_async(config))
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from repo.features.languages.infrastructure import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def test_backoff_is_jittered_and_capped() -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+
+    assert policy.delay(1, rand=lambda: 1.0) == 1.0
+    assert policy.delay(3, rand=lambda: 1.0) == 4.0
+    assert policy.delay(10, rand=lambda: 1.0) == 5.0
+    assert policy.delay(3, rand=lambda: 0.25) == 1.0
+
+
+def test_retry_after_is_honored_up_to_its_cap() -> None:
+    policy = RetryPolicy(max_retry_after=30)
+
+    assert policy.delay(1, retry_after="12") == 12.0
+    assert policy.delay(1, retry_after="3600") is None
+
+
+@pytest.mark.parametrize(
+    ("status", "headers", "expected"),
+    [
+        (502, {}, True),
+        (429, {}, True),
+        (403, {"Retry-After": "5"}, True),
+        (403, {}, False),
+        (404, {}, False),
+        (200, {}, False),
+    ],
+)
+def test_should_retry_classifies_responses(status: int, headers: dict, expected: bool) -> None:
+    assert RetryPolicy().should_retry(status, headers) is expected
+
+
+def test_circuit_breaker_opens_then_allows_a_trial_after_timeout() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    now[0] = 11
+    breaker.before_request()  # Trial request
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # Only one trial at a time
+    breaker.record_success()
+    breaker.before_request()
+
+    assert (breaker.trips, breaker.rejected) == (1, 2)
+
+
+def test_failed_trial_reopens_the_circuit() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=lambda: now[0])
+    breaker.record_failure()
+
+    now[0] = 6
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.is_open
+    assert breaker.trips == 2
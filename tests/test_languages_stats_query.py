@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from repo.features.languages.domain import LanguageStat, StatsCollection, StatsQuery
+
+NAMES = ["Python", "Go", "Rust", "C", "Shell", "HTML", "Lua", "Zig"]
+
+
+def _chained(stats, excluded, min_percentage, max_languages):
+    if excluded:
+        stats = stats.exclude_languages(excluded)
+    if min_percentage is not None:
+        stats = stats.filter_by_threshold(min_percentage)
+    if max_languages is not None:
+        stats = stats.limit(max_languages)
+    return stats
+
+
+def _fused(stats, excluded, min_percentage, max_languages):
+    query = StatsQuery(stats)
+    if excluded:
+        query = query.exclude_languages(excluded)
+    if min_percentage is not None:
+        query = query.filter_by_threshold(min_percentage)
+    if max_languages is not None:
+        query = query.limit(max_languages)
+    return query.execute()
+
+
+def _outcome(run, *args):
+    try:
+        return [(stat.name, stat.percentage, stat.bytes) for stat in run(*args)]
+    except ValueError as error:
+        return str(error)
+
+
+def _random_collection(rng: random.Random) -> StatsCollection:
+    names = rng.sample(NAMES, rng.randint(1, len(NAMES)))
+    weights = [rng.choice([1, 1, 5, 40, 333, 1000]) for _ in names]
+    if rng.random() < 0.3:
+        sizes = [0] * len(names)
+    else:
+        # Bytes deliberately disagree with the weights, and some are zero.
+        sizes = [rng.choice([0, 10, 10, 250, 99999]) for _ in names]
+    total = sum(weights)
+    return StatsCollection([
+        LanguageStat(name, weight / total * 100, size)
+        for name, weight, size in zip(names, weights, sizes)
+    ])
+
+
+def test_fused_query_matches_chained_filters_exactly() -> None:
+    rng = random.Random(20261017)
+    for _ in range(2000):
+        stats = _random_collection(rng)
+        excluded = rng.sample(NAMES, rng.randint(0, 3)) + rng.choice([[], ["python "], [""]])
+        min_percentage = rng.choice([None, 0, 1.5, 10, 30, 99])
+        max_languages = rng.choice([None, 1, 2, 3, 10, 0])
+        args = (stats, excluded, min_percentage, max_languages)
+        assert _outcome(_fused, *args) == _outcome(_chained, *args)
+
+
+def test_query_without_effect_returns_the_original_collection() -> None:
+    stats = StatsCollection([LanguageStat("Python", 60, 600), LanguageStat("Go", 40, 400)])
+
+    assert StatsQuery(stats).exclude_languages([" "]).limit(5).execute() is stats
+
+
+def test_query_records_steps_without_mutating_earlier_queries() -> None:
+    stats = StatsCollection([LanguageStat("Python", 60, 600), LanguageStat("Go", 40, 400)])
+    base = StatsQuery(stats).exclude_languages(["go"])
+
+    base.limit(0)
+
+    assert [stat.name for stat in base.execute()] == ["Python"]
+    with pytest.raises(ValueError, match="greater than zero"):
+        base.limit(0).execute()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import io
+import tarfile
+
+import pytest
+
+from repo.features.languages.infrastructure import TarballLineSource
+from repo.features.languages.infrastructure.tarball import count_tarball_lines
+
+
+def _tarball(files: dict, prefix: str = "octocat-alpha-abc123/") -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in files.items():
+            data = content.encode() if isinstance(content, str) else content
+            info = tarfile.TarInfo(prefix + name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+FILES = {
+    "app.py": "a\nb\nc",
+    "lib/util.go": "x\ny\n",
+    "blob.py": b"\x00\x01\x02\n",
+    "node_modules/dep/index.js": "v\n" * 100,
+    "README.md": "r\n" * 100,
+}
+
+
+def test_tarball_lines_are_counted_per_language_from_a_stream() -> None:
+    assert count_tarball_lines(io.BytesIO(_tarball(FILES))) == {"Python": 3, "Go": 2}
+
+
+def test_local_archives_are_cached_by_mtime_and_size(tmp_path) -> None:
+    archive = tmp_path / "alpha.tar.gz"
+    archive.write_bytes(_tarball(FILES))
+    cache = str(tmp_path / "cache")
+
+    first = TarballLineSource(archives=[str(archive)], cache_dir=cache)
+    assert {stat.name: stat.bytes for stat in first.fetch_language_stats()} == {"Python": 3, "Go": 2}
+
+    second = TarballLineSource(archives=[str(archive)], cache_dir=cache)
+    second.fetch_language_stats()
+    assert second.run_metrics() == {"tarballs_streamed": 0, "tarballs_failed": 0}
+
+
+class _StreamedResponse:
+    def __init__(self, body: bytes, status_code: int = 200, etag: str | None = None) -> None:
+        self._body = body
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+        self.closed = False
+
+    def iter_content(self, chunk_size: int = 1):
+        # Tiny chunks so the tar reader sees data arrive piece by piece.
+        for start in range(0, len(self._body), 100):
+            yield self._body[start:start + 100]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeClient:
+    username = "octocat"
+
+    def __init__(self, tarballs: dict) -> None:
+        self.tarballs = tarballs
+        self.responses: list[_StreamedResponse] = []
+
+    def iter_repositories(self, username, orgs, accounts):
+        return iter([{"id": index, "full_name": name} for index, name in enumerate(self.tarballs)])
+
+    def open_tarball(self, full_name: str, etag: str | None = None) -> _StreamedResponse:
+        body = self.tarballs[full_name]
+        current = f'"{hash(body)}"'
+        if etag == current:
+            response = _StreamedResponse(b"", status_code=304, etag=current)
+        else:
+            response = _StreamedResponse(body, etag=current)
+        self.responses.append(response)
+        return response
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_api_tarballs_are_streamed_concurrently_and_closed(max_workers: int) -> None:
+    client = _FakeClient({
+        "octocat/alpha": _tarball(FILES),
+        "octocat/beta": _tarball({"main.rs": "fn\n" * 5}),
+        "octocat/broken": b"not a tarball",
+    })
+    source = TarballLineSource(client, max_workers=max_workers)
+
+    stats = source.fetch_language_stats()
+
+    assert {stat.name: stat.bytes for stat in stats} == {"Rust": 5, "Python": 3, "Go": 2}
+    assert all(response.closed for response in client.responses)
+    assert source.run_metrics() == {"tarballs_streamed": 2, "tarballs_failed": 1}
+
+
+def test_api_tarballs_are_cached_by_etag(tmp_path) -> None:
+    client = _FakeClient({"octocat/alpha": _tarball(FILES), "octocat/beta": _tarball({"main.rs": "fn\n"})})
+    cache = str(tmp_path / "cache")
+    TarballLineSource(client, cache_dir=cache).fetch_language_stats()
+
+    # Only beta's default-branch tarball changes; alpha answers 304 and is not streamed.
+    client.tarballs["octocat/beta"] = _tarball({"main.rs": "fn\n" * 3})
+    second = TarballLineSource(client, cache_dir=cache)
+    stats = second.fetch_language_stats()
+
+    assert {stat.name: stat.bytes for stat in stats} == {"Python": 3, "Rust": 3, "Go": 2}
+    assert second.run_metrics() == {"tarballs_streamed": 1, "tarballs_failed": 0}
+    assert sorted(response.status_code for response in client.responses[2:]) == [200, 304]
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import io
+import socket
+import subprocess
+import sys
+from email.message import Message
+from pathlib import Path
+
+import pytest
+import requests
+
+from repo.features.languages.infrastructure.transport import (
+    HTTPClientTransport,
+    HTTPStatusError,
+    RequestsTransport,
+    TransportConnectionError,
+    TransportDecodeError,
+    TransportError,
+    TransportTimeout,
+    create_transport,
+    parse_link_header,
+)
+
+
+class FakeRawResponse:
+    def __init__(self, status: int, body: bytes, headers: dict, will_close: bool = False) -> None:
+        self.status = status
+        self.reason = "OK" if status < 400 else "Error"
+        self.headers = Message()
+        for key, value in headers.items():
+            self.headers[key] = value
+        self.will_close = will_close
+        self._body = io.BytesIO(body)
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._body.read(amt)
+
+
+class FakeConnection:
+    """In-memory stand-in for ``http.client.HTTPConnection``."""
+
+    def __init__(self, host: str, responses: list) -> None:
+        self.host = host
+        self.sock = None
+        self.timeout = None
+        self.sent: list[tuple] = []
+        self.closed = False
+        self._responses = responses
+
+    def connect(self) -> None:
+        self.sock = socket.socket()
+
+    def request(self, method, path, body=None, headers=None) -> None:
+        self.sent.append((method, path, body, dict(headers or {})))
+
+    def getresponse(self) -> FakeRawResponse:
+        outcome = self._responses.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def close(self) -> None:
+        self.closed = True
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+def _transport(responses: list, **kwargs) -> tuple[HTTPClientTransport, list[FakeConnection]]:
+    connections: list[FakeConnection] = []
+
+    def factory(scheme: str, host: str, port: int | None) -> FakeConnection:
+        connection = FakeConnection(host, responses)
+        connections.append(connection)
+        return connection
+
+    return HTTPClientTransport(connection_factory=factory, **kwargs), connections
+
+
+def test_stdlib_transport_reuses_keep_alive_connections() -> None:
+    transport, connections = _transport(
+        [
+            FakeRawResponse(200, b'[{"id": 1}]', {"Link": '<https://api.github.com/x?page=2>; rel="next"'}),
+            FakeRawResponse(200, b'{"Python": 5}', {"ETag": '"v1"'}),
+        ],
+        headers={"User-Agent": "test"},
+    )
+
+    first = transport.get("https://api.github.com/users/octocat/repos", params={"per_page": 100},
+                          headers={"Authorization": "token t"}, timeout=(1, 2))
+    second = transport.get("https://api.github.com/repos/octocat/alpha/languages")
+
+    assert first.json() == [{"id": 1}]
+    assert first.links["next"]["url"] == "https://api.github.com/x?page=2"
+    assert second.headers.get("etag") == '"v1"'
+    assert len(connections) == 1
+    method, path, _, headers = connections[0].sent[0]
+    assert (method, path) == ("GET", "/users/octocat/repos?per_page=100")
+    assert headers == {"User-Agent": "test", "Authorization": "token t"}
+    transport.close()
+
+
+def test_stdlib_transport_retries_once_on_a_stale_connection() -> None:
+    transport, connections = _transport(
+        [
+            FakeRawResponse(200, b"{}", {}),
+            ConnectionResetError("peer closed"),
+            FakeRawResponse(200, b'{"ok": true}', {}),
+        ]
+    )
+    transport.get("https://api.github.com/a")
+
+    assert transport.get("https://api.github.com/b").json() == {"ok": True}
+    assert len(connections) == 2 and connections[0].closed
+    transport.close()
+
+
+def test_stdlib_transport_maps_failures_to_transport_errors() -> None:
+    transport, _ = _transport([socket.timeout("slow"), ConnectionRefusedError("down")])
+
+    with pytest.raises(TransportTimeout):
+        transport.get("https://api.github.com/a")
+    with pytest.raises(TransportConnectionError):
+        transport.get("https://api.github.com/a")
+
+
+def test_stdlib_transport_posts_json_and_raises_for_status() -> None:
+    transport, connections = _transport([FakeRawResponse(502, b"bad gateway", {})])
+
+    response = transport.post("https://api.github.com/graphql", json={"query": "{}"})
+
+    assert connections[0].sent[0][2] == b'{"query": "{}"}'
+    assert connections[0].sent[0][3]["Content-Type"] == "application/json"
+    with pytest.raises(HTTPStatusError) as excinfo:
+        response.raise_for_status()
+    assert excinfo.value.status_code == 502
+
+
+def test_stdlib_transport_drops_partially_streamed_connections() -> None:
+    transport, connections = _transport(
+        [FakeRawResponse(200, b"[1, 2, 3]", {}), FakeRawResponse(200, b"[]", {})]
+    )
+
+    response = transport.get("https://api.github.com/a", stream=True)
+    next(response.iter_content(2))
+    response.close()
+    transport.get("https://api.github.com/b")
+
+    assert connections[0].closed
+    assert len(connections) == 2
+
+
+def test_invalid_json_bodies_raise_transport_errors() -> None:
+    transport, _ = _transport([FakeRawResponse(200, b"<html>oops</html>", {})])
+
+    with pytest.raises(TransportDecodeError):
+        transport.get("https://api.github.com/a").json()
+
+    raw = requests.Response()
+    raw.status_code = 200
+    raw._content = b"<html>oops</html>"
+    raw.url = "https://api.github.com/a"
+    requests_transport = RequestsTransport()
+    requests_transport.session.request = lambda *_args, **_kwargs: raw
+    with pytest.raises(TransportDecodeError):
+        requests_transport.get("https://api.github.com/a").json()
+    requests_transport.close()
+
+
+def test_stdlib_transport_follows_redirects_like_requests() -> None:
+    transport, connections = _transport(
+        [
+            FakeRawResponse(301, b'{"message": "Moved Permanently"}',
+                            {"Location": "/repos/octocat/renamed/languages"}),
+            FakeRawResponse(302, b"", {"Location": "https://codeload.github.com/octocat/renamed"}),
+            FakeRawResponse(200, b'{"Python": 5}', {}),
+        ],
+        headers={"Authorization": "token t"},
+    )
+
+    response = transport.get("https://api.github.com/repos/octocat/old/languages")
+
+    assert response.json() == {"Python": 5}
+    sent = [call for connection in connections for call in connection.sent]
+    assert [path for _, path, _, _ in sent] == [
+        "/repos/octocat/old/languages", "/repos/octocat/renamed/languages", "/octocat/renamed"
+    ]
+    assert "Authorization" in sent[1][3]
+    assert "Authorization" not in sent[2][3]
+
+
+def test_stdlib_transport_gives_up_on_redirect_loops() -> None:
+    loop = [FakeRawResponse(302, b"", {"Location": "/a"}) for _ in range(10)]
+    transport, _ = _transport(loop)
+
+    with pytest.raises(TransportError, match="redirected"):
+        transport.get("https://api.github.com/a")
+
+
+def test_requests_transport_maps_exceptions() -> None:
+    transport = RequestsTransport()
+
+    def fail(*_args, **_kwargs):
+        raise requests.Timeout("slow")
+
+    transport.session.request = fail
+    with pytest.raises(TransportTimeout):
+        transport.get("https://api.github.com/a")
+    transport.close()
+
+
+def test_parse_link_header() -> None:
+    links = parse_link_header('<https://x/?page=2>; rel="next", <https://x/?page=9>; rel="last"')
+
+    assert links == {
+        "next": {"url": "https://x/?page=2", "rel": "next"},
+        "last": {"url": "https://x/?page=9", "rel": "last"},
+    }
+
+
+def test_unknown_transport_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        create_transport("curl")
+
+
+def test_bio_card_and_stdlib_transport_do_not_import_requests() -> None:
+    code = (
+        "import sys\n"
+        "import repo.core.runner, repo.features.bio.generate_bio\n"
+        "import repo.features.languages.generate_languages\n"
+        "from repo.features.languages.infrastructure import GitHubClient\n"
+        "GitHubClient(transport='stdlib').close()\n"
+        "print('requests' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+
+    assert result.stdout.strip() == "False"
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+
 from repo.features.languages.core.request import LanguagesRequest
-from repo.features.languages.core.use_case import execute_languages
+from repo.features.languages.core.use_case import execute_languages, execute_languages_async
 from repo.features.languages.domain import LanguageStat, StatsCollection
 
 
@@ -129,3 +131,72 @@ def test_execute_languages_unknown_mode_defaults_to_text() -> None:
 
     assert result.summary == "Updated README section."
     assert any("Unknown output_mode 'other'" in line for line in logs)
+
+
+def test_execute_languages_accepts_awaitable_fetch_stats() -> None:
+    request = LanguagesRequest(token="token", username="octocat", output_mode="text")
+    stats = _sample_stats()
+    fetched = []
+
+    async def fetch_stats(username: str) -> StatsCollection:
+        fetched.append(username)
+        return stats
+
+    result = execute_languages(
+        request,
+        fetch_stats=fetch_stats,
+        render_text_lines=lambda _: ["row"],
+        render_svg=lambda *_: "<svg/>",
+        write_text_file=lambda *_: None,
+        update_readme_section=lambda *_: None,
+        logger=lambda _: None,
+    )
+
+    assert fetched == ["octocat"]
+    assert result.summary == "Updated README section."
+
+
+def test_execute_languages_async_runs_on_callers_loop() -> None:
+    request = LanguagesRequest(token="token", username="octocat", output_mode="vector")
+    stats = _sample_stats()
+    written = []
+
+    async def fetch_stats(_: str) -> StatsCollection:
+        await asyncio.sleep(0)
+        return stats
+
+    result = asyncio.run(
+        execute_languages_async(
+            request,
+            fetch_stats=fetch_stats,
+            render_text_lines=lambda _: [],
+            render_svg=lambda _, theme: f"<svg data-theme='{theme}'/>",
+            write_text_file=lambda path, _: written.append(path),
+            update_readme_section=lambda *_: None,
+            logger=lambda _: None,
+        )
+    )
+
+    assert written == ["langs-mono-light.svg", "langs-mono-dark.svg"]
+    assert result.assets == written
+
+
+def test_execute_languages_attaches_fetch_metrics() -> None:
+    request = LanguagesRequest(token="token", username="octocat", output_mode="text")
+    stats = _sample_stats()
+    logs = []
+
+    result = execute_languages(
+        request,
+        fetch_stats=lambda _: stats,
+        render_text_lines=lambda _: ["row"],
+        render_svg=lambda *_: "<svg/>",
+        write_text_file=lambda *_: None,
+        update_readme_section=lambda *_: None,
+        logger=logs.append,
+        collect_metrics=lambda: {"rate_limit_remaining": 12, "rate_limit_limit": 5000, "skipped_repos": 0},
+        describe_metrics=lambda metrics: [f"budget={metrics['rate_limit_remaining']}"],
+    )
+
+    assert result.metrics["rate_limit_remaining"] == 12
+    assert "budget=12" in logs
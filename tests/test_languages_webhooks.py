@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from repo.features.languages.infrastructure.webhooks import parse_webhook, read_payload
+
+
+def _repository(**overrides) -> dict:
+    repository = {
+        "id": 1,
+        "name": "alpha",
+        "full_name": "octocat/alpha",
+        "owner": {"login": "octocat"},
+        "default_branch": "main",
+        "size": 12,
+        "pushed_at": 1717200000,
+    }
+    repository.update(overrides)
+    return repository
+
+
+def test_push_to_default_branch_refreshes_the_repo() -> None:
+    change = parse_webhook("push", {"ref": "refs/heads/main", "repository": _repository()})
+
+    assert change is not None
+    assert change.action == "refresh"
+    assert change.owner == "octocat"
+    # Push payloads carry Unix timestamps; snapshots compare listing strings.
+    assert change.repo.pushed_at == "2024-06-01T00:00:00Z"
+    assert (change.repo.id, change.repo.size) == (1, 12)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"ref": "refs/heads/feature", "repository": _repository()},
+        {"ref": "refs/heads/main", "deleted": True, "repository": _repository()},
+    ],
+)
+def test_pushes_that_leave_the_default_branch_alone_are_ignored(payload: dict) -> None:
+    assert parse_webhook("push", payload) is None
+
+
+@pytest.mark.parametrize(
+    ("action", "expected"),
+    [("deleted", "remove"), ("archived", "remove"), ("created", "refresh"), ("renamed", None)],
+)
+def test_repository_actions(action: str, expected: str | None) -> None:
+    change = parse_webhook("repository", {"action": action, "repository": _repository()})
+
+    assert (change.action if change else None) == expected
+
+
+def test_unsupported_events_and_payloads_are_rejected(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        parse_webhook("issues", {"repository": _repository()})
+    with pytest.raises(ValueError):
+        parse_webhook("push", {"ref": "refs/heads/main"})
+
+    path = tmp_path / "payload.json"
+    path.write_text(json.dumps(["not", "an", "object"]))
+    with pytest.raises(ValueError):
+        read_payload(str(path))